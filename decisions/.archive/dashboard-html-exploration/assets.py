@@ -0,0 +1,179 @@
+"""
+Offline asset pipeline: every page paints from its own file, with no
+render-blocking request to a CDN.
+
+The console and the v2 page used to open with a `fonts.googleapis.com`
+stylesheet (Fraunces, IBM Plex Sans / Mono) that blocks first paint, and
+before.html pulled marked.js and github-markdown-css from jsDelivr / cdnjs.
+Opened from `file://` on an air-gapped or hotel-wifi machine, those requests
+stall until they time out, or fail. In "inline" mode:
+
+  - no font stylesheet link is emitted. `embed()` wraps the emitter's chunk
+    stream, collects every character the document holds, and inserts one
+    `<style>` of `@font-face` rules before `</body>`. Each rule is a
+    vendored TrueType face (vendor/fonts/, FACES below) cut down to those
+    characters (fontsub.py) and inlined as a base64 WOFF. Faces not vendored
+    are skipped, and the CSS font stacks fall back to system fonts. Faces
+    are added at the end so emission keeps streaming, and they only swap
+    glyphs the fallback already laid out.
+  - before.html is rendered at emit time by mdrender.py instead of marked.js
+    in the browser. Its stylesheet is vendor/github-markdown-light.min.css,
+    inlined when present, else the compact MARKDOWN_CSS below.
+
+"cdn" keeps the network links, for pages served where the CDN is reachable.
+The emitters' default, "auto" (`resolve()`), is "inline" once every face in
+FACES is vendored and "cdn" until then, so a checkout without the fonts
+keeps the designed look instead of silently switching to system fonts. Subsets are memoised per (faces, character set), so a --watch
+regen whose text adds no new characters costs a lookup.
+
+Vendoring: drop the static TrueType builds named in FACES into
+vendor/fonts/ (e.g. IBMPlexSans-Regular.ttf, Fraunces-SemiBold.ttf), and
+optionally github-markdown-light.min.css into vendor/. Both families are
+OFL-licensed. An explicit "inline" with faces missing prints `warning()`.
+"""
+
+import base64
+import pathlib
+import sys
+from functools import lru_cache
+
+import fontsub
+
+HERE = pathlib.Path(__file__).parent
+VENDOR = HERE / "vendor"
+FONTS = VENDOR / "fonts"
+MODES = ("auto", "inline", "cdn")
+
+# (family, weight, file stems tried in vendor/fonts/, in order)
+FACES = (
+    ("Fraunces", 500, ("Fraunces-Medium", "Fraunces_72pt-Medium")),
+    ("Fraunces", 600, ("Fraunces-SemiBold", "Fraunces_72pt-SemiBold")),
+    ("IBM Plex Sans", 400, ("IBMPlexSans-Regular",)),
+    ("IBM Plex Sans", 500, ("IBMPlexSans-Medium",)),
+    ("IBM Plex Sans", 600, ("IBMPlexSans-SemiBold",)),
+    ("IBM Plex Mono", 400, ("IBMPlexMono-Regular",)),
+    ("IBM Plex Mono", 500, ("IBMPlexMono-Medium",)),
+    ("IBM Plex Mono", 600, ("IBMPlexMono-SemiBold",)),
+)
+
+CDN_FONTS = """<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link href="https://fonts.googleapis.com/css2?family=Fraunces:opsz,wght@9..144,500;9..144,600&family=IBM+Plex+Mono:wght@400;500;600&family=IBM+Plex+Sans:wght@400;500;600&display=swap" rel="stylesheet">
+"""
+CDN_MARKDOWN = """<link rel="stylesheet"
+  href="https://cdnjs.cloudflare.com/ajax/libs/github-markdown-css/5.5.1/github-markdown-light.min.css">
+<script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>"""
+
+MARKDOWN_CSS = (
+    ".markdown-body{font:16px/1.5 -apple-system,BlinkMacSystemFont,'Segoe UI',Helvetica,Arial,sans-serif;"
+    "color:#1f2328;word-wrap:break-word}"
+    ".markdown-body h1,.markdown-body h2{padding-bottom:.3em;border-bottom:1px solid #d1d9e0b3}"
+    ".markdown-body h1,.markdown-body h2,.markdown-body h3,.markdown-body h4{margin:24px 0 16px;font-weight:600;line-height:1.25}"
+    ".markdown-body h1{font-size:2em}.markdown-body h2{font-size:1.5em}.markdown-body h3{font-size:1.25em}"
+    ".markdown-body p,.markdown-body ul,.markdown-body ol,.markdown-body table,.markdown-body pre,"
+    ".markdown-body blockquote{margin:0 0 16px}.markdown-body ul,.markdown-body ol{padding-left:2em}"
+    ".markdown-body a{color:#0969da;text-decoration:none}.markdown-body hr{height:.25em;margin:24px 0;"
+    "background:#d1d9e0;border:0}.markdown-body blockquote{padding:0 1em;color:#59636e;"
+    "border-left:.25em solid #d1d9e0}.markdown-body code{padding:.2em .4em;font-size:85%;"
+    "background:#818b981f;border-radius:6px;font-family:ui-monospace,SFMono-Regular,Menlo,monospace}"
+    ".markdown-body pre{padding:16px;overflow:auto;font-size:85%;background:#f6f8fa;border-radius:6px}"
+    ".markdown-body pre code{padding:0;background:none}.markdown-body table{border-collapse:collapse;"
+    "display:block;width:max-content;max-width:100%;overflow:auto}.markdown-body th,.markdown-body td{"
+    "padding:6px 13px;border:1px solid #d1d9e0}.markdown-body tr:nth-child(2n){background:#f6f8fa}")
+
+
+def faces():
+    """((family, weight, path), ...) for every FACES entry vendored."""
+    out = []
+    for family, weight, stems in FACES:
+        for stem in stems:
+            p = FONTS / (stem + ".ttf")
+            if p.is_file():
+                out.append((family, weight, p))
+                break
+    return tuple(out)
+
+
+def warning(mode, out=None):
+    """Tell {out} (stderr) when "inline" mode is missing vendored faces."""
+    if mode != "inline":
+        return
+    have = {(family, weight) for family, weight, _ in faces()}
+    missing = [f"{family} {weight}" for family, weight, _ in FACES if (family, weight) not in have]
+    if not missing:
+        return
+    what = "no fonts" if not have else f"{len(missing)} of {len(FACES)} faces missing ({', '.join(missing)})"
+    print(f"assets: {what} in {FONTS}, falling back to system fonts. "
+          "Add the Fraunces / IBM Plex TTFs (OFL) there, or pass --assets cdn.",
+          file=out or sys.stderr)
+
+
+def resolve(mode):
+    """{mode} as emitted: "auto" -> "inline" when every face is vendored,
+    else "cdn". Warns when "inline" is asked for with faces missing."""
+    if mode == "auto":
+        return "inline" if len(faces()) == len(FACES) else "cdn"
+    warning(mode)
+    return mode
+
+
+def key(mode):
+    """What the inlined assets depend on, for the document cache key."""
+    if mode != "inline":
+        return mode
+    files = [p for _, _, p in faces()] + [VENDOR / "github-markdown-light.min.css"]
+    return tuple((p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in files if p.exists())
+
+
+def font_links(mode):
+    """The <head> font markup: the Google Fonts links, or nothing when inlined."""
+    return CDN_FONTS if mode == "cdn" else ""
+
+
+@lru_cache(maxsize=32)
+def _face_css(family, weight, path, stamp, chars):
+    data = fontsub.woff(fontsub.subset(pathlib.Path(path).read_bytes(), chars))
+    return (f"@font-face{{font-family:\"{family}\";font-weight:{weight};font-style:normal;"
+            f"font-display:swap;src:url(data:font/woff;base64,{base64.b64encode(data).decode()})"
+            f" format(\"woff\")}}")
+
+
+def font_css(chars):
+    """@font-face rules for every vendored face, subset to {chars} ("" when
+    nothing is vendored)."""
+    chars = "".join(sorted(set(chars)))
+    rules = []
+    for family, weight, p in faces():
+        st = p.stat()
+        rules.append(_face_css(family, weight, str(p), (st.st_mtime_ns, st.st_size), chars))
+    return "\n".join(rules)
+
+
+def embed(chunks, mode="inline"):
+    """{chunks} (an emitter stream) with the subset fonts inserted before
+    `</body>` in "inline" mode; unchanged in "cdn" mode or with no faces
+    vendored."""
+    if mode != "inline" or not faces():
+        yield from chunks
+        return
+    used, last = set(), None
+    for chunk in chunks:
+        if last is not None:
+            yield last
+        used.update(chunk)
+        last = chunk
+    if last is None:
+        return
+    css = font_css(used)
+    at = last.rfind("</body>")
+    if not css or at < 0:
+        yield last
+        return
+    yield last[:at] + f'<style id="fonts">{css}</style>' + last[at:]
+
+
+def markdown_css():
+    """github-markdown-css from vendor/ when present, else MARKDOWN_CSS."""
+    p = VENDOR / "github-markdown-light.min.css"
+    return p.read_text(encoding="utf-8") if p.is_file() else MARKDOWN_CSS
+
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for build.py / viz.py on synthetic dashboards.
+
+styler-dashboard.md is one point (269 tasks, 141 decisions, 53 phases); the
+big projects are heading for 10k tasks and 2k decisions. `generate()` writes
+realistic dashboards in the exact Markdown shape `mdscan` / `parse_dashboard`
+expect — META with a canonical task_hash, Action Required, Progress tables,
+acceptance criteria, timeline, mermaid graph, per-phase task tables, the
+decisions table, a USER SECTION — plus a spec_v1.md beside it, at any size.
+
+For each size it times parse (dashboard + spec) and each emitter separately
+(console = build.emit_console, before = build.emit_before, v2 = viz.emit_v2,
+and both again with the windowed decisions list of declist.py; best of
+--repeat, render cache off) and records output bytes and DOM-node
+counts. Results are compared against a JSON baseline so a regression in
+either renderer shows up as a number:
+
+    python3 bench.py                       # run, compare with baseline if any
+    python3 bench.py --save                # run and (re)write the baseline
+    python3 bench.py --sizes 100,2000 -r 5
+    python3 bench.py --dump /tmp/synth     # also keep the generated .md files
+
+Exit status is 1 when an emitter got slower than --tolerance or an output grew.
+The baseline defaults to .dashcache/bench.json (machine-specific, untracked).
+"""
+
+import argparse
+import hashlib
+import json
+import pathlib
+import platform
+import random
+import sys
+import tempfile
+import time
+from html.parser import HTMLParser
+
+import build
+import viz
+from build import emit_before, emit_console
+from model import parse_dashboard
+from rcache import cache_dir, source_salt
+from viz import emit_v2, load_spec
+
+HERE = pathlib.Path(__file__).parent
+SIZES = (100, 1000, 10000, 50000)
+EMITTERS = ("console", "before", "v2", "console-win", "v2-win")
+# in-process render memos (mdinline renderers, status classes), emptied before each timed run
+RENDER_CACHES = (build.md_inline, build.status_class, build.owner_badge, viz.mdi, viz.scls)
+SOURCES = ("mdscan.py", "model.py", "build.py", "viz.py", "searchidx.py", "declist.py",
+           "mdrender.py", "flowsvg.py", "taskjson.py", "taskhash.py", "tmpl.py", "mdinline.py", "serve.py", "depgraph.py", "specindex.py", "paint.py", "history.py",
+           "assets.py", "fontsub.py")
+
+WORDS = ("palette drape wardrobe capture intake rule dossier trust chain "
+         "surface onboarding grooming outfit colour contrast engine scoring "
+         "pipeline provenance migration audit layout filter review cache "
+         "schema registry photo metrology seasonal harmony lookbook sweep").split()
+ACTIVE_STATUS = (("Pending", 5), ("In Progress", 2), ("Blocked", 1),
+                 ("⏸️ On Hold", 1), ("Finished", 4))
+
+
+# ---- synthetic dashboards ---------------------------------------------------
+
+def _phrase(rng, lo=3, hi=9):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def task_hash(tasks):
+    """Canonical hash: sorted `id:status:difficulty:owner` lines, trailing newline."""
+    lines = sorted(f"{t[0]}:{t[2]}:{t[3]}:{t[4]}" for t in tasks)
+    return "sha256:" + hashlib.sha256(("\n".join(lines) + "\n").encode()).hexdigest()
+
+
+def generate(n_tasks, n_decisions=None, n_phases=None, seed=0):
+    """(dashboard_md, spec_md) for a project of {n_tasks} tasks.
+
+    Defaults scale like the real projects: one decision per five tasks, ~40
+    tasks per phase, the last ~15% of phases still in flight (their tasks get
+    tables; finished phases collapse to a `✅ N tasks finished` line).
+    """
+    rng = random.Random(seed)
+    n_dec = n_tasks // 5 if n_decisions is None else n_decisions
+    n_ph = max(2, n_tasks // 40) if n_phases is None else n_phases
+    n_active = max(1, round(n_ph * 0.15))
+
+    # phases -> tasks: (id, title, status, diff, owner, deps)
+    sizes = [1] * n_ph
+    for _ in range(n_tasks - n_ph):
+        sizes[rng.randrange(n_ph)] += 1
+    phases, tasks, tid = [], [], 1
+    for i, size in enumerate(sizes):
+        active = i >= n_ph - n_active
+        rows = []
+        for _ in range(size):
+            st = (rng.choices([s for s, _ in ACTIVE_STATUS],
+                              [w for _, w in ACTIVE_STATUS])[0] if active else "Finished")
+            deps = ", ".join(str(rng.randint(1, tid)) for _ in range(rng.randint(0, 3))
+                             ) if tid > 1 else ""
+            if rng.random() < 0.1 and n_dec:
+                deps = (deps + ", " if deps else "") + f"DEC-{rng.randint(1, n_dec):03d}"
+            rows.append((str(tid), f"§{i + 1}.{len(rows) + 1} — {_phrase(rng).capitalize()}",
+                         st, str(rng.randint(1, 8)), rng.choice(("claude", "claude", "both", "human")),
+                         deps or "—"))
+            tid += 1
+        name = f"Phase {i + 1} — {_phrase(rng, 2, 6).title()}"
+        done = sum(r[2] == "Finished" for r in rows)
+        if not active:
+            status = "Complete"
+        elif any(r[2] == "Blocked" for r in rows):
+            status = "Blocked (awaiting prior phase)"
+        elif done == size:
+            status = "Complete"
+        else:
+            status = "Active"
+        phases.append((name, done, size, status, rows))
+        tasks += rows
+
+    counts = {}
+    for t in tasks:
+        key = t[2].replace("⏸️ ", "")
+        counts[key] = counts.get(key, 0) + 1
+    finished = counts.get("Finished", 0)
+    pct = finished * 100 // max(1, len(tasks))
+    open_tasks = [t for t in tasks if t[2] != "Finished"]
+    mine = [t for t in open_tasks if t[4] == "both" and t[2] == "Pending"][:5]
+    decisions = []
+    for d in range(1, n_dec + 1):
+        sup = rng.random() < 0.1
+        slug = "-".join(rng.choice(WORDS) for _ in range(3))
+        sel = "Superseded" if sup else f"Option {rng.choice('ABCDE')}: {_phrase(rng, 4, 16)}"
+        decisions.append((f"DEC-{d:03d}", _phrase(rng, 3, 12).capitalize(),
+                          "Superseded" if sup else "Decided",
+                          f"[{sel}](support/decisions/decision-{d:03d}-{slug}.md)"))
+
+    out = [
+        "# Dashboard", "",
+        "<!-- DASHBOARD META",
+        "generated: 2026-06-23T17:29:45Z",
+        f"task_count: {len(tasks)}",
+        f"task_hash: {task_hash(tasks)}",
+        "spec_version: spec_v1",
+        "spec_status: active",
+        "spec_fingerprint: sha256:" + hashlib.sha256(str(seed).encode()).hexdigest(),
+        "template_version: 4.31.0",
+        "verification_debt: 0",
+        "drift_deferrals: 0",
+        f"decision_count: {n_dec}",
+        f"decisions_approved: {sum(d[2] == 'Decided' for d in decisions)}",
+        f"decisions_superseded: {sum(d[2] == 'Superseded' for d in decisions)}",
+        "decisions_partially_superseded: 0",
+        "-->", "",
+        "<details><summary><strong>Sections</strong></summary>", "",
+        "<!-- SECTION TOGGLES -->",
+        "- [x] Action Required", "- [x] Progress", "- [x] Tasks",
+        "- [x] Decisions", "- [x] Notes", "- [ ] Custom Views",
+        "<!-- END SECTION TOGGLES -->", "", "</details>", "",
+        f"**Synthetic Project {len(tasks)}** · Execute · Started 2026-03-20", "",
+        f"**{pct}% complete** — {len(tasks)} tasks · {n_dec} decisions", "",
+        "*Updated 2026-06-23 17:29 — may not reflect changes made outside `/work`*",
+        "", "---", "",
+        "## 🚨 Action Required", "",
+        f"**{len(open_tasks)} open tasks** across {n_active} active phases.", "",
+        "### 👥 Your Tasks (all `owner: both`, deps met, not started)", "",
+    ]
+    out += [f"- **T{t[0]}** — {t[1]}. Ready to run together when you are." for t in mine]
+    out += ["", "---", "", "## 📊 Progress", "",
+            "| Status | Count |", "|--------|-------|"]
+    out += [f"| {s} | {c} |" for s, c in counts.items()]
+    out += ["", "| Phase | Done | Total | Status |", "|-------|------|-------|--------|"]
+    out += [f"| {p[0]} | {p[1]} | {p[2]} | {p[3]} |" for p in phases]
+    out += ["", "### Acceptance Criteria", ""]
+    crit = [rng.random() < 0.85 for _ in range(12)]
+    out += [f"- [{'x' if c else ' '}] {_phrase(rng, 1, 3)} — *{_phrase(rng, 4, 8)}*" for c in crit]
+    out += ["", f"**{sum(crit)}/{len(crit)} criteria passed**", "",
+            "### Timeline", "", "| Date | Item | Status | Notes |",
+            "|------|------|--------|-------|"]
+    for i in range(max(1, len(tasks) // 500)):
+        late = rng.random() < 0.2
+        date = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        out.append(f"| {'~~' + date + '~~' if late else date} | "
+                   f"{'⚠️ OVERDUE: ' if late else ''}{_phrase(rng, 2, 5)} | "
+                   f"{rng.choice(('Waiting', 'Pending', 'Complete'))} | {_phrase(rng, 1, 4)} |")
+    out += ["", "**Critical path:** All tasks can start now", "",
+            "### Project Overview", "", "```mermaid", "graph LR"]
+    graph = open_tasks[:60]
+    out += [f'    T{t[0]}["{t[1][:60]}"]' for t in graph]
+    ids = {t[0] for t in graph}
+    out += [f"    T{d} --> T{t[0]}" for t in graph
+            for d in t[5].split(", ") if d in ids]
+    out += ["    classDef blocked fill:#f5f5f5,stroke:#9e9e9e",
+            f"    class {','.join('T' + t[0] for t in graph) or 'T0'} blocked",
+            "```", "", "### Recent Activity", ""]
+    done_tasks = [t for t in tasks if t[2] == "Finished"][-7:][::-1]
+    out += [f"- **2026-06-{23 - i:02d}** — Task {t[0]} — Finished: {t[1]}"
+            for i, t in enumerate(done_tasks)]
+    out += ["", "---", "", "## 📋 Tasks", ""]
+    for name, done, size, status, rows in phases:
+        out += [f"### {name}", ""]
+        if done:
+            out += [f"✅ {done} tasks finished", ""]
+        if status != "Complete" or done < size:
+            rest = [r for r in rows if r[2] != "Finished"]
+            out += ["| ID | Title | Status | Diff | Owner | Deps |",
+                    "|----|-------|--------|------|-------|------|"]
+            out += ["| " + " | ".join(r) + " |" for r in rest]
+            n = name.split(" —")[0]
+            out += ["", f"*{n}: {done}/{size} complete ({done * 100 // size}%) — "
+                        f"{size - done} open*", ""]
+    out += [f"*{finished}/{len(tasks)} tasks complete ({pct}%)*", "", "---", "",
+            "## 📋 Decisions", "", "| ID | Decision | Status | Selected |",
+            "|----|----------|--------|----------|"]
+    out += ["| " + " | ".join(d) + " |" for d in decisions]
+    out += ["", "---", "", "## 💡 Notes", "", "<!-- USER SECTION -->", "",
+            "**Quick links:**", "- Start the app: `npm run dev`",
+            "- Production setup: `docs/production-setup.md`", "",
+            "<!-- END USER SECTION -->", "", "---",
+            f"*2026-06-23 17:29 UTC · {len(tasks)} tasks · [Spec aligned](# \"0 drift deferrals\")*", ""]
+
+    spec = ["# Specification v1", ""]
+    for i, (name, *_rest) in enumerate(phases, 1):
+        spec += [f"## {i}. {name.split('— ', 1)[-1]}", "", _phrase(rng, 20, 60) + ".", "",
+                 f"- **Goal:** {_phrase(rng, 4, 10)}", f"- **Scope:** `{rng.choice(WORDS)}` "
+                 f"and {_phrase(rng, 3, 8)}", "",
+                 "| Field | Rule |", "|-------|------|",
+                 f"| {rng.choice(WORDS)} | {_phrase(rng, 3, 8)} |", ""]
+    return "\n".join(out), "\n".join(spec) + "\n"
+
+
+# ---- measurement ------------------------------------------------------------
+
+class _DomCount(HTMLParser):
+    """Elements in the served HTML (what the browser builds before any JS runs).
+
+    `<noscript>` content is raw text to a browser with scripting on, so it is
+    not counted.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.n = self.hidden = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "noscript":
+            self.hidden += 1
+        if not self.hidden:
+            self.n += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.hidden:
+            self.n += 1
+
+    def handle_endtag(self, tag):
+        if tag == "noscript":
+            self.hidden -= 1
+
+
+def dom_nodes(doc):
+    p = _DomCount()
+    p.feed(doc)
+    p.close()
+    return p.n
+
+
+def cold():
+    """Empty every RENDER_CACHES memo, so a repeat does not time cache hits."""
+    for f in RENDER_CACHES:
+        f.cache_clear()
+
+
+def best(fn, repeat):
+    """(result, best wall-clock ms) over {repeat} cold runs."""
+    ms = float("inf")
+    for _ in range(repeat):
+        cold()
+        t = time.perf_counter()
+        out = fn()
+        ms = min(ms, (time.perf_counter() - t) * 1000)
+    return out, ms
+
+
+def run_size(n, repeat, dump=None, seed=0):
+    md, spec_md = generate(n, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        d = pathlib.Path(dump or tmp) / f"synth-{n}"
+        d.mkdir(parents=True, exist_ok=True)
+        src = d / "dashboard.md"
+        src.write_text(md, encoding="utf-8")
+        (d / "spec_v1.md").write_text(spec_md, encoding="utf-8")
+        (m, spec), parse_ms = best(lambda: (parse_dashboard(src), load_spec(d, cache=False)), repeat)
+    res = {"tasks": n, "decisions": len(m.decisions), "phases": len(m.phases),
+           "active_rows": sum(len(g.tasks) for g in m.task_groups),
+           "md_bytes": len(md.encode()), "parse_ms": round(parse_ms, 2)}
+    emit = {"console": lambda: emit_console(m), "before": lambda: emit_before(md),
+            "v2": lambda: emit_v2(m, spec),
+            "console-win": lambda: emit_console(m, windowed=True),
+            "v2-win": lambda: emit_v2(m, spec, windowed=True)}
+    for name in EMITTERS:
+        doc, ms = best(emit[name], repeat)
+        res[name] = {"emit_ms": round(ms, 2), "bytes": len(doc.encode()),
+                     "dom": dom_nodes(doc)}
+    return res
+
+
+# ---- baseline ---------------------------------------------------------------
+
+def compare(old, new, tolerance):
+    """Print deltas against {old}; return the list of regressions."""
+    bad = []
+
+    def check(label, a, b, timing):
+        if a is None:
+            return
+        grew = (b - a) / a if a else 0.0
+        slow = timing and grew > tolerance and b - a > 2.0
+        big = not timing and b > a
+        mark = " !" if slow or big else ""
+        if slow or big or abs(grew) > 0.005:
+            print(f"    {label:<22} {a:>12,.1f} → {b:>12,.1f}  ({grew:+.1%}){mark}")
+        if mark:
+            bad.append(label)
+
+    prev = {r["tasks"]: r for r in old.get("results", [])}
+    for r in new:
+        o = prev.get(r["tasks"])
+        if o is None:
+            continue
+        print(f"  {r['tasks']:,} tasks vs baseline:")
+        check(f"{r['tasks']}.parse_ms", o.get("parse_ms"), r["parse_ms"], True)
+        for name in EMITTERS:
+            for k in ("emit_ms", "bytes", "dom"):
+                check(f"{r['tasks']}.{name}.{k}", o.get(name, {}).get(k), r[name][k],
+                      k == "emit_ms")
+    return bad
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark build.py / viz.py on synthetic dashboards.")
+    ap.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                    help="comma-separated task counts (default %(default)s)")
+    ap.add_argument("-r", "--repeat", type=int, default=3, help="runs per timing, best kept")
+    ap.add_argument("--baseline", type=pathlib.Path, default=None,
+                    help="baseline JSON (default .dashcache/bench.json)")
+    ap.add_argument("--save", action="store_true", help="write results as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed slowdown before a timing counts as a regression")
+    ap.add_argument("--dump", type=pathlib.Path, help="keep generated dashboards under DIR")
+    args = ap.parse_args(argv)
+    baseline = args.baseline or cache_dir(HERE) / "bench.json"
+
+    results = []
+    print(f"{'tasks':>7} {'dec':>6} {'rows':>6} {'md KB':>8} {'parse':>8} "
+          + " ".join(f"{e + ' ms':>10} {'KB':>7} {'DOM':>7}" for e in EMITTERS))
+    for n in (int(s) for s in args.sizes.split(",") if s):
+        r = run_size(n, args.repeat, args.dump)
+        results.append(r)
+        print(f"{n:>7,} {r['decisions']:>6,} {r['active_rows']:>6,} {r['md_bytes'] / 1024:>8,.0f} "
+              f"{r['parse_ms']:>8,.1f} "
+              + " ".join(f"{r[e]['emit_ms']:>10,.1f} {r[e]['bytes'] / 1024:>7,.0f} {r[e]['dom']:>7,}"
+                         for e in EMITTERS), flush=True)
+
+    doc = {"python": platform.python_version(), "machine": platform.machine(),
+           "sources": source_salt(*(HERE / s for s in SOURCES)), "results": results}
+    bad = []
+    if baseline.exists():
+        old = json.loads(baseline.read_text(encoding="utf-8"))
+        if old.get("python") != doc["python"]:
+            print(f"  note: baseline is Python {old.get('python')}, this is {doc['python']}")
+        bad = compare(old, results, args.tolerance)
+        print(f"{len(bad)} regression(s) vs {baseline}" if bad else f"no regressions vs {baseline}")
+    if args.save:
+        baseline.write_text(json.dumps(doc, indent=1) + "\n", encoding="utf-8")
+        print(f"baseline written: {baseline}")
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,59 +16,55 @@ data, so the difference is presentation, not content:
 This mirrors how the real .claude/scripts/dashboard-render.py works: parse the
 structured task/decision/phase data, emit a render target. Here the target is
 HTML instead of Markdown. Stdlib only; no third-party Python deps.
+
+Importable: `emit_console(parse_dashboard(src))` renders the console for any
+dashboard in-process (see model.py); `stream_console()` yields the same page
+in chunks (tmpl.py), which is how the CLI writes it.
 """
 
 import re
+import sys
 import html
 import json
 import pathlib
+import argparse
+from functools import lru_cache
+
+import assets
+import depgraph
+import history
+import ir
+import mdrender
+import mdscan
+import paint
+import prof
+import serve
+from declist import MODES, WINDOW_AUTO, WINDOW_CSS, noscript, payload, window_mode
+from mdinline import renderer
+from rcache import (NOCACHE, RenderCache, cache_dir, doc_key, source_salt,
+                    stream_if_changed, write_if_changed)
+from searchidx import SEARCH_CSS, SEARCH_JS, decision_index
+from taskjson import cache_file, load_dashboard, watch_dirs
+from tmpl import Template
 
 HERE = pathlib.Path(__file__).parent
 SRC = HERE / "styler-dashboard.md"
-RAW = SRC.read_text(encoding="utf-8")
-
-
-# ---------------------------------------------------------------- parse helpers
-def section(name):
-    """Return the body under the `## ` heading whose text contains {name}.
-
-    Split on line-anchored `## ` headings (no DOTALL) so a level-3 'Your Tasks'
-    inside Action Required can't be mistaken for the `## Tasks` section.
-    """
-    parts = re.split(r"^(## .*)$", RAW, flags=re.M)
-    for i in range(1, len(parts), 2):
-        if name.lower() in parts[i].lower():
-            return parts[i + 1]
-    return ""
-
-
-def table_rows(block):
-    """Yield cell-lists for each data row of the first markdown table in block."""
-    rows = []
-    for line in block.splitlines():
-        line = line.strip()
-        if not line.startswith("|"):
-            continue
-        cells = [c.strip() for c in line.strip("|").split("|")]
-        if set("".join(cells)) <= set("-: "):   # separator row
-            continue
-        rows.append(cells)
-    return rows[1:] if rows else []              # drop header row
+# emitter sources whose edits must invalidate the render cache
+SALT = (__file__, HERE / "searchidx.py", HERE / "declist.py", HERE / "taskjson.py",
+        HERE / "taskhash.py", HERE / "tmpl.py",
+        HERE / "mdinline.py", HERE / "serve.py", HERE / "depgraph.py", HERE / "paint.py",
+        HERE / "assets.py", HERE / "fontsub.py", HERE / "mdrender.py")
 
 
-def md_inline(s):
-    """Minimal inline markdown -> HTML (escape first, then re-introduce tags)."""
-    s = html.escape(s)
-    s = re.sub(r"\[([^\]]+)\]\(([^)]+)\)",
-               r'<a href="\2" target="_blank" rel="noopener">\1</a>', s)
-    s = re.sub(r"\*\*([^*]+)\*\*", r"<strong>\1</strong>", s)
-    s = re.sub(r"`([^`]+)`", r"<code>\1</code>", s)
-    s = re.sub(r"(?<![\*\w])\*([^*]+)\*(?![\*\w])", r"<em>\1</em>", s)
-    return s
+# ------------------------------------------------------------- markdown helpers
+# Minimal inline markdown -> HTML (links, **bold**, `code`, *italic*): one
+# escaped scan per string, LRU-cached (mdinline.py).
+md_inline = renderer('<a href="{href}" target="_blank" rel="noopener">{text}</a>')
+CRIT_SHOWN = 40     # critical-path task ids listed before "… (+N)"
 
 
-def md_block(block):
-    """Convert a freeform markdown block (headings / lists / paras) to HTML."""
+def md_block(lines):
+    """Convert freeform markdown lines (headings / lists / paras) to HTML."""
     out, buf = [], []
 
     def flush():
@@ -77,7 +73,7 @@ def md_block(block):
                        + "</ul>")
             buf.clear()
 
-    for line in block.splitlines():
+    for line in lines:
         t = line.strip()
         if not t:
             flush()
@@ -99,76 +95,8 @@ def md_block(block):
     return "\n".join(out)
 
 
-# ------------------------------------------------------------------- meta + head
-meta = dict(re.findall(r"^([a-z_]+):\s*(.*)$",
-                       re.search(r"<!-- DASHBOARD META(.*?)-->", RAW, re.S).group(1),
-                       re.M))
-title = re.search(r"^\*\*(.+?)\*\*\s*·\s*(.+?)\s*·\s*(.+)$", RAW, re.M)
-project_name, phase_label, started = title.group(1), title.group(2), title.group(3)
-complete = re.search(r"\*\*(\d+)% complete\*\*", RAW).group(1)
-
-
-# --------------------------------------------------------------------- progress
-prog = section("Progress")
-status_counts = []
-phases = []
-for cells in table_rows(prog):
-    if len(cells) == 2 and cells[1].isdigit():
-        status_counts.append((cells[0], int(cells[1])))
-for m in re.finditer(r"^\| (Phase .*?|Unphased) \| (\d+) \| (\d+) \| (.*?) \|$",
-                     prog, re.M):
-    name, done, total, st = m.groups()
-    phases.append({"name": name, "done": int(done), "total": int(total),
-                   "status": st})
-
-acc = re.findall(r"^- \[([ x])\] (.*?) — \*(.*?)\*$", prog, re.M)
-acc_summary = (re.search(r"\*\*(\d+/\d+) criteria passed\*\*", prog) or
-               re.search(r"(\d+/\d+) criteria", prog))
-acc_summary = acc_summary.group(1) if acc_summary else f"{len(acc)} criteria"
-
-recent = re.findall(r"^- \*\*(\d{4}-\d\d-\d\d)\*\* — (.*?)$", prog, re.M)
-
-
-# ------------------------------------------------------------------------ tasks
-tasks_sec = section("Tasks")
-task_phases = []
-for blk in re.split(r"^### ", tasks_sec, flags=re.M)[1:]:
-    head, _, body = blk.partition("\n")
-    name = head.strip()
-    finished = re.search(r"✅ (\d+) tasks? finished\s*(\([^)]*\))?", body)
-    rows = []
-    for c in table_rows(body):
-        if len(c) >= 6:
-            rows.append({"id": c[0], "title": c[1], "status": c[2],
-                         "diff": c[3], "owner": c[4], "deps": c[5]})
-    task_phases.append({"name": name,
-                        "finished": int(finished.group(1)) if finished else 0,
-                        "extra": (" " + finished.group(2)) if finished and
-                        finished.group(2) else "",
-                        "tasks": rows})
-
-
-# -------------------------------------------------------------------- decisions
-decisions = []
-for c in table_rows(section("Decisions")):
-    if len(c) < 4:
-        continue
-    did, dtitle, dstatus, sel = c[0], c[1], c[2], c[3]
-    lm = re.match(r"\[(.*)\]\((.*)\)$", sel, re.S)
-    sel_text = lm.group(1) if lm else sel
-    sel_link = lm.group(2) if lm else ""
-    decisions.append({"id": did, "title": dtitle, "status": dstatus,
-                      "sel_text": sel_text, "link": sel_link})
-
-
-# ----------------------------------------------------- freeform: action + notes
-action_html = md_block(section("Action Required"))
-notes_block = re.search(r"<!-- USER SECTION -->(.*?)<!-- END USER SECTION -->",
-                        section("Notes"), re.S)
-notes_html = md_block(notes_block.group(1) if notes_block else section("Notes"))
-
-
 # ============================================================ EMIT: dashboard.html
+@lru_cache(maxsize=256)
 def status_class(s):
     s = s.lower()
     if any(k in s for k in ("finished", "complete", "decided", "pass")):
@@ -184,6 +112,7 @@ def status_class(s):
     return "mute"
 
 
+@lru_cache(maxsize=64)
 def owner_badge(o):
     o = o.lower()
     return {"claude": "🤖", "human": "❗", "both": "👥"}.get(o, "·") + " " + o
@@ -324,6 +253,11 @@ details.disc>summary:hover{background:var(--paper-2)}
 .task .tid{font-family:"IBM Plex Mono",monospace; color:var(--brand-ink);
   font-weight:600; margin-right:6px}
 .task .row{display:flex; gap:6px; align-items:center; flex-wrap:wrap}
+.task.crit{box-shadow:inset 3px 0 0 var(--brand); padding-left:12px}
+.pill.crit{color:var(--brand-ink); border-color:var(--brand)}
+.pill.blk{color:var(--bad); background:var(--bad-bg); border-color:transparent}
+.critpath{font-size:12.5px; line-height:1.8; margin-bottom:10px}
+.critpath .tid{font-family:"IBM Plex Mono",monospace; color:var(--brand-ink); font-weight:600}
 
 /* ---- decisions (the showcase) ---- */
 .dtools{display:flex; gap:9px; flex-wrap:wrap; align-items:center; margin-bottom:12px}
@@ -357,16 +291,20 @@ footer.ft{margin-top:40px; padding-top:16px; border-top:1px solid var(--line-2);
   color:var(--mute); font-family:"IBM Plex Mono",monospace; font-size:11.5px}
 """
 
-JS = r"""
+# paint-cheap overrides on top of CSS (paint.py)
+CSS_LITE = paint.LITE_CSS + r"""
+.bigbar{box-shadow:none}
+.task.crit{box-shadow:none; border-left:3px solid var(--brand); padding-left:9px}
+.task{content-visibility:auto; contain-intrinsic-size:auto 62px}
+.card,.stat{contain:content}
+details.disc>summary::before{transition:none}
+"""
+
+JS = SEARCH_JS + r"""
 function decFilter(){
-  const q=(document.getElementById('dq').value||'').toLowerCase();
+  const q=document.getElementById('dq').value||'';
   const f=document.querySelector('.fbtn.on').dataset.f;
-  let n=0;
-  document.querySelectorAll('.dec').forEach(d=>{
-    const okF = f==='all' || d.dataset.status===f;
-    const okQ = !q || d.dataset.search.includes(q);
-    const show = okF && okQ; d.style.display = show?'':'none'; if(show)n++;
-  });
+  const n=decApply(q,f);
   document.getElementById('dcount').textContent=n+' shown';
   document.getElementById('dempty').style.display=n?'none':'';
 }
@@ -376,6 +314,14 @@ document.addEventListener('click',e=>{
     e.target.classList.add('on'); decFilter();
   }
 });
+document.addEventListener('toggle',e=>{
+  const d=e.target;
+  if(d.open && d.hasAttribute && d.hasAttribute('data-lazy')){
+    const t=d.querySelector(':scope>template');
+    if(t) t.replaceWith(document.importNode(t.content,true));
+    d.removeAttribute('data-lazy');
+  }
+},true);
 document.addEventListener('keydown',e=>{
   if(e.key==='/' && e.target.tagName!=='INPUT'){e.preventDefault();
     document.getElementById('dq').focus();}
@@ -383,138 +329,212 @@ document.addEventListener('keydown',e=>{
 """
 
 
-def emit_dashboard():
-    chips = (f'<span class="chip"><b>{meta["task_count"]}</b> tasks</span>'
-             f'<span class="chip"><b>{meta["decision_count"]}</b> decisions</span>'
-             f'<span class="chip {"zero good" if meta["verification_debt"]=="0" else "bad"}">'
-             f'<b>{meta["verification_debt"]}</b> verif debt</span>'
-             f'<span class="chip {"zero" if meta["drift_deferrals"]=="0" else "bad"}">'
-             f'<b>{meta["drift_deferrals"]}</b> drift</span>')
+def deferred(summary, body, style=""):
+    """A closed `<details class="disc card">` whose {body} ships in an inert
+    `<template>`: not parsed into DOM or styled until the first open (JS)."""
+    style = f' style="{style}"' if style else ""
+    return (f'<details class="disc card" data-lazy{style}><summary>{summary}</summary>'
+            f'<template><div class="body">{body}</div></template></details>')
+
+
+def dec_row(d):
+    st = "superseded" if d.status.lower() == "superseded" else "decided"
+    link = (f'<a href="{html.escape(d.link)}" target="_blank" rel="noopener">'
+            f'open record →</a>' if d.link else "")
+    return (
+        f'<details class="dec" data-status="{st}">'
+        f'<summary><span class="did">{html.escape(d.id)}</span>'
+        f'<span class="dt">{html.escape(d.title)}</span>'
+        f'<span class="bdg {status_class(d.status)}">{html.escape(d.status)}</span>'
+        f'</summary><div class="dbody"><span class="sel">{md_inline(d.sel)}</span>'
+        f'{link}</div></details>')
+
+
+def dec_tools(decisions, dec_rows, windowed=False):
+    """Search/filter bar + list. {windowed}: rows ship as JSON (declist.py)."""
+    n_dec = len(decisions)
+    n_sup = sum(1 for d in decisions if d.status.lower() == "superseded")
+    return f"""
+    <div class="dtools">
+      <input id="dq" placeholder="Search {n_dec} decisions by id, title, or rationale…   ( / )"
+             oninput="decInput()">
+      <button class="fbtn on" data-f="all">All {n_dec}</button>
+      <button class="fbtn" data-f="decided">Decided {n_dec-n_sup}</button>
+      <button class="fbtn" data-f="superseded">Superseded {n_sup}</button>
+      <span class="pill" id="dcount">{n_dec} shown</span>
+    </div>
+    <div class="card" id="dlist" data-f="all"{' data-win' if windowed else ''}>{dec_rows}
+      <div class="empty" id="dempty" style="display:none">No decisions match.</div>
+    </div>
+    <script type="application/json" id="dix">{decision_index(decisions)}</script>"""
+
+
+def stream_console(m, cache=NOCACHE, windowed=False, lite=False, asset_mode="cdn"):
+    """Render the HTML project console for a parsed `Dashboard`, as a stream
+    of str chunks (the CONSOLE template; see tmpl.py).
+
+    Each section goes through {cache} (an `rcache.RenderCache`), keyed by the
+    parsed records it is built from, so unchanged sections are reused as-is.
+    {windowed} renders the decisions list from a JSON payload (declist.py);
+    {lite} adds the paint-cheap CSS_LITE overrides (paint.py); {asset_mode}
+    "inline" embeds the vendored fonts subset to the page's text instead of
+    linking Google Fonts (assets.py).
+    """
+    frag, val = cache.frag, cache.val
+    meta = m.meta
+    complete = str(m.complete)
+    counts = tuple(meta[k] for k in ("task_count", "decision_count",
+                                     "verification_debt", "drift_deferrals"))
+    chips = frag("chips", counts, lambda: (
+        f'<span class="chip"><b>{meta["task_count"]}</b> tasks</span>'
+        f'<span class="chip"><b>{meta["decision_count"]}</b> decisions</span>'
+        f'<span class="chip {"zero good" if meta["verification_debt"]=="0" else "bad"}">'
+        f'<b>{meta["verification_debt"]}</b> verif debt</span>'
+        f'<span class="chip {"zero" if meta["drift_deferrals"]=="0" else "bad"}">'
+        f'<b>{meta["drift_deferrals"]}</b> drift</span>'))
+    bigbar = frag("bigbar", complete, lambda: (
+        f'<div class="bigbar"><i style="width:{complete}%"></i></div>'))
 
     # status strip
-    strip = "".join(
+    strip = frag("strip", m.status_counts, lambda: "".join(
         f'<div class="stat {status_class(s)}"><div class="n">{c}</div>'
         f'<div class="l">{html.escape(s)}</div></div>'
-        for s, c in status_counts)
+        for s, c in m.status_counts))
 
     # phases: split complete vs not
     def phase_row(p):
-        pct = round(100 * p["done"] / p["total"]) if p["total"] else 100
-        return (f'<div class="phase"><div class="pn">{html.escape(p["name"])}</div>'
-                f'<div class="frac">{p["done"]}/{p["total"]} · '
-                f'<span class="bdg {status_class(p["status"])}">'
-                f'{html.escape(p["status"])}</span></div>'
+        pct = round(100 * p.done / p.total) if p.total else 100
+        return (f'<div class="phase"><div class="pn">{html.escape(p.name)}</div>'
+                f'<div class="frac">{p.done}/{p.total} · '
+                f'<span class="bdg {status_class(p.status)}">'
+                f'{html.escape(p.status)}</span></div>'
                 f'<div class="pbar"><i style="width:{pct}%"></i></div></div>')
-    active = [p for p in phases if "Complete" not in p["status"]]
-    done_ph = [p for p in phases if "Complete" in p["status"]]
-    phase_html = '<div class="card">' + "".join(phase_row(p) for p in active) + '</div>'
-    phase_html += (f'<details class="disc card" style="margin-top:10px">'
-                   f'<summary>{len(done_ph)} completed phases '
-                   f'<span class="pill">{sum(p["done"] for p in done_ph)} tasks</span>'
-                   f'</summary><div class="body"><div class="card">'
-                   + "".join(phase_row(p) for p in done_ph) + '</div></div></details>')
+
+    def phase_block():
+        active, done_ph = m.active_phases, m.done_phases
+        return ('<div class="card">' + "".join(phase_row(p) for p in active) + '</div>'
+                + deferred(f'{len(done_ph)} completed phases '
+                           f'<span class="pill">{sum(p.done for p in done_ph)} tasks</span>',
+                           '<div class="card">' + "".join(phase_row(p) for p in done_ph)
+                           + '</div>', style="margin-top:10px"))
+    phase_html = frag("phases", m.phases, phase_block)
 
     # acceptance criteria
-    acc_items = "".join(
-        f'<li>{"✅" if mark=="x" else "⬜"} {md_inline(name)} '
-        f'<span style="color:var(--ink-soft)">— {md_inline(note)}</span></li>'
-        for mark, name, note in acc)
-    acc_html = (f'<details class="disc card"><summary>Acceptance Criteria '
-                f'<span class="pill">{acc_summary}</span></summary>'
-                f'<div class="body"><ul style="margin:0;padding-left:18px;'
-                f'font-size:12.5px;line-height:1.7">{acc_items}</ul></div></details>')
+    def acc_block():
+        acc_items = "".join(
+            f'<li>{"✅" if c.done else "⬜"} {md_inline(c.name)} '
+            f'<span style="color:var(--ink-soft)">— {md_inline(c.note)}</span></li>'
+            for c in m.criteria)
+        return deferred(f'Acceptance Criteria <span class="pill">{m.criteria_summary}</span>',
+                        f'<ul style="margin:0;padding-left:18px;'
+                        f'font-size:12.5px;line-height:1.7">{acc_items}</ul>')
+    acc_html = frag("criteria", (m.criteria, m.criteria_summary), acc_block)
 
     # recent activity
-    rec_html = '<div class="card pad" style="margin-top:10px"><h3 class="nb" '
-    rec_html += ('style="font-size:12px;text-transform:uppercase;letter-spacing:.06em;'
-                 'color:var(--ink-soft);margin:0 0 8px">Recent activity</h3>')
-    rec_html += "".join(
-        f'<div style="font-size:12.5px;padding:3px 0;border-bottom:1px solid var(--line)">'
-        f'<span class="mono" style="color:var(--ink-soft)">{d}</span> &nbsp;{md_inline(t)}</div>'
-        for d, t in recent) + '</div>'
-
-    # tasks
-    def task_phase(tp):
-        if not tp["tasks"]:
-            return (f'<details class="disc"><summary>{html.escape(tp["name"])} '
-                    f'<span class="pill" style="margin-left:auto">✅ {tp["finished"]} '
-                    f'finished{html.escape(tp["extra"])}</span></summary></details>')
-        rows = ""
-        for t in tp["tasks"]:
-            rows += (f'<div class="task"><p class="tt"><span class="tid">T{t["id"]}</span>'
-                     f'{md_inline(t["title"])}</p><div class="row">'
-                     f'<span class="bdg {status_class(t["status"])}">{html.escape(t["status"])}</span>'
-                     f'<span class="pill">diff {t["diff"]}</span>'
-                     f'<span class="pill">{owner_badge(t["owner"])}</span>'
-                     + (f'<span class="pill">deps {html.escape(t["deps"])}</span>'
-                        if t["deps"] not in ("—", "") else "") + '</div></div>')
-        return (f'<details class="disc card" open style="margin-bottom:8px">'
-                f'<summary>{html.escape(tp["name"])} '
-                f'<span class="pill" style="margin-left:auto">{len(tp["tasks"])} active</span>'
-                f'</summary><div class="body">{rows}</div></details>')
-    active_tp = [tp for tp in task_phases if tp["tasks"]]
-    done_tp = [tp for tp in task_phases if not tp["tasks"]]
-    tasks_html = "".join(task_phase(tp) for tp in active_tp)
-    tasks_html += (f'<details class="disc card"><summary>{len(done_tp)} completed phases '
-                   f'<span class="pill" style="margin-left:auto">'
-                   f'{sum(tp["finished"] for tp in done_tp)} finished tasks</span></summary>'
-                   f'<div class="body">' + "".join(task_phase(tp) for tp in done_tp)
-                   + '</div></details>')
+    rec_html = frag("recent", m.recent, lambda: (
+        '<div class="card pad" style="margin-top:10px"><h3 class="nb" '
+        'style="font-size:12px;text-transform:uppercase;letter-spacing:.06em;'
+        'color:var(--ink-soft);margin:0 0 8px">Recent activity</h3>'
+        + "".join(
+            f'<div style="font-size:12.5px;padding:3px 0;border-bottom:1px solid var(--line)">'
+            f'<span class="mono" style="color:var(--ink-soft)">{d}</span> &nbsp;{md_inline(t)}</div>'
+            for d, t in m.recent) + '</div>'))
+
+    # tasks, annotated from the dependency graph (depgraph.py)
+    graph = depgraph.analyze(m)
+
+    def task_group(tp):
+        anns = tuple(graph.ann(t.id) for t in tp.tasks)
+        return frag("tasks", (tp, anns), lambda: TASK_GROUP.render(
+            tp=tp, anns=anns, md_inline=md_inline, status_class=status_class,
+            owner_badge=owner_badge))
+
+    def crit_block():
+        if not graph.critical:
+            return ""
+        path = graph.path
+        shown = " → ".join(f'<span class="tid">T{tid}</span>' for tid in path[:CRIT_SHOWN])
+        more = f" → … (+{len(path) - CRIT_SHOWN})" if len(path) > CRIT_SHOWN else ""
+        return (f'<div class="card pad critpath"><b>Critical path</b> '
+                f'<span class="pill">{len(path)} tasks · difficulty {graph.critical_weight}</span>'
+                f'<span class="pill">{graph.levels} dependency levels</span>'
+                + (f'<span class="pill blk">cycle: {", ".join(graph.cycle[:8])}</span>'
+                   if graph.cycle else "")
+                + (f'<span class="pill blk">{len(graph.behind)} behind the cycle</span>'
+                   if graph.behind else "") + f'<br>{shown}{more}</div>')
+    crit_html = frag("critpath", (tuple(graph.path), graph.critical_weight, graph.levels,
+                                  tuple(graph.cycle), tuple(graph.behind)), crit_block)
+    active_tp = [tp for tp in m.task_groups if tp.tasks]
+    done_tp = [tp for tp in m.task_groups if not tp.tasks]
 
     # decisions
-    dec_rows = ""
-    for d in decisions:
-        st = "superseded" if d["status"].lower() == "superseded" else "decided"
-        search = (d["id"] + " " + d["title"] + " " + d["sel_text"]).lower()
-        link = (f'<a href="{html.escape(d["link"])}" target="_blank" rel="noopener">'
-                f'open record →</a>' if d["link"] else "")
-        dec_rows += (
-            f'<details class="dec" data-status="{st}" '
-            f'data-search="{html.escape(search, quote=True)}">'
-            f'<summary><span class="did">{html.escape(d["id"])}</span>'
-            f'<span class="dt">{html.escape(d["title"])}</span>'
-            f'<span class="bdg {status_class(d["status"])}">{html.escape(d["status"])}</span>'
-            f'</summary><div class="dbody"><span class="sel">{md_inline(d["sel_text"])}</span>'
-            f'{link}</div></details>')
-    n_dec = len(decisions)
-    n_sup = sum(1 for d in decisions if d["status"].lower() == "superseded")
-    dec_html = f"""
-    <div class="dtools">
-      <input id="dq" placeholder="Search {n_dec} decisions by id, title, or rationale…   ( / )"
-             oninput="decFilter()">
-      <button class="fbtn on" data-f="all">All {n_dec}</button>
-      <button class="fbtn" data-f="decided">Decided {n_dec-n_sup}</button>
-      <button class="fbtn" data-f="superseded">Superseded {n_sup}</button>
-      <span class="pill" id="dcount">{n_dec} shown</span>
-    </div>
-    <div class="card">{dec_rows}
-      <div class="empty" id="dempty" style="display:none">No decisions match.</div>
-    </div>"""
+    def dec_block():
+        if windowed:
+            return dec_tools(m.decisions, noscript(m.decisions, md_inline), True) \
+                + payload(m.decisions, md_inline, status_class)
+        return dec_tools(m.decisions, "".join(dec_row(d) for d in m.decisions))
+    dec_html = frag("decwin" if windowed else "decisions", m.decisions, dec_block)
 
     def hsec(title, count, anchor):
         return (f'<div class="h-sec" id="{anchor}"><h2>{title}</h2>'
-                f'<span class="ct">{count}</span><span class="rule"></span></div>')
-
-    return f"""<!doctype html><html lang="en"><head><meta charset="utf-8">
+                f'<span class="ct">{val(count)}</span><span class="rule"></span></div>')
+
+    return assets.embed(CONSOLE.stream(
+        m=m, meta=meta, complete=complete, chips=chips, bigbar=bigbar, val=val, hsec=hsec, strip=strip,
+        phase_html=phase_html, acc_html=acc_html, rec_html=rec_html,
+        active_tp=active_tp, done_tp=done_tp, task_group=task_group, crit_html=crit_html,
+        dec_html=dec_html,
+        action=lambda: frag("action", m.action, lambda: md_block(m.action)),
+        notes=lambda: frag("notes", m.notes, lambda: md_block(m.notes)),
+        style=CSS + SEARCH_CSS + (WINDOW_CSS if windowed else "") + (CSS_LITE if lite else ""),
+        font_links=assets.font_links(asset_mode), script=JS), asset_mode)
+
+
+def emit_console(m, cache=NOCACHE, windowed=False, lite=False, asset_mode="cdn"):
+    """`stream_console()` joined into one str, for in-process callers."""
+    return "".join(stream_console(m, cache, windowed, lite, asset_mode))
+
+
+TASK_GROUP = Template("console-tasks", """\
+{% if not tp.tasks %}<details class="disc"><summary>{{ tp.name }} \
+<span class="pill" style="margin-left:auto">✅ {{{ tp.finished }}} \
+finished{{ tp.extra }}</span></summary></details>\
+{% else %}<details class="disc card" open style="margin-bottom:8px">\
+<summary>{{ tp.name }} \
+<span class="pill" style="margin-left:auto">{{{ len(tp.tasks) }}} active</span>\
+</summary><div class="body">\
+{% for t, a in zip(tp.tasks, anns) %}<div class="task{{{ ' crit' if a and a.critical else '' }}}">\
+<p class="tt"><span class="tid">T{{{ t.id }}}</span>\
+{{{ md_inline(t.title) }}}</p><div class="row">\
+<span class="bdg {{{ status_class(t.status) }}}">{{ t.status }}</span>\
+<span class="pill">diff {{{ t.diff }}}</span>\
+<span class="pill">{{{ owner_badge(t.owner) }}}</span>\
+{% if t.deps not in ("—", "") %}<span class="pill">deps {{ t.deps }}</span>{% end %}\
+{% if a %}{% if a.critical %}<span class="pill crit">◆ critical path</span>{% end %}\
+{% if a.cycle %}<span class="pill blk">⟳ {{{ "on a dependency cycle" if a.cycle == "on" else "blocked by a cycle" }}}</span>{% end %}\
+{% if a.blockers %}<span class="pill blk">⛓ {{{ a.blockers }}} open blocker{{{ "" if a.blockers == 1 else "s" }}}\
+{% if a.start %} · start with {{{ ", ".join("T" + s for s in a.start) }}}{% end %}</span>{% end %}\
+{% if a.decisions %}<span class="pill blk">awaits {{ ", ".join(a.decisions) }}</span>{% end %}\
+{% if a.unblocks %}<span class="pill">unblocks {{{ a.unblocks }}}</span>{% end %}{% end %}</div></div>\
+{% end %}</div></details>{% end %}""")
+
+CONSOLE = Template("console", """<!doctype html><html lang="en"><head><meta charset="utf-8">
 <meta name="viewport" content="width=device-width,initial-scale=1">
-<title>{html.escape(project_name)} — Console</title>
-<link rel="preconnect" href="https://fonts.googleapis.com">
-<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-<link href="https://fonts.googleapis.com/css2?family=Fraunces:opsz,wght@9..144,500;9..144,600&family=IBM+Plex+Mono:wght@400;500;600&family=IBM+Plex+Sans:wght@400;500;600&display=swap" rel="stylesheet">
-<style>{CSS}</style></head>
+<title>{{ m.name }} — Console</title>
+{{{ font_links }}}<style>{{{ style }}}</style></head>
 <body>
 <header class="mast"><div class="mast-in">
-  <span class="crumb">{html.escape(phase_label)}</span>
-  <h1>{html.escape(project_name)}</h1>
-  <div class="chips">{chips}</div>
+  <span class="crumb">{{ m.phase_label }}</span>
+  <h1>{{ m.name }}</h1>
+  <div class="chips">{{{ chips }}}</div>
 </div></header>
 
 <div class="wrap">
   <div class="hero">
-    <div class="sub">{html.escape(started)} · spec {meta['spec_version']} · template {meta['template_version']}</div>
-    <div class="bigbar"><i style="width:{complete}%"></i></div>
-    <div class="bigbar-row"><span class="pct">{complete}%</span>
-      <span class="meta">complete — {meta['task_count']} tasks across {len(phases)} phases · {meta['decision_count']} decisions</span></div>
+    <div class="sub">{{ m.started }} · spec {{{ val(meta['spec_version']) }}} · template {{{ val(meta['template_version']) }}}</div>
+    {{{ bigbar }}}
+    <div class="bigbar-row"><span class="pct">{{{ val(complete) }}}%</span>
+      <span class="meta">complete — {{{ val(meta['task_count']) }}} tasks across {{{ val(len(m.phases)) }}} phases · {{{ val(meta['decision_count']) }}} decisions</span></div>
   </div>
 
   <nav class="sub">
@@ -523,42 +543,59 @@ def emit_dashboard():
     <a href="#notes">💡 Notes</a>
   </nav>
 
-  <section class="blk action">{hsec("🚨 Action Required","needs you","action")}
-    <div class="card pad">{action_html}</div></section>
+  <section class="blk action">{{{ hsec("🚨 Action Required", "needs you", "action") }}}
+    <div class="card pad">{{{ action() }}}</div></section>
 
-  <section class="blk">{hsec("📊 Progress",complete+"% complete","progress")}
-    <div class="stats">{strip}</div>
-    {phase_html}
-    <div style="margin-top:10px">{acc_html}</div>
-    {rec_html}
+  <section class="blk">{{{ hsec("📊 Progress", complete + "% complete", "progress") }}}
+    <div class="stats">{{{ strip }}}</div>
+    {{{ phase_html }}}
+    <div style="margin-top:10px">{{{ acc_html }}}</div>
+    {{{ rec_html }}}
   </section>
 
-  <section class="blk">{hsec("📋 Tasks",meta["task_count"]+" total","tasks")}
-    {tasks_html}</section>
+  <section class="blk">{{{ hsec("📋 Tasks", meta["task_count"] + " total", "tasks") }}}
+    {{{ crit_html }}}{% for tp in active_tp %}{{{ task_group(tp) }}}{% end %}\
+<details class="disc card" data-lazy><summary>{{{ val(len(done_tp)) }}} completed phases \
+<span class="pill" style="margin-left:auto">\
+{{{ val(sum(tp.finished for tp in done_tp)) }}} finished tasks</span></summary>\
+<template><div class="body">{% for tp in done_tp %}{{{ task_group(tp) }}}{% end %}</div></template></details></section>
 
-  <section class="blk">{hsec("📋 Decisions",meta["decision_count"]+" records","decisions")}
-    {dec_html}</section>
+  <section class="blk">{{{ hsec("📋 Decisions", meta["decision_count"] + " records", "decisions") }}}
+    {{{ dec_html }}}</section>
 
-  <section class="blk notes">{hsec("💡 Notes","","notes")}
-    <div class="card pad">{notes_html}</div></section>
+  <section class="blk notes">{{{ hsec("💡 Notes", "", "notes") }}}
+    <div class="card pad">{{{ notes() }}}</div></section>
 
-  <footer class="ft">generated {meta['generated']} · {meta['task_count']} tasks ·
-    {meta['decision_count']} decisions · 0 drift · 0 verification debt ·
+  <footer class="ft">generated {{{ val(meta['generated']) }}} · {{{ val(meta['task_count']) }}} tasks ·
+    {{{ val(meta['decision_count']) }}} decisions · 0 drift · 0 verification debt ·
     <em>HTML render-target prototype — same data as dashboard.md</em></footer>
 </div>
-<script>{JS}</script>
-</body></html>"""
+<script>{{{ script }}}</script>
+</body></html>""")
 
 
 # ============================================================ EMIT: before.html
-def emit_before():
-    md_json = json.dumps(RAW)
+def emit_before(raw, asset_mode="cdn"):
+    """Render the status-quo page: the raw Markdown as a Markdown viewer shows
+    it. "inline" renders it here (mdrender.py) under the vendored / built-in
+    github-markdown CSS; "cdn" ships it to marked.js and the cdnjs stylesheet."""
+    if asset_mode == "cdn":
+        head = assets.CDN_MARKDOWN
+        body = f"""<article class="markdown-body" id="md"></article>
+<script>
+  const src = {json.dumps(raw)};
+  // strip the leading HTML META comment so it doesn't dump raw into the page
+  document.getElementById('md').innerHTML =
+    marked.parse(src.replace(/<!-- DASHBOARD META[\\s\\S]*?-->/, ''));
+</script>"""
+    else:
+        head = f"<style>{assets.markdown_css()}</style>"
+        body = (f'<article class="markdown-body" id="md">'
+                f'{mdrender.render(re.sub(r"<!-- DASHBOARD META.*?-->", "", raw, flags=re.S))}</article>')
     return f"""<!doctype html><html lang="en"><head><meta charset="utf-8">
 <meta name="viewport" content="width=device-width,initial-scale=1">
 <title>dashboard.md (rendered Markdown)</title>
-<link rel="stylesheet"
-  href="https://cdnjs.cloudflare.com/ajax/libs/github-markdown-css/5.5.1/github-markdown-light.min.css">
-<script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>
+{head}
 <style>
   body{{margin:0;background:#fff}}
   .markdown-body{{box-sizing:border-box;max-width:980px;margin:0 auto;padding:38px}}
@@ -567,18 +604,105 @@ def emit_before():
 </style></head><body>
 <div class="note">▼ <b>Status quo</b>: <code>.claude/dashboard.md</code> as a Markdown
   viewer (GitHub / VS&nbsp;Code preview) renders it — 640 lines, one flat scroll.</div>
-<article class="markdown-body" id="md"></article>
-<script>
-  const src = {md_json};
-  // strip the leading HTML META comment so it doesn't dump raw into the page
-  document.getElementById('md').innerHTML =
-    marked.parse(src.replace(/<!-- DASHBOARD META[\\s\\S]*?-->/, ''));
-</script></body></html>"""
-
-
-(HERE / "dashboard.html").write_text(emit_dashboard(), encoding="utf-8")
-(HERE / "before.html").write_text(emit_before(), encoding="utf-8")
-print(f"OK  parsed: {len(phases)} phases, {len(task_phases)} task-groups, "
-      f"{len(decisions)} decisions, {len(status_counts)} status rows, "
-      f"{len(acc)} criteria, {len(recent)} recent")
-print("wrote dashboard.html, before.html")
+{body}</body></html>"""
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render dashboard.html + before.html "
+                                 "from styler-dashboard.md.")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignore .dashcache/ and re-emit every section")
+    ap.add_argument("--decisions", choices=MODES, default="auto",
+                    help="decisions list: every row in the DOM (full), rows from a "
+                    f"JSON payload, viewport only (windowed); auto = windowed above "
+                    f"{WINDOW_AUTO}")
+    ap.add_argument("--paint", choices=paint.MODES, default="auto",
+                    help="full styles, or lite: no noise / blur / shadows, content-visibility "
+                    "on long lists, for weak clients; auto = lite above --lite-above rows")
+    ap.add_argument("--lite-above", type=int, default=paint.LITE_AUTO, metavar="N",
+                    help=f"--paint auto threshold: open tasks + decisions (default {paint.LITE_AUTO})")
+    ap.add_argument("--assets", choices=assets.MODES, default="auto",
+                    help="inline: vendored fonts subset into the page, before.html rendered "
+                    "here, no network requests (assets.py); cdn: Google Fonts / marked.js links; "
+                    "auto = inline once every face is in vendor/fonts/")
+    ap.add_argument("--history", type=pathlib.Path, default=history.DB, metavar="PATH",
+                    help="progress snapshot store, kept whatever --no-cache says (history.py; "
+                    "default %(default)s)")
+    ap.add_argument("--tasks", metavar="CLAUDE_DIR", type=pathlib.Path,
+                    help="read tasks/decisions from a .claude/ directory's JSON "
+                    "instead of the Markdown tables (taskjson.py)")
+    ap.add_argument("-j", "--jobs", type=int, help="--tasks decoder threads")
+    ap.add_argument("--watch", action="store_true",
+                    help="keep running and regenerate on every source change (serve.py)")
+    ap.add_argument("--serve", action="store_true",
+                    help="--watch, and serve the page on 127.0.0.1 with live section patching")
+    ap.add_argument("--port", type=int, default=serve.PORT, help="--serve port")
+    ap.add_argument("--profile", nargs="?", const="time", choices=prof.MODES,
+                    help="time every pipeline stage (alloc: + allocation peaks, slower); "
+                    "prints a summary and writes a Chrome trace to .dashcache/")
+    args = ap.parse_args(argv)
+    if args.profile:
+        prof.start(args.profile)
+        prof.instrument(mdscan, "scan")
+        prof.instrument(ir, "load", "parse_dashboard")
+        prof.instrument(depgraph, "analyze")
+        prof.instrument(history, "record")
+        prof.instrument(sys.modules[__name__], "load_dashboard", "md_inline", "md_block",
+                        "dec_row", "emit_before")
+
+    raw = SRC.read_text(encoding="utf-8")
+    m = base = ir.load(SRC, cache=not args.no_cache)
+    task_cache = None if args.no_cache or not args.tasks else cache_file(args.tasks)
+    if args.tasks:
+        m, st = load_dashboard(args.tasks, base=base, jobs=args.jobs, cache_path=task_cache)
+        print(f"tasks: {st['files']} files from {args.tasks}, {st['decoded']} decoded")
+        if "diverged" in st:
+            print("META task_hash is stale" + "".join(f"\n  {line}" for line in st["diverged"]))
+        if "duplicates" in st:
+            print(f"duplicate task ids {', '.join(st['duplicates'])}: task_hash is the flat hash")
+    windowed = window_mode(args.decisions, len(m.decisions))
+    lite = paint.lite_mode(args.paint, paint.rows(m), args.lite_above)
+    args.assets = assets.resolve(args.assets)
+    history.record(SRC, m, args.history)        # snapshot for viz.py's trend charts
+    out = HERE / "dashboard.html"
+    cache = prof.cache(NOCACHE if args.no_cache else RenderCache(out, source_salt(*SALT)))
+    key = doc_key(m, windowed, lite, assets.key(args.assets))
+    if cache.fresh(key):
+        wrote = []
+    else:
+        with prof.stage("write", file=out.name):
+            chunks = prof.stream("emit", stream_console(m, cache, windowed, lite, args.assets))
+            wrote = [out.name] if stream_if_changed(out, chunks) else []
+        cache.save(key)
+    if write_if_changed(HERE / "before.html", emit_before(raw, args.assets)):
+        wrote.append("before.html")
+    print(f"OK  parsed: {len(m.phases)} phases, {len(m.task_groups)} task-groups, "
+          f"{len(m.decisions)} decisions, {len(m.status_counts)} status rows, "
+          f"{len(m.criteria)} criteria, {len(m.recent)} recent")
+    print(f"sections: {cache.misses} rendered, {cache.hits} cached · "
+          + ("lite paint · " if lite else "")
+          + (f"wrote {', '.join(wrote)}" if wrote else "outputs unchanged"))
+    if args.profile:
+        print(prof.finish(cache_dir(HERE) / (out.name + ".trace.json")))
+    if not (args.watch or args.serve):
+        return
+
+    def render(changed, live):
+        nonlocal raw, base
+        if str(SRC) in changed:
+            raw = SRC.read_text(encoding="utf-8")
+            base = ir.load(SRC, cache=not args.no_cache)
+            write_if_changed(HERE / "before.html", emit_before(raw, args.assets))
+        m = base
+        if args.tasks:
+            m, _ = load_dashboard(args.tasks, base=base, jobs=args.jobs, cache_path=task_cache)
+        history.record(SRC, m, args.history)
+        return "".join(stream_console(m, live, window_mode(args.decisions, len(m.decisions)),
+                                      paint.lite_mode(args.paint, paint.rows(m), args.lite_above),
+                                      args.assets))
+    serve.run(out, render, lambda: [SRC], watch_dirs(args.tasks) if args.tasks else (),
+              serve=args.serve, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Windowed decisions list: one JSON payload, only the visible rows in the DOM.
+
+In the default ("full") mode both emitters write every decision as a complete
+`<details class="dec">` element; at 1,000+ decisions that is megabytes of DOM
+parsed and laid out up front, even where the list starts collapsed. In
+"windowed" mode the rows ship as ONE compact JSON array of pre-escaped fields
+and `WINDOW_JS` creates only the rows inside the scroll viewport (plus a
+small overscan), absolutely positioned over a spacer whose height is a
+prefix sum of row heights. Collapsed rows are one line (titles ellipsize) so
+they share a measured height; open rows keep their own measured height, so
+expanding one does not make the list jump. Scroll redraws are rAF-throttled.
+
+Search and the status filter keep working: `decApply()` (searchidx.py) hands
+the ranked / filtered doc order to `decWindow()` instead of marking rows.
+Without JS the `<noscript>` block is a plain list paginated with `:target`
+links, so the DOM cost there is paid only by the no-JS reader.
+
+Mode selection: `window_mode("auto", n)` switches to windowed above
+WINDOW_AUTO decisions; "full" / "windowed" force either.
+"""
+
+import html
+import json
+
+WINDOW_AUTO = 500
+PAGE = 100
+MODES = ("auto", "full", "windowed")
+
+
+def window_mode(mode, n):
+    """True when a list of {n} decisions should render windowed under {mode}."""
+    return mode == "windowed" or (mode == "auto" and n > WINDOW_AUTO)
+
+
+def payload(decisions, inline, cls):
+    """`<script>` pair: the rows as JSON ([id, title, status, class, sel html,
+    link], all HTML-ready) and the windowing code."""
+    rows = [[html.escape(d.id), html.escape(d.title), html.escape(d.status),
+             cls(d.status), inline(d.sel), html.escape(d.link)] for d in decisions]
+    data = (json.dumps(rows, ensure_ascii=False, separators=(",", ":"))
+            .replace("</", "<\\/").replace("<!--", "<\\!--"))
+    return (f'<script type="application/json" id="drows">{data}</script>'
+            f'<script>{WINDOW_JS}</script>')
+
+
+def noscript(decisions, inline, per_page=PAGE):
+    """No-JS fallback: the decisions as plain numbered pages of {per_page}."""
+    pages = [decisions[i:i + per_page] for i in range(0, len(decisions), per_page)]
+    nav = " ".join(f'<a href="#dp{n}">{n}</a>' for n in range(1, len(pages) + 1))
+    body = "".join(
+        f'<ol class="dpage" id="dp{n}" start="{(n - 1) * per_page + 1}">'
+        + "".join(f'<li><b>{html.escape(d.id)}</b> {html.escape(d.title)} — '
+                  f'<i>{html.escape(d.status)}</i> · {inline(d.sel)}'
+                  + (f' <a href="{html.escape(d.link)}">record</a>' if d.link else "")
+                  + "</li>" for d in page)
+        + "</ol>" for n, page in enumerate(pages, 1))
+    return (f'<noscript><div class="dpages"><nav class="dpnav">Page: {nav}</nav>'
+            f'{body}</div></noscript>')
+
+
+WINDOW_CSS = ("#dlist[data-win]{overflow:auto;position:relative} .card#dlist[data-win]{max-height:70vh}"
+              " .dwin{position:relative} .dwin>.dec{position:absolute;left:0;right:0}"
+              " .dwin>.dec>summary>*{min-width:0;white-space:nowrap;overflow:hidden;text-overflow:ellipsis}"
+              " .dpage{display:none} .dpage:first-of-type,.dpage:target{display:block}"
+              " .dpages:has(.dpage:target)>.dpage:first-of-type:not(:target){display:none}"
+              " .dpnav{padding:8px 4px;font-size:12px} .dpage li{padding:4px 0}")
+
+WINDOW_JS = r"""
+(()=>{const list=document.getElementById('dlist'),R=JSON.parse(document.getElementById('drows').textContent);
+ const pad=document.createElement('div');pad.className='dwin';list.prepend(pad);
+ let order=null,H=40,tops=null,raf=0;const open=new Map(),OVER=8;
+ const count=()=>order?order.length:R.length,at=k=>order?order[k]:k;
+ const row=(i,top)=>{const r=R[i];return `<details class="dec" data-i="${i}" style="top:${top}px"${open.has(i)?' open':''}><summary><span class="did">${r[0]}</span><span class="dt">${r[1]}</span><span class="bdg ${r[3]}">${r[2]}</span></summary><div class="dbody"><span class="sel">${r[4]}</span>${r[5]?`<a href="${r[5]}" target="_blank" rel="noopener">open record →</a>`:''}</div></details>`;};
+ function layout(){const n=count();tops=new Float64Array(n+1);
+  for(let k=0;k<n;k++)tops[k+1]=tops[k]+H+(open.get(at(k))||0);pad.style.height=tops[n]+'px';}
+ function draw(){raf=0;const n=count(),top=list.scrollTop-pad.offsetTop,vh=list.clientHeight||600;
+  let lo=0,hi=n;while(lo<hi){const mid=(lo+hi)>>1;if(tops[mid+1]<=top)lo=mid+1;else hi=mid;}
+  let out='';for(let k=Math.max(0,lo-OVER);k<n&&tops[k]<top+vh+OVER*H;k++)out+=row(at(k),tops[k]);
+  pad.innerHTML=out;
+  const first=pad.querySelector('.dec:not([open])');
+  if(first&&first.offsetHeight&&first.offsetHeight!==H){H=first.offsetHeight;layout();draw();}}
+ const later=()=>{if(!raf)raf=requestAnimationFrame(draw);};
+ list.addEventListener('scroll',later);addEventListener('resize',later);
+ list.addEventListener('toggle',e=>{const d=e.target;if(!d.dataset||d.dataset.i===undefined)return;
+  const i=+d.dataset.i,extra=d.open?Math.max(0,d.offsetHeight-H):undefined;
+  if(open.get(i)===extra)return;if(extra===undefined)open.delete(i);else open.set(i,extra);layout();later();},true);
+ document.addEventListener('toggle',e=>{if(e.target!==list&&e.target.contains&&e.target.contains(list)&&e.target.open)later();},true);
+ window.decWindow=o=>{order=o;list.scrollTop=0;layout();draw();};
+ layout();draw();})();
+"""
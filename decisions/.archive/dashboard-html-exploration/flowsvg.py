@@ -0,0 +1,872 @@
+"""
+Mermaid flowchart -> static inline SVG, laid out in Python at render time.
+
+viz.py used to copy the dashboard's ```mermaid block into `<pre class="mermaid">`
+and import mermaid@11 from jsdelivr to lay it out in the browser: a
+multi-megabyte runtime whose layout took seconds (and sometimes hung the tab)
+on graphs with hundreds of task nodes. `render(src)` parses the flowchart
+subset the dashboard emits and returns finished SVG markup, so the flow
+section costs nothing at load time and is byte-stable (cacheable) output.
+
+Supported: `graph` / `flowchart` with TB/TD/BT/LR/RL; node shapes [ ] ( ) ([ ])
+[[ ]] (( )) { } {{ }} and quoted labels with `<br>` / `#quot;` entities; edges
+--> --- -.-> ==> --o --x <-->, labels as `-- text -->` or `-->|text|`,
+chains (`A --> B --> C`) and `&` groups; `subgraph id [title]` … `end`
+(nested); `classDef`, `class`, `:::cls` and `style`. Anything else
+(`click`, `linkStyle`, …) is skipped.
+
+Layout is the classic layered (Sugiyama) pipeline, each step linear or
+near-linear in nodes + edges:
+
+  1. cycles are broken by reversing DFS back edges (drawn the right way round);
+  2. ranks by longest path over a topological order, sources then pulled next
+     to their first successor so they do not strand long edges;
+  3. edges spanning several ranks get one dummy node per rank crossed;
+  4. crossing reduction: alternating down/up barycenter sweeps, with subgraph
+     members kept contiguous per rank, keeping the ordering with the fewest
+     crossings (counted per rank pair in O(E log V) with a Fenwick tree);
+  5. positions across the rank: a few median-pull passes, each resolved to the
+     closest non-overlapping placement by isotonic regression (pool adjacent
+     violators);
+  6. edges are S-curves through their dummy points; subgraphs are the
+     padded bounding box of their members.
+
+Subgraph boxes are per-rank contiguous but not globally convex, so on
+pathological inputs a box can overlap a foreign node; the dashboard's
+graphs (tasks, decision diamonds, phase nodes) do not hit that.
+"""
+
+import html
+import re
+import unicodedata
+from functools import lru_cache
+
+FONT = 14                       # px, matches the page's IBM Plex Sans body text
+LINE = 18                       # px per label line
+WRAP = 220                      # px before a label wraps
+PAD_X, PAD_Y = 14, 9            # label padding inside a node
+NODE_SEP, DUMMY_SEP = 22, 10    # gap between neighbours within a rank
+RANK_SEP = 56                   # gap between ranks
+CLUSTER_PAD, CLUSTER_TITLE = 12, 20
+SWEEPS = 8
+
+THEME = {"fill": "#fbf9f4", "stroke": "#cabfa8", "text": "#211d17",
+         "line": "#9a8f78", "cluster": "#f4f0e6"}
+
+
+# ---------------------------------------------------------------- parsing --
+
+class Node:
+    __slots__ = ("id", "label", "shape", "classes", "style", "cluster")
+
+    def __init__(self, nid, cluster):
+        self.id, self.label, self.shape = nid, nid, "rect"
+        self.classes, self.style, self.cluster = [], "", cluster
+
+
+class Edge:
+    __slots__ = ("src", "dst", "label", "line", "head", "tail")
+
+    def __init__(self, src, dst, label, line, head, tail):
+        self.src, self.dst, self.label = src, dst, label
+        self.line, self.head, self.tail = line, head, tail
+
+
+class Cluster:
+    __slots__ = ("id", "title", "parent", "depth")
+
+    def __init__(self, cid, title, parent, depth):
+        self.id, self.title, self.parent, self.depth = cid, title, parent, depth
+
+
+class Graph:
+    def __init__(self):
+        self.direction = "TB"
+        self.nodes = {}         # id -> Node, in first-mention order
+        self.edges = []
+        self.clusters = {}      # id -> Cluster
+        self.classdefs = {}     # name -> css declarations
+
+    def node(self, nid, cluster):
+        n = self.nodes.get(nid)
+        if n is None:
+            n = self.nodes[nid] = Node(nid, cluster)
+        return n
+
+
+SHAPES = [("([", "])", "stadium"), ("[[", "]]", "subroutine"), ("((", "))", "circle"),
+          ("{{", "}}", "hexagon"), ("[(", ")]", "round"), ("[/", "/]", "rect"),
+          ("[\\", "\\]", "rect"), ("[", "]", "rect"), ("(", ")", "round"),
+          ("{", "}", "rhombus"), (">", "]", "rect")]
+NODE = re.compile(r"\s*(\w+)(?:" + "|".join(
+    re.escape(o) + r'\s*(?:"([^"]*)"|(.*?))\s*' + re.escape(c) for o, c, _ in SHAPES)
+    + r")?(?::::([\w-]+))?")
+LINK = re.compile(
+    r"\s*(<?)(?:(--|==|-\.)\s+([^\s>-][^>|]*?)\s+(?:-{2,}|={2,}|\.+-)([>ox]?)"
+    r"|(-{2,}|={2,}|-\.+-)([>ox]?))(?:\s*\|([^|]*)\|)?")
+HEADER = re.compile(r"(?:graph|flowchart)(?:\s+(TB|TD|BT|LR|RL))?\s*$")
+SUBGRAPH = re.compile(r'(\w+)\s*\[\s*"?(.*?)"?\s*\]$')
+
+
+def _split(src):
+    """Statements: lines, also split on `;` outside quotes; comments dropped."""
+    for line in src.splitlines():
+        line = line.strip()
+        if not line or line.startswith("%%"):
+            continue
+        part, quoted = "", False
+        for ch in line:
+            if ch == '"':
+                quoted = not quoted
+            if ch == ";" and not quoted:
+                if part.strip():
+                    yield part.strip()
+                part = ""
+            else:
+                part += ch
+        if part.strip():
+            yield part.strip()
+
+
+def _css(decl):
+    """Mermaid style declarations -> (shape css, text css), sanitised."""
+    shape, text = [], []
+    for item in decl.split(","):
+        k, _, v = item.partition(":")
+        k, v = k.strip(), v.strip()
+        if not re.fullmatch(r"[\w-]+", k) or not re.fullmatch(r"[#\w\s.%()-]+", v):
+            continue
+        (text if k == "color" else shape).append(f"{'fill' if k == 'color' else k}:{v}")
+    return ";".join(shape), ";".join(text)
+
+
+def _group(g, stmt, pos, cluster):
+    """`A & B[..]` at {pos} -> (node ids, new pos); ([], pos) if nothing parses."""
+    ids = []
+    while True:
+        m = NODE.match(stmt, pos)
+        if not m:
+            break
+        n = g.node(m[1], cluster)
+        for i, (_, _, shape) in enumerate(SHAPES):
+            label = m[2 + 2 * i] if m[2 + 2 * i] is not None else m[3 + 2 * i]
+            if label is not None:
+                n.label, n.shape = label, shape
+                break
+        if m[2 + 2 * len(SHAPES)]:
+            n.classes.append(m[2 + 2 * len(SHAPES)])
+        ids.append(m[1])
+        pos = m.end()
+        amp = re.match(r"\s*&", stmt[pos:])
+        if not amp:
+            break
+        pos += amp.end()
+    return ids, pos
+
+
+def parse(src):
+    """Mermaid flowchart source -> Graph."""
+    g, stack = Graph(), [None]
+    for stmt in _split(src):
+        word = stmt.split(None, 1)[0]
+        if HEADER.match(stmt):
+            d = HEADER.match(stmt)[1] or "TB"
+            g.direction = "TB" if d == "TD" else d
+        elif word == "subgraph":
+            rest = stmt[len(word):].strip()
+            m = SUBGRAPH.match(rest)
+            if m:
+                cid, title = m[1], m[2]
+            elif re.fullmatch(r"\w+", rest):
+                cid, title = rest, rest
+            else:
+                cid, title = f"_sg{len(g.clusters)}", rest.strip('"')
+            parent = stack[-1]
+            depth = g.clusters[parent].depth + 1 if parent else 1
+            g.clusters[cid] = Cluster(cid, title, parent, depth)
+            stack.append(cid)
+        elif stmt == "end":
+            if len(stack) > 1:
+                stack.pop()
+        elif word == "classDef":
+            _, names, *decl = stmt.split(None, 2)
+            for name in names.split(","):
+                g.classdefs[name] = _css(decl[0] if decl else "")
+        elif word == "class":
+            _, ids, *name = stmt.split(None, 2)
+            for nid in ids.split(","):
+                if name and nid in g.nodes:
+                    g.nodes[nid].classes.append(name[0].strip())
+        elif word == "style":
+            _, nid, *decl = stmt.split(None, 2)
+            if nid in g.nodes and decl:
+                g.nodes[nid].style = decl[0]
+        elif word in ("click", "linkStyle", "direction", "accTitle", "accDescr"):
+            continue
+        else:
+            cluster = stack[-1]
+            left, pos = _group(g, stmt, 0, cluster)
+            while left:
+                m = LINK.match(stmt, pos)
+                if not m:
+                    break
+                right, pos = _group(g, stmt, m.end(), cluster)
+                body = m[2] or m[5]
+                line = "thick" if body[0] == "=" else "dotted" if "." in body else "solid"
+                head = m[4] if m[2] else m[6]
+                label = (m[3] or m[7] or "").strip().strip('"')
+                for a in left:
+                    for b in right:
+                        g.edges.append(Edge(a, b, label, line, head, m[1]))
+                left = right
+    for cid in g.clusters:                  # an edge to a subgraph id means its members
+        g.nodes.pop(cid, None)
+    members = {}
+    for n in g.nodes.values():
+        if n.cluster:
+            members.setdefault(n.cluster, n.id)
+    g.edges = [e for e in (Edge(members.get(e.src, e.src), members.get(e.dst, e.dst), e.label,
+                                e.line, e.head, e.tail) for e in g.edges)
+               if e.src in g.nodes and e.dst in g.nodes]
+    return g
+
+
+# ------------------------------------------------------------ measurement --
+
+def _text(label):
+    """Label source -> display lines (entities decoded, `<br>` breaks, tags dropped)."""
+    label = re.sub(r"#(\w+);", lambda m: f"&#{m[1]};" if m[1].isdigit() else f"&{m[1]};", label)
+    label = re.sub(r"<br\s*/?>", "\n", label, flags=re.I)
+    label = html.unescape(re.sub(r"<[^>]*>", "", label))
+    return label.split("\n")
+
+
+@lru_cache(maxsize=None)
+def _em(ch):
+    """Rough advance of {ch} in em (no font metrics at render time)."""
+    if ch in " il.,:;'|!":
+        return 0.3
+    if unicodedata.east_asian_width(ch) in "WF" or ord(ch) >= 0x1F000:
+        return 1.15
+    if unicodedata.category(ch) in ("Mn", "Cf"):        # accents, VS16, ZWJ
+        return 0.0
+    return 0.72 if ch.isupper() or ch in "mw@%" else 0.55
+
+
+def _width(s):
+    return sum(map(_em, s)) * FONT
+
+
+def _wrap(label):
+    """Display lines of {label}, word-wrapped at WRAP px."""
+    out = []
+    for line in _text(label):
+        cur = ""
+        for word in line.split(" "):
+            if cur and _width(cur + " " + word) > WRAP:
+                out.append(cur)
+                cur = word
+            else:
+                cur = f"{cur} {word}" if cur else word
+        out.append(cur)
+    return out
+
+
+def _size(shape, lines):
+    w = max((_width(t) for t in lines), default=0) + 2 * PAD_X
+    h = len(lines) * LINE + 2 * PAD_Y
+    if shape == "rhombus":
+        return w + h, h + w * 0.35
+    if shape == "circle":
+        return (max(w, h),) * 2
+    if shape == "hexagon":
+        return w + h / 2, h
+    if shape == "subroutine":
+        return w + 16, h
+    return w, h
+
+
+# ----------------------------------------------------------------- layout --
+
+def _acyclic(n, succ):
+    """Edge pairs (u, v) that close a cycle in DFS order (iterative)."""
+    state, back = [0] * n, set()
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root], stack = 1, [(root, iter(succ[root]))]
+        while stack:
+            u, it = stack[-1]
+            for v in it:
+                if state[v] == 1:
+                    back.add((u, v))
+                elif not state[v]:
+                    state[v] = 1
+                    stack.append((v, iter(succ[v])))
+                    break
+            else:
+                state[u] = 2
+                stack.pop()
+    return back
+
+
+def _ranks(n, edges):
+    """Longest-path ranks over a topological order; sources pulled down."""
+    succ, indeg = [[] for _ in range(n)], [0] * n
+    for u, v in edges:
+        succ[u].append(v)
+        indeg[v] += 1
+    order = [u for u in range(n) if not indeg[u]]
+    for u in order:                         # list grows while iterating: Kahn
+        for v in succ[u]:
+            indeg[v] -= 1
+            if not indeg[v]:
+                order.append(v)
+    rank = [0] * n
+    for u in order:
+        for v in succ[u]:
+            rank[v] = max(rank[v], rank[u] + 1)
+    has_pred = {v for _, v in edges}
+    for u in reversed(order):
+        if u not in has_pred and succ[u]:
+            rank[u] = min(rank[v] for v in succ[u]) - 1
+    return rank
+
+
+def _crossings(upper, lower, pos, down):
+    """Crossings between two adjacent ranks (Fenwick-tree inversion count)."""
+    pairs = sorted((pos[u], pos[v]) for u in upper for v in down[u])
+    size, tree, total = len(lower) + 1, [0] * (len(lower) + 2), 0
+    for seen, (_, p) in enumerate(pairs):
+        i, le = p + 1, 0
+        while i:
+            le += tree[i]
+            i -= i & -i
+        total += seen - le
+        i = p + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return total
+
+
+def _order_rank(layer, bary, path, ckey=None):
+    """Sort {layer} by barycenter, keeping each cluster (by {path}) contiguous.
+    Clusters sort by {ckey} (their mean position over all ranks) when given,
+    so sibling subgraphs keep one left-to-right order on every rank."""
+    def build(items, depth):
+        groups, keyed = {}, []
+        for v in items:
+            p = path[v]
+            if len(p) > depth:
+                if p[depth] not in groups:
+                    groups[p[depth]] = []
+                    keyed.append((p[depth], None))
+                groups[p[depth]].append(v)
+            else:
+                keyed.append((None, v))
+        scored = []
+        for i, (cid, v) in enumerate(keyed):
+            if v is None:
+                vs = groups[cid]
+                key = ckey[cid] if ckey else sum(bary[x] for x in vs) / len(vs)
+                scored.append((key, i, cid, vs))
+            else:
+                scored.append((bary[v], i, None, v))
+        scored.sort(key=lambda s: (s[0], s[1]))
+        out = []
+        for _, _, cid, v in scored:
+            out.extend(build(v, depth + 1) if cid is not None else [v])
+        return out
+    return build(layer, 0)
+
+
+def _isotonic(desired, gaps, weights=None):
+    """Closest positions to {desired} (weighted least squares) with
+    x[i+1] >= x[i] + gaps[i] — pool adjacent violators, linear time."""
+    off, acc = [], 0.0
+    for i in range(len(desired)):
+        off.append(acc)
+        if i < len(gaps):
+            acc += gaps[i]
+    blocks = []                             # [mean, weight, count]
+    for i, (d, o) in enumerate(zip(desired, off)):
+        blocks.append([d - o, weights[i] if weights else 1, 1])
+        while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+            m2, w2, n2 = blocks.pop()
+            m1, w1, n1 = blocks[-1]
+            blocks[-1] = [(m1 * w1 + m2 * w2) / (w1 + w2), w1 + w2, n1 + n2]
+    out = []
+    for m, _, k in blocks:
+        out.extend([m] * k)
+    return [y + o for y, o in zip(out, off)]
+
+
+def _boxes(n, path, x, y, cross, along, rank, horiz, flip):
+    """Subgraph boxes [cross-lo, along-lo, cross-hi, along-hi] and rank spans."""
+    boxes, spans = {}, {}
+    for v in range(n):
+        for depth, cid in enumerate(path[v]):
+            b = boxes.setdefault(cid, [1e18, 1e18, -1e18, -1e18])
+            lo, hi = spans.get(cid, (rank[v], rank[v]))
+            spans[cid] = (min(lo, rank[v]), max(hi, rank[v]))
+            nest = len(path[v]) - depth - 1
+            inner, titles = nest * CLUSTER_PAD, nest * CLUSTER_TITLE
+            c0, c1 = x[v] - cross[v] / 2 - inner, x[v] + cross[v] / 2 + inner
+            a0, a1 = y[v] - along[v] / 2 - inner, y[v] + along[v] / 2 + inner
+            if horiz:
+                c0 -= titles
+            elif flip:
+                a1 += titles
+            else:
+                a0 -= titles
+            b[0], b[1], b[2], b[3] = min(b[0], c0), min(b[1], a0), max(b[2], c1), max(b[3], a1)
+    for b in boxes.values():            # the title band sits on the box's top edge
+        b[0] -= CLUSTER_PAD + (CLUSTER_TITLE if horiz else 0)
+        b[2] += CLUSTER_PAD
+        b[1] -= CLUSTER_PAD + (CLUSTER_TITLE if not horiz and not flip else 0)
+        b[3] += CLUSTER_PAD + (CLUSTER_TITLE if not horiz and flip else 0)
+    return boxes, spans
+
+
+def _compact(layers, x, cross, path, parents, ckey, spans, n, horiz):
+    """Separate subgraph boxes from foreign nodes, in place.
+
+    Each subgraph gets two variables, its left and right wall, shared by every
+    rank its box crosses; each rank's sequence (nodes and walls, siblings in
+    {ckey} order) becomes a chain of minimum-gap constraints. The constraint
+    graph is acyclic, so one topological pass packs everything right of its
+    current x, a mirrored pass packs it left, and their mean (also feasible)
+    is kept. Boxes drawn around members then never contain a foreign node."""
+    total = len(x)
+    wall = {cid: (total + 2 * i, total + 2 * i + 1) for i, cid in enumerate(ckey)}
+    title = CLUSTER_TITLE if horiz else 0
+
+    def half(v):
+        return cross[v] / 2 + (DUMMY_SEP if v >= n else NODE_SEP) / 2
+
+    def gap(a, b):                          # items: node index, or ("L"|"R", cid)
+        if not isinstance(a, tuple):
+            if not isinstance(b, tuple):
+                return half(a) + half(b)
+            return half(a) if b[0] == "L" else cross[a] / 2 + CLUSTER_PAD
+        if not isinstance(b, tuple):
+            return half(b) if a[0] == "R" else CLUSTER_PAD + title + cross[b] / 2
+        return {"LL": CLUSTER_PAD + title, "RR": CLUSTER_PAD, "RL": NODE_SEP}.get(a[0] + b[0], 0)
+
+    succ = [[] for _ in range(total + 2 * len(ckey))]
+    for r, layer in enumerate(layers):
+        live = {cid for cid, (lo, hi) in spans.items() if lo <= r <= hi}
+        if not live:
+            continue
+        present = {cid for v in layer for cid in path[v]}
+        empty = {}                          # parent path -> boxes with no member here
+        for cid in sorted(live - present, key=ckey.get):
+            if not parents[cid] or parents[cid][-1] in present:
+                empty.setdefault(parents[cid], []).append(cid)
+        items, cur = [], ()
+
+        def flush(ctx, limit):
+            pend = empty.get(ctx)
+            while pend and ckey[pend[0]] < limit:
+                cid = pend.pop(0)
+                items.extend([("L", cid), ("R", cid)])
+        for i, v in enumerate(layer):
+            p, k = path[v], 0
+            while k < min(len(cur), len(p)) and cur[k] == p[k]:
+                k += 1
+            while len(cur) > k:
+                flush(cur, float("inf"))
+                items.append(("R", cur[-1]))
+                cur = cur[:-1]
+            while len(cur) < len(p):
+                flush(cur, ckey[p[len(cur)]])
+                cur = p[:len(cur) + 1]
+                items.append(("L", cur[-1]))
+            flush(cur, (i + 0.5) / len(layer))
+            items.append(v)
+        while True:
+            flush(cur, float("inf"))
+            if not cur:
+                break
+            items.append(("R", cur[-1]))
+            cur = cur[:-1]
+        ids = [it if not isinstance(it, tuple) else wall[it[1]][it[0] == "R"] for it in items]
+        for a, b, ia, ib in zip(items, items[1:], ids, ids[1:]):
+            succ[ia].append((ib, gap(a, b)))
+
+    pred = [[] for _ in succ]
+    for u, outs in enumerate(succ):
+        for v, d in outs:
+            pred[v].append((u, d))
+    indeg = [len(p) for p in pred]
+    order = [u for u, d in enumerate(indeg) if not d]
+    for u in order:
+        for v, _ in succ[u]:
+            indeg[v] -= 1
+            if not indeg[v]:
+                order.append(v)
+    if len(order) < len(succ):              # inconsistent sibling order: leave as is
+        return
+    inf = float("inf")
+    right = [x[u] if u < total else -inf for u in range(len(succ))]
+    for u in order:
+        for v, d in succ[u]:
+            right[v] = max(right[v], right[u] + d)
+    left = [x[u] if u < total else inf for u in range(len(succ))]
+    for u in reversed(order):
+        for v, d in pred[u]:
+            left[v] = min(left[v], left[u] - d)
+    for v in range(total):
+        x[v] = (right[v] + left[v]) / 2
+
+
+def layout(g):
+    """Positions for Graph {g}: dict of boxes, edge polylines, cluster boxes, size."""
+    ids = list(g.nodes)
+    index = {nid: i for i, nid in enumerate(ids)}
+    n = len(ids)
+    horiz, flip = g.direction in ("LR", "RL"), g.direction in ("BT", "RL")
+    sizes, lines = [], []
+    for nid in ids:
+        node = g.nodes[nid]
+        ls = _wrap(node.label)
+        lines.append(ls)
+        w, h = _size(node.shape, ls)
+        sizes.append((h, w) if horiz else (w, h))       # (cross, along)
+
+    raw = [(index[e.src], index[e.dst]) for e in g.edges]
+    succ = [[] for _ in range(n)]
+    for u, v in raw:
+        if u != v:
+            succ[u].append(v)
+    back = _acyclic(n, succ)
+    dag = [(v, u) if (u, v) in back else (u, v) for u, v in raw if u != v]
+    rank = _ranks(n, list(dict.fromkeys(dag)))
+
+    def cpath(cid):
+        p = []
+        while cid:
+            p.append(cid)
+            cid = g.clusters[cid].parent
+        return tuple(reversed(p))
+    path = [cpath(g.nodes[nid].cluster) for nid in ids]
+    parents = {cid: cpath(cid)[:-1] for cid in g.clusters}
+
+    # dummy chains for long edges; every segment then joins adjacent ranks
+    cross = [s[0] for s in sizes]
+    chains, down, up = [], {}, {}
+    for ei, (u, v) in enumerate(raw):
+        if u == v:
+            chains.append(None)
+            continue
+        a, b = (v, u) if (u, v) in back else (u, v)
+        p, q = path[a], path[b]
+        k = 0
+        while k < min(len(p), len(q)) and p[k] == q[k]:
+            k += 1
+        chain = [a]
+        for r in range(rank[a] + 1, rank[b]):
+            d = len(rank)
+            rank.append(r)
+            path.append(p[:k])
+            cross.append(0)
+            chain.append(d)
+        chain.append(b)
+        for x, y in zip(chain, chain[1:]):
+            down.setdefault(x, []).append(y)
+            up.setdefault(y, []).append(x)
+        chains.append(chain)
+    total = len(rank)
+    for x in range(total):
+        down.setdefault(x, [])
+        up.setdefault(x, [])
+
+    base = min(rank) if rank else 0
+    nranks = max(rank) - base + 1 if rank else 0
+    layers = [[] for _ in range(nranks)]
+    for v in range(total):
+        layers[rank[v] - base].append(v)
+
+    # crossing reduction: barycenter sweeps, keep the best ordering seen
+    pos = [0] * total
+    for layer in layers:
+        for i, v in enumerate(_order_rank(layer, {v: 0 for v in layer}, path)):
+            pos[v] = i
+    for r, layer in enumerate(layers):
+        layer.sort(key=pos.__getitem__)
+
+    def count():
+        return sum(_crossings(layers[r], layers[r + 1], pos, down) for r in range(nranks - 1))
+
+    def cluster_keys():
+        acc = {}
+        for layer in layers:
+            for i, v in enumerate(layer):
+                for cid in path[v]:
+                    a = acc.setdefault(cid, [0.0, 0])
+                    a[0] += (i + 0.5) / len(layer)
+                    a[1] += 1
+        return {cid: t / k for cid, (t, k) in acc.items()}
+    best, best_layers = count(), [list(layer) for layer in layers]
+    for sweep in range(SWEEPS):
+        downward = sweep % 2 == 0
+        ckey = cluster_keys() if g.clusters else None
+        for r in (range(1, nranks) if downward else range(nranks - 2, -1, -1)):
+            nbr, width = (up, len(layers[r - 1])) if downward else (down, len(layers[r + 1]))
+            bary = {}
+            for v in layers[r]:
+                ns = nbr[v]
+                bary[v] = (sum(pos[x] for x in ns) / len(ns) / width if ns
+                           else pos[v] / len(layers[r]))
+            layers[r] = _order_rank(layers[r], bary, path, ckey)
+            for i, v in enumerate(layers[r]):
+                pos[v] = i
+        c = count()
+        if c < best:
+            best, best_layers = c, [list(layer) for layer in layers]
+        if not best:
+            break
+    layers = best_layers
+    for layer in layers:
+        for i, v in enumerate(layer):
+            pos[v] = i
+    if g.clusters:                          # one sibling order shared by every rank
+        ckey = {cid: k + i * 1e-9 for i, (cid, k) in enumerate(sorted(cluster_keys().items()))}
+        for layer in layers:
+            layer[:] = _order_rank(layer, {v: (pos[v] + 0.5) / len(layer) for v in layer}, path, ckey)
+            for i, v in enumerate(layer):
+                pos[v] = i
+
+    # along-axis coordinates per rank; wider gaps where edge labels sit
+    label_room = [0.0] * nranks
+    for ei, chain in enumerate(chains):
+        e = g.edges[ei]
+        if chain and e.label:
+            k = (len(chain) - 1) // 2
+            if chain[0] != index[e.src]:        # render() walks reversed chains backwards
+                k = len(chain) - 2 - k
+            r = min(rank[chain[k]], rank[chain[k + 1]]) - base
+            ls = _wrap(e.label)
+            need = (max(_width(t) for t in ls) + 12) if horiz else len(ls) * LINE + 8
+            label_room[r] = max(label_room[r], need)
+    thick = [max((sizes[v][1] for v in layer if v < n), default=0) for layer in layers]
+    sep = RANK_SEP + (2 * CLUSTER_PAD + CLUSTER_TITLE if g.clusters and not horiz else 0)
+    y, at = [0.0] * total, 0.0
+    for r, layer in enumerate(layers):
+        at += thick[r] / 2
+        for v in layer:
+            y[v] = at
+        at += thick[r] / 2 + max(sep, label_room[r] + 16)
+    along = [sizes[v][1] if v < n else 0 for v in range(total)]
+
+    # cross-axis coordinates: median pulls resolved by isotonic regression
+    def gap(a, b):
+        sep = DUMMY_SEP if a >= n or b >= n else NODE_SEP
+        pa, pb = path[a], path[b]
+        k = 0
+        while k < min(len(pa), len(pb)) and pa[k] == pb[k]:
+            k += 1
+        edge = (len(pa) - k) + (len(pb) - k)
+        title = CLUSTER_TITLE if horiz and len(pb) > k else 0
+        return (cross[a] + cross[b]) / 2 + sep + edge * CLUSTER_PAD + title
+
+    x = [0.0] * total
+    for layer in layers:
+        gaps = [gap(a, b) for a, b in zip(layer, layer[1:])]
+        for v, c in zip(layer, _isotonic([0.0] * len(layer), gaps)):
+            x[v] = c
+    for sweep in range(4):
+        downward = sweep % 2 == 0
+        for r in (range(nranks) if downward else range(nranks - 1, -1, -1)):
+            layer = layers[r]
+            if not layer:
+                continue
+            desired = []
+            for v in layer:
+                ns = up[v] + down[v] if sweep >= 2 else up[v] if downward else down[v]
+                if ns:
+                    xs = sorted(x[w] for w in ns)
+                    mid = len(xs) // 2
+                    desired.append(xs[mid] if len(xs) % 2 else (xs[mid - 1] + xs[mid]) / 2)
+                else:
+                    desired.append(x[v])
+            gaps = [gap(a, b) for a, b in zip(layer, layer[1:])]
+            for v, c in zip(layer, _isotonic(desired, gaps)):
+                x[v] = c
+
+    if g.clusters:
+        _, spans = _boxes(n, path, x, y, cross, along, rank, horiz, flip)
+        spans = {cid: (lo - base, hi - base) for cid, (lo, hi) in spans.items()}
+        _compact(layers, x, cross, path, parents, ckey, spans, n, horiz)
+    boxes, _ = _boxes(n, path, x, y, cross, along, rank, horiz, flip)
+
+    lo = min([x[v] - cross[v] / 2 for v in range(total)] + [b[0] for b in boxes.values()], default=0)
+    for v in range(total):
+        x[v] -= lo
+    for b in boxes.values():
+        b[0] -= lo
+        b[2] -= lo
+    shift_c = -min([b[0] for b in boxes.values()] + [0])
+    shift_a = -min([b[1] for b in boxes.values()] + [0])
+    ext_c = max([x[v] + cross[v] / 2 for v in range(total)] + [b[2] for b in boxes.values()] + [0]) + shift_c
+    ext_a = max([y[v] + sizes[v][1] / 2 for v in range(n)] + [b[3] for b in boxes.values()] + [0]) + shift_a
+
+    def pt(c, a):
+        c, a = c + shift_c, a + shift_a
+        if flip:
+            a = ext_a - a
+        return (a, c) if horiz else (c, a)
+
+    nodes = {}
+    for v, nid in enumerate(ids):
+        cx, cy = pt(x[v], y[v])
+        w, h = (sizes[v][1], sizes[v][0]) if horiz else sizes[v]
+        nodes[nid] = (cx, cy, w, h, lines[v])
+    clusters = {}
+    for cid, (c0, a0, c1, a1) in boxes.items():
+        (p0, q0), (p1, q1) = pt(c0, a0), pt(c1, a1)
+        clusters[cid] = (min(p0, p1), min(q0, q1), abs(p1 - p0), abs(q1 - q0))
+
+    routes = []
+    for ei, chain in enumerate(chains):
+        e = g.edges[ei]
+        u = index[e.src]
+        if chain is None:
+            cx, cy, w, h, _ = nodes[e.src]
+            routes.append([(cx + w / 2, cy), (cx + w / 2 + 24, cy - h), (cx, cy - h / 2)])
+            continue
+        pts = []
+        for k, v in enumerate(chain):
+            half = sizes[v][1] / 2 if v < n else 0
+            if k == 0:
+                pts.append(pt(x[v], y[v] + half))
+            elif k == len(chain) - 1:
+                pts.append(pt(x[v], y[v] - half))
+            else:
+                pts.append(pt(x[v], y[v]))
+        if chain[0] != u:
+            pts.reverse()
+        routes.append(pts)
+    return nodes, routes, clusters, ((ext_a, ext_c) if horiz else (ext_c, ext_a))
+
+
+# ------------------------------------------------------------------- SVG --
+
+def _ident(s):
+    return re.sub(r"[^\w-]", "", s)
+
+
+def _f(v):
+    return f"{v:.1f}".rstrip("0").rstrip(".")
+
+
+def _path(pts, horiz):
+    d = f"M{_f(pts[0][0])},{_f(pts[0][1])}"
+    for (ax, ay), (bx, by) in zip(pts, pts[1:]):
+        if horiz:
+            m = (ax + bx) / 2
+            d += f" C{_f(m)},{_f(ay)} {_f(m)},{_f(by)} {_f(bx)},{_f(by)}"
+        else:
+            m = (ay + by) / 2
+            d += f" C{_f(ax)},{_f(m)} {_f(bx)},{_f(m)} {_f(bx)},{_f(by)}"
+    return d
+
+
+def _shape(shape, cx, cy, w, h):
+    x0, y0 = cx - w / 2, cy - h / 2
+    if shape == "rhombus":
+        return (f'<polygon class="sh" points="{_f(cx)},{_f(y0)} {_f(x0 + w)},{_f(cy)} '
+                f'{_f(cx)},{_f(y0 + h)} {_f(x0)},{_f(cy)}"/>')
+    if shape == "hexagon":
+        k = h / 4
+        return (f'<polygon class="sh" points="{_f(x0 + k)},{_f(y0)} {_f(x0 + w - k)},{_f(y0)} '
+                f'{_f(x0 + w)},{_f(cy)} {_f(x0 + w - k)},{_f(y0 + h)} {_f(x0 + k)},{_f(y0 + h)} '
+                f'{_f(x0)},{_f(cy)}"/>')
+    if shape == "circle":
+        return f'<circle class="sh" cx="{_f(cx)}" cy="{_f(cy)}" r="{_f(w / 2)}"/>'
+    rx = {"round": 10, "stadium": h / 2}.get(shape, 4)
+    out = (f'<rect class="sh" x="{_f(x0)}" y="{_f(y0)}" width="{_f(w)}" height="{_f(h)}" '
+           f'rx="{_f(rx)}"/>')
+    if shape == "subroutine":
+        out += (f'<path class="sh" d="M{_f(x0 + 8)},{_f(y0)}v{_f(h)}'
+                f'M{_f(x0 + w - 8)},{_f(y0)}v{_f(h)}"/>')
+    return out
+
+
+def _label(lines, cx, cy):
+    top = cy - (len(lines) - 1) * LINE / 2
+    spans = "".join(f'<tspan x="{_f(cx)}" y="{_f(top + i * LINE)}">{html.escape(t)}</tspan>'
+                    for i, t in enumerate(lines))
+    return f'<text text-anchor="middle" dominant-baseline="central">{spans}</text>'
+
+
+MARKERS = ('<marker id="fg-a" viewBox="0 0 10 10" refX="9" refY="5" markerWidth="7" markerHeight="7" '
+           'orient="auto-start-reverse"><path d="M0,0L10,5L0,10z" class="mk"/></marker>'
+           '<marker id="fg-o" viewBox="0 0 10 10" refX="9" refY="5" markerWidth="8" markerHeight="8" '
+           'orient="auto-start-reverse"><circle cx="5" cy="5" r="4" class="mk"/></marker>'
+           '<marker id="fg-x" viewBox="0 0 10 10" refX="5" refY="5" markerWidth="9" markerHeight="9" '
+           'orient="auto-start-reverse"><path d="M1,1L9,9M9,1L1,9" class="mkx"/></marker>')
+HEADS = {">": "fg-a", "o": "fg-o", "x": "fg-x"}
+
+
+def render(src):
+    """Mermaid flowchart {src} -> inline `<svg>` markup ("" when it has no nodes)."""
+    g = parse(src)
+    if not g.nodes:
+        return ""
+    horiz = g.direction in ("LR", "RL")
+    nodes, routes, clusters, (w, h) = layout(g)
+    t = THEME
+    css = [f".fg{{font:{FONT}px/1.2 'IBM Plex Sans',sans-serif}}",
+           f".fg .sh{{fill:{t['fill']};stroke:{t['stroke']};stroke-width:1.2}}",
+           f".fg text{{fill:{t['text']}}} .fg .ed{{fill:none;stroke:{t['line']};stroke-width:1.5}}",
+           ".fg .ed.dotted{stroke-dasharray:3 4} .fg .ed.thick{stroke-width:3}",
+           f".fg .mk{{fill:{t['line']}}} .fg .mkx{{stroke:{t['line']};stroke-width:2}}",
+           f".fg .cl{{fill:{t['cluster']};stroke:{t['stroke']};stroke-dasharray:4 3}}",
+           f".fg .ct{{font-size:12px;fill:{t['line']};font-weight:600}}",
+           f".fg .el{{fill:{t['fill']};opacity:.92}} .fg .et{{font-size:12px}}"]
+    rules = [(f".c-{_ident(name)}", decl) for name, decl in g.classdefs.items()]
+    rules += [(f"#n-{_ident(n.id)}", _css(n.style)) for n in g.nodes.values() if n.style]
+    for sel, (shape, text) in rules:
+        if shape:
+            css.append(f".fg {sel}>.sh{{{shape}}}")
+        if text:
+            css.append(f".fg {sel}>text{{{text}}}")
+    out = [f'<svg class="fg" xmlns="http://www.w3.org/2000/svg" role="img" '
+           f'aria-label="Dependency graph" width="{_f(w)}" height="{_f(h)}" '
+           f'viewBox="0 0 {_f(w)} {_f(h)}"><style>{" ".join(css)}</style><defs>{MARKERS}</defs>']
+    for cid in sorted(clusters, key=lambda c: g.clusters[c].depth):
+        cx0, cy0, cw, ch = clusters[cid]
+        out.append(f'<rect class="cl" x="{_f(cx0)}" y="{_f(cy0)}" width="{_f(cw)}" '
+                   f'height="{_f(ch)}" rx="8"/><text class="ct" x="{_f(cx0 + 8)}" '
+                   f'y="{_f(cy0 + 14)}">{html.escape(" ".join(_text(g.clusters[cid].title)))}</text>')
+    labels = []
+    for e, pts in zip(g.edges, routes):
+        attrs = ""
+        if e.head in HEADS:
+            attrs += f' marker-end="url(#{HEADS[e.head]})"'
+        if e.tail:
+            attrs += ' marker-start="url(#fg-a)"'
+        loop = e.src == e.dst
+        d = (f"M{_f(pts[0][0])},{_f(pts[0][1])} Q{_f(pts[1][0])},{_f(pts[1][1])} "
+             f"{_f(pts[2][0])},{_f(pts[2][1])}") if loop else _path(pts, horiz)
+        out.append(f'<path class="ed {e.line}" d="{d}"{attrs}/>')
+        if e.label:
+            k = (len(pts) - 1) // 2
+            (ax, ay), (bx, by) = pts[k], pts[min(k + 1, len(pts) - 1)]
+            ls = _wrap(e.label)
+            lw, lh = max(_width(s) for s in ls) + 8, len(ls) * LINE
+            mx, my = (ax + bx) / 2, (ay + by) / 2
+            labels.append(f'<g><rect class="el" x="{_f(mx - lw / 2)}" y="{_f(my - lh / 2)}" '
+                          f'width="{_f(lw)}" height="{_f(lh)}" rx="3"/><g class="et">'
+                          f'{_label(ls, mx, my)}</g></g>')
+    out.extend(labels)
+    for nid, (cx, cy, nw, nh, lines) in nodes.items():
+        node = g.nodes[nid]
+        cls = "".join(f" c-{_ident(c)}" for c in node.classes)
+        out.append(f'<g id="n-{_ident(nid)}" class="nd{cls}">'
+                   f'<title>{html.escape(nid)}</title>'
+                   f'{_shape(node.shape, cx, cy, nw, nh)}{_label(lines, cx, cy)}</g>')
+    out.append("</svg>")
+    return "".join(out)
@@ -0,0 +1,258 @@
+"""
+Stdlib TrueType subsetter + WOFF packer, for fonts inlined into a page.
+
+`subset(ttf_bytes, chars)` keeps .notdef, the glyphs {chars} map to through
+`cmap`, and every component those glyphs reference (composite closure);
+renumbers them; and rebuilds the tables that hold glyph ids:
+
+    glyf / loca   kept glyphs only, long offsets
+    hmtx / hhea   one full metric per kept glyph
+    cmap          a single (3,1) format 4 subtable (+ (3,10) format 12 when
+                  a kept char is outside the BMP)
+    maxp          numGlyphs
+    post          format 3 (no glyph names)
+    head          indexToLocFormat, checkSumAdjustment
+
+name / OS/2 / gasp and the hinting programs (cvt / fpgm / prep, which do not
+name glyphs) are copied; everything else — layout (GSUB / GPOS / GDEF /
+kern), variations (a variable font becomes its default instance), bitmaps,
+colour, DSIG — is dropped. Only `glyf` outlines are handled: a CFF-flavoured
+OpenType font (`OTTO`) raises ValueError.
+
+`woff(sfnt)` wraps the result as WOFF 1.0 with per-table zlib. WOFF2 needs
+Brotli, which the stdlib does not have; every browser that reads WOFF2 also
+reads WOFF.
+"""
+
+import struct
+import zlib
+
+KEEP = frozenset((b"cmap", b"glyf", b"loca", b"head", b"hhea", b"hmtx", b"maxp",
+                  b"name", b"OS/2", b"post", b"cvt ", b"fpgm", b"prep", b"gasp"))
+
+# composite glyph flags
+ARGS_ARE_WORDS, HAVE_SCALE, MORE = 0x0001, 0x0008, 0x0020
+HAVE_XY_SCALE, HAVE_2X2 = 0x0040, 0x0080
+
+
+def tables(font):
+    """{tag: bytes} of an sfnt."""
+    if font[:4] == b"OTTO":
+        raise ValueError("CFF outlines (OTTO) are not subsettable here; use the TrueType build")
+    n = struct.unpack_from(">H", font, 4)[0]
+    out = {}
+    for i in range(n):
+        tag, _, off, length = struct.unpack_from(">4sIII", font, 12 + 16 * i)
+        out[tag] = font[off:off + length]
+    return out
+
+
+def cmap_of(data):
+    """{codepoint: glyph id} from the best Unicode subtable (format 12, else 4)."""
+    n = struct.unpack_from(">H", data, 2)[0]
+    subs = {}
+    for i in range(n):
+        pid, eid, off = struct.unpack_from(">HHI", data, 4 + 8 * i)
+        subs[pid, eid] = off
+    for key in ((3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0)):
+        off = subs.get(key)
+        if off is None:
+            continue
+        fmt = struct.unpack_from(">H", data, off)[0]
+        if fmt == 12:
+            groups = struct.unpack_from(">I", data, off + 12)[0]
+            m = {}
+            for g in range(groups):
+                start, end, gid = struct.unpack_from(">III", data, off + 16 + 12 * g)
+                for c in range(start, end + 1):
+                    m[c] = gid + c - start
+            return m
+        if fmt == 4:
+            return _format4(data, off)
+    raise ValueError("no Unicode cmap subtable")
+
+
+def _format4(data, off):
+    segx2 = struct.unpack_from(">H", data, off + 6)[0]
+    seg = segx2 // 2
+    ends = struct.unpack_from(f">{seg}H", data, off + 14)
+    starts = struct.unpack_from(f">{seg}H", data, off + 16 + segx2)
+    deltas = struct.unpack_from(f">{seg}h", data, off + 16 + 2 * segx2)
+    ro_at = off + 16 + 3 * segx2
+    ranges = struct.unpack_from(f">{seg}H", data, ro_at)
+    m = {}
+    for i in range(seg):
+        for c in range(starts[i], ends[i] + 1):
+            if c == 0xFFFF:
+                continue
+            if ranges[i] == 0:
+                gid = (c + deltas[i]) & 0xFFFF
+            else:
+                at = ro_at + 2 * i + ranges[i] + 2 * (c - starts[i])
+                gid = struct.unpack_from(">H", data, at)[0]
+                if gid:
+                    gid = (gid + deltas[i]) & 0xFFFF
+            if gid:
+                m[c] = gid
+    return m
+
+
+def _components(glyph):
+    """[(byte offset of the glyph index, glyph index)] of a composite glyph."""
+    out, at = [], 10
+    while True:
+        flags, gid = struct.unpack_from(">HH", glyph, at)
+        out.append((at + 2, gid))
+        at += 4 + (4 if flags & ARGS_ARE_WORDS else 2)
+        at += 8 if flags & HAVE_2X2 else 4 if flags & HAVE_XY_SCALE else 2 if flags & HAVE_SCALE else 0
+        if not flags & MORE:
+            return out
+
+
+def _checksum(data):
+    data += b"\0" * (-len(data) % 4)
+    return sum(struct.unpack(f">{len(data) // 4}I", data)) & 0xFFFFFFFF
+
+
+def subset(font, chars):
+    """The TrueType font {font} (bytes) cut down to {chars}; returns sfnt bytes."""
+    t = tables(font)
+    head, hhea, maxp = t[b"head"], t[b"hhea"], t[b"maxp"]
+    n_glyphs = struct.unpack_from(">H", maxp, 4)[0]
+    long_loca = struct.unpack_from(">h", head, 50)[0] == 1
+    loca = (struct.unpack_from(f">{n_glyphs + 1}I", t[b"loca"]) if long_loca else
+            [x * 2 for x in struct.unpack_from(f">{n_glyphs + 1}H", t[b"loca"])])
+    glyf = t[b"glyf"]
+    glyph = lambda g: glyf[loca[g]:loca[g + 1]]
+
+    cmap = cmap_of(t[b"cmap"])
+    keep_cmap = {c: cmap[c] for c in sorted(set(map(ord, chars))) if c in cmap}
+    keep, todo = {0}, list(keep_cmap.values())
+    while todo:                                     # composite closure
+        g = todo.pop()
+        if g in keep or g >= n_glyphs:
+            continue
+        keep.add(g)
+        data = glyph(g)
+        if len(data) >= 10 and struct.unpack_from(">h", data, 0)[0] < 0:
+            todo.extend(c for _, c in _components(data))
+    order = sorted(keep)
+    new_id = {g: i for i, g in enumerate(order)}
+
+    # glyf + loca
+    parts, offs, at = [], [], 0
+    for g in order:
+        data = bytearray(glyph(g))
+        if len(data) >= 10 and struct.unpack_from(">h", data, 0)[0] < 0:
+            for pos, c in _components(data):
+                struct.pack_into(">H", data, pos, new_id[c])
+        data += b"\0" * (-len(data) % 4)
+        offs.append(at)
+        parts.append(bytes(data))
+        at += len(data)
+    offs.append(at)
+
+    # hmtx
+    n_hm = struct.unpack_from(">H", hhea, 34)[0]
+    hmtx = t[b"hmtx"]
+    metrics = []
+    for g in order:
+        if g < n_hm:
+            metrics.append(struct.unpack_from(">Hh", hmtx, 4 * g))
+        else:
+            adv = struct.unpack_from(">H", hmtx, 4 * (n_hm - 1))[0]
+            metrics.append((adv, struct.unpack_from(">h", hmtx, 4 * n_hm + 2 * (g - n_hm))[0]))
+
+    out = {k: v for k, v in t.items() if k in KEEP}
+    out[b"glyf"] = b"".join(parts)
+    out[b"loca"] = struct.pack(f">{len(offs)}I", *offs)
+    out[b"hmtx"] = b"".join(struct.pack(">Hh", *m) for m in metrics)
+    out[b"hhea"] = hhea[:34] + struct.pack(">H", len(order)) + hhea[36:]
+    out[b"maxp"] = maxp[:4] + struct.pack(">H", len(order)) + maxp[6:]
+    out[b"head"] = head[:8] + b"\0\0\0\0" + head[12:50] + struct.pack(">h", 1) + head[52:]
+    if b"post" in t:
+        out[b"post"] = struct.pack(">I", 0x00030000) + t[b"post"][4:32]
+    out[b"cmap"] = _cmap({c: new_id[g] for c, g in keep_cmap.items()})
+    font = _sfnt(font[:4], out)
+    adjust = (0xB1B0AFBA - _checksum(font)) & 0xFFFFFFFF
+    head_off = _offsets(font)[b"head"]
+    return font[:head_off + 8] + struct.pack(">I", adjust) + font[head_off + 12:]
+
+
+def _offsets(font):
+    n = struct.unpack_from(">H", font, 4)[0]
+    return {tag: off for tag, _, off, _ in
+            (struct.unpack_from(">4sIII", font, 12 + 16 * i) for i in range(n))}
+
+
+def _cmap(m):
+    """cmap table: (3,1) format 4, plus (3,10) format 12 for chars past the BMP."""
+    bmp = sorted((c, g) for c, g in m.items() if c < 0xFFFF)
+    segs = []                                       # [start, end, delta]
+    for c, g in bmp:
+        if segs and c == segs[-1][1] + 1 and g - c == segs[-1][2]:
+            segs[-1][1] = c
+        else:
+            segs.append([c, c, g - c])
+    segs.append([0xFFFF, 0xFFFF, 1])
+    n = len(segs)
+    p = 1 << (n.bit_length() - 1)
+    body = (struct.pack(f">{n}H", *(s[1] for s in segs)) + b"\0\0"
+            + struct.pack(f">{n}H", *(s[0] for s in segs))
+            + struct.pack(f">{n}h", *(((s[2] + 0x8000) & 0xFFFF) - 0x8000 for s in segs))
+            + b"\0\0" * n)
+    f4 = struct.pack(">HHHHHHH", 4, 14 + len(body), 0, 2 * n, 2 * p,
+                     p.bit_length() - 1, 2 * n - 2 * p) + body
+    subs = [(3, 1, f4)]
+    if any(c > 0xFFFF for c in m):
+        groups = []
+        for c, g in sorted(m.items()):
+            if groups and c == groups[-1][1] + 1 and g == groups[-1][2] + c - groups[-1][0]:
+                groups[-1][1] = c
+            else:
+                groups.append([c, c, g])
+        f12 = struct.pack(">HHIII", 12, 0, 16 + 12 * len(groups), 0, len(groups)) + b"".join(
+            struct.pack(">III", *grp) for grp in groups)
+        subs.append((3, 10, f12))
+    out, off = [struct.pack(">HH", 0, len(subs))], 4 + 8 * len(subs)
+    for pid, eid, data in subs:
+        out.append(struct.pack(">HHI", pid, eid, off))
+        off += len(data)
+    return b"".join(out) + b"".join(d for _, _, d in subs)
+
+
+def _sfnt(version, tabs):
+    tags = sorted(tabs)
+    n = len(tags)
+    p = 1 << (n.bit_length() - 1)
+    head = struct.pack(">4sHHHH", version, n, 16 * p, p.bit_length() - 1, 16 * n - 16 * p)
+    recs, data, off = [], [], 12 + 16 * n
+    for tag in tags:
+        d = tabs[tag]
+        recs.append(struct.pack(">4sIII", tag, _checksum(d), off, len(d)))
+        d += b"\0" * (-len(d) % 4)
+        data.append(d)
+        off += len(d)
+    return head + b"".join(recs) + b"".join(data)
+
+
+def woff(font):
+    """WOFF 1.0 wrapping of the sfnt {font}, each table zlib-compressed."""
+    n = struct.unpack_from(">H", font, 4)[0]
+    recs, data = [], []
+    off = 44 + 20 * n
+    total = 12 + 16 * n
+    for i in range(n):
+        tag, check, t_off, length = struct.unpack_from(">4sIII", font, 12 + 16 * i)
+        raw = font[t_off:t_off + length]
+        comp = zlib.compress(raw, 9)
+        if len(comp) >= len(raw):
+            comp = raw
+        recs.append(struct.pack(">4sIIII", tag, off, len(comp), length, check))
+        comp += b"\0" * (-len(comp) % 4)
+        data.append(comp)
+        off += len(comp)
+        total += length + (-length % 4)
+    header = struct.pack(">4s4sIHHIHHIIIII", b"wOFF", font[:4], off, n, 0, total,
+                         1, 0, 0, 0, 0, 0, 0)
+    return header + b"".join(recs) + b"".join(data)
@@ -0,0 +1,183 @@
+"""
+Append-only progress history: one compact snapshot per `generated` stamp,
+so viz.py can draw burn-down, velocity and per-phase throughput.
+
+A regen used to parse `status_counts`, per-phase done/total, `complete`,
+`verification_debt` and `drift_deferrals`, render them once and forget
+them. `record(src, m)` appends the parsed model's numbers to a stdlib
+sqlite3 store and returns the `Trend` to chart. The store is data, not a
+cache: it lives at DB (`history.db` beside the emitters, git-ignored) or
+wherever `--history PATH` points, never in a `.dashcache/` that gets
+cleared, and snapshots are recorded with or without `--no-cache`. Sources
+are keyed by resolved path, so one store serves every project:
+
+    snap(id, source, generated, t, complete, done, total, debt, drift, counts)
+        UNIQUE(source, generated); INDEX (source, t)
+    phase(snap, name, done, total)          WITHOUT ROWID, keyed (snap, name)
+
+`generated` keys the snapshot, so regens of an unchanged dashboard add
+nothing; `t` is that stamp as epoch seconds (the file mtime when there is
+no parseable stamp). Rows are never updated or deleted.
+
+`series()` reads through the (source, t) index only inside the last DAYS of
+history and buckets that range into at most POINTS points (the latest
+snapshot of each bucket, in SQL), so chart cost and the page's SVG stay the
+same size whether the store holds ten snapshots or ten thousand.
+
+Usage: python3 history.py DASHBOARD.md [--history PATH]   (records a snapshot, prints the trend)
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from typing import NamedTuple
+
+import ir
+
+VERSION = 1
+DB = pathlib.Path(__file__).parent / "history.db"
+POINTS = 40         # chart points per series
+DAYS = 120          # history window charted
+PHASES = 4          # active phases given a throughput sparkline
+PHASE_N = re.compile(r"\d+")
+
+SCHEMA = """
+CREATE TABLE snap(id INTEGER PRIMARY KEY, source TEXT NOT NULL, generated TEXT NOT NULL,
+                  t REAL NOT NULL, complete INTEGER, done INTEGER, total INTEGER,
+                  debt INTEGER, drift INTEGER, counts TEXT, UNIQUE(source, generated));
+CREATE INDEX snap_t ON snap(source, t);
+CREATE TABLE phase(snap INTEGER NOT NULL, name TEXT NOT NULL, done INTEGER, total INTEGER,
+                   PRIMARY KEY(snap, name)) WITHOUT ROWID;
+"""
+
+
+class Trend(NamedTuple):
+    """Bucketed history of one dashboard, oldest point first."""
+    t: tuple            # epoch seconds of each point
+    done: tuple         # tasks done (phase done summed)
+    total: tuple
+    complete: tuple     # % complete
+    debt: tuple         # verification debt
+    drift: tuple        # drift deferrals
+    phases: tuple       # ((phase name, total, done per point), ...) for active phases
+    snapshots: int      # snapshots inside the window, before bucketing
+
+
+def connect(path):
+    con = sqlite3.connect(str(path))
+    if con.execute("PRAGMA user_version").fetchone()[0] != VERSION:
+        con.executescript("DROP TABLE IF EXISTS phase; DROP TABLE IF EXISTS snap;")
+        con.executescript(SCHEMA)
+        con.execute(f"PRAGMA user_version = {VERSION}")
+        con.commit()
+    return con
+
+
+def _int(s):
+    try:
+        return int(s or 0)
+    except ValueError:
+        return 0
+
+
+def _epoch(stamp):
+    try:
+        return datetime.fromisoformat(stamp.strip()).timestamp()
+    except (ValueError, AttributeError):
+        return None
+
+
+def _phase_order(name):
+    """Sort key: phases by number ("Phase 2" before "Phase 10"), then name."""
+    m = PHASE_N.search(name)
+    return (int(m.group()) if m else float("inf"), name)
+
+
+def append(con, source, m, fallback_t):
+    """Record {m} as a snapshot of {source}; False when its `generated`
+    stamp is already stored."""
+    meta = m.meta
+    gen = meta.get("generated", "")
+    t = _epoch(gen) or fallback_t
+    with con:
+        cur = con.execute(
+            "INSERT OR IGNORE INTO snap(source, generated, t, complete, done, total, debt, drift, counts)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (source, gen or repr(t), t, m.complete, sum(p.done for p in m.phases),
+             sum(p.total for p in m.phases), _int(meta.get("verification_debt")),
+             _int(meta.get("drift_deferrals")),
+             json.dumps(m.status_counts, ensure_ascii=False, separators=(",", ":"))))
+        if not cur.rowcount:
+            return False
+        con.executemany("INSERT OR IGNORE INTO phase VALUES (?, ?, ?, ?)",
+                        [(cur.lastrowid, p.name, p.done, p.total) for p in m.phases])
+    return True
+
+
+def series(con, source, points=POINTS, days=DAYS):
+    """The `Trend` of {source} over its last {days} of history, in at most
+    {points} points; None when nothing is recorded. The first PHASES active
+    phases, by phase number, get a throughput series."""
+    hi = con.execute("SELECT max(t) FROM snap WHERE source = ?", (source,)).fetchone()[0]
+    if hi is None:
+        return None
+    floor = hi - days * 86400
+    lo, n = con.execute("SELECT min(t), count(*) FROM snap WHERE source = ? AND t >= ?",
+                        (source, floor)).fetchone()
+    width = (hi - lo) / points or 1.0
+    rows = con.execute(
+        "SELECT id, max(t), done, total, complete, debt, drift FROM snap"
+        " WHERE source = ? AND t >= ? GROUP BY min(CAST((t - ?) / ? AS INTEGER), ?) ORDER BY 2",
+        (source, floor, lo, width, points - 1)).fetchall()
+    ids = [r[0] for r in rows]
+    active = sorted(con.execute("SELECT name, total FROM phase WHERE snap = ? AND done < total",
+                                (ids[-1],)).fetchall(), key=lambda r: _phase_order(r[0]))[:PHASES]
+    done = {}
+    if active:
+        marks = ",".join("?" * len(ids))
+        names = ",".join("?" * len(active))
+        for sid, name, d in con.execute(
+                f"SELECT snap, name, done FROM phase WHERE snap IN ({marks}) AND name IN ({names})",
+                (*ids, *(a for a, _ in active))):
+            done[sid, name] = d
+    phases = tuple((name, total, tuple(done.get((sid, name), 0) for sid in ids))
+                   for name, total in active)
+    cols = list(zip(*rows))
+    return Trend(*(tuple(c) for c in cols[1:]), phases, n)
+
+
+def record(src, m, db=None):
+    """Append {m} (parsed from {src}) to the history store {db} (default DB)
+    and return the `Trend` of {src}."""
+    src = pathlib.Path(src)
+    key = str(src.resolve())
+    con = connect(db or DB)
+    try:
+        append(con, key, m, os.stat(src).st_mtime)
+        return series(con, key)
+    finally:
+        con.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Record a dashboard snapshot and print its trend.")
+    ap.add_argument("src", type=pathlib.Path)
+    ap.add_argument("--history", type=pathlib.Path, default=DB, metavar="PATH",
+                    help="snapshot store (default: %(default)s)")
+    args = ap.parse_args(argv)
+    tr = record(args.src, ir.load(args.src), args.history)
+    print(f"{tr.snapshots} snapshots in the last {DAYS} days, {len(tr.t)} points: "
+          f"done {tr.done[0]} → {tr.done[-1]} of {tr.total[-1]}, "
+          f"complete {tr.complete[0]}% → {tr.complete[-1]}%")
+    for name, total, done in tr.phases:
+        print(f"  {name}: {done[0]} → {done[-1]} / {total}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Compact, versioned intermediate form of a parsed dashboard.
+
+`model.parse_dashboard()` gives every emitter the same records, but each
+target (build.py, viz.py, portfolio.py workers) still paid the full
+Markdown scan in its own process. `load()` parses once
+and stores the `Dashboard` as JSON in this tool's cache, keyed by the source
+path — `.dashcache/src/<path hash>/<name>.ir.json` (rcache.source_dir), never
+beside the source — so every later target costs one `json.loads` plus tuple
+construction:
+
+    {"v": VERSION, "salt": parser source hash, "stat": [mtime_ns, size],
+     "digest": source hash, "strs": [interned strings], "model": {field: value}}
+
+Records are positional lists in NamedTuple field order, and the columns
+that repeat on every row (task status / difficulty / owner, phase and
+decision status) are indices into `strs`.
+
+A cached IR is used when the source's (mtime, size) match, or — when the
+file was touched — when its bytes hash the same (a blake2b over the file is
+a few ms where the parse is tens to hundreds). The META `task_hash` /
+`spec_fingerprint` are part of those bytes, so a regenerated dashboard
+always re-parses; so does a hand edit that leaves META alone, which matters
+in watch mode (serve.py). An edit to the parser (model.py, mdscan.py, this
+file) changes "salt" and so invalidates every IR, and a truncated or
+hand-edited IR that does not restore is treated as stale and re-parsed.
+
+Usage: python3 ir.py DASHBOARD.md [--no-cache]  (prints what a load cost)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import time
+from functools import lru_cache
+
+from model import Criterion, Dashboard, Decision, Phase, Recent, Task, TaskGroup, parse_dashboard
+from rcache import source_dir, source_salt
+
+VERSION = 1
+HERE = pathlib.Path(__file__).parent
+
+
+@lru_cache(maxsize=None)
+def parser_salt():
+    """Hash of the parser sources; an IR written by another parser is stale."""
+    return source_salt(HERE / "model.py", HERE / "mdscan.py", HERE / "ir.py")
+
+
+def dump(m):
+    """A `Dashboard` as the JSON-ready IR model + string table."""
+    strs, index = [], {}
+
+    def s(x):
+        i = index.get(x)
+        if i is None:
+            i = index[x] = len(strs)
+            strs.append(x)
+        return i
+
+    model = {k: getattr(m, k) for k in Dashboard.__slots__}
+    model["phases"] = [(p.name, p.n, p.done, p.total, s(p.status)) for p in m.phases]
+    model["task_groups"] = [(g.name, g.finished, g.extra,
+                             [(t.id, t.title, s(t.status), s(t.diff), s(t.owner), t.deps)
+                              for t in g.tasks]) for g in m.task_groups]
+    model["decisions"] = [(d.id, d.title, s(d.status), d.sel, d.link) for d in m.decisions]
+    model["status_counts"] = [(s(k), v) for k, v in m.status_counts]
+    return model, strs
+
+
+def restore(model, strs):
+    """`dump()` inverted: the same `Dashboard`, field for field."""
+    m = dict(model)
+    m["phases"] = tuple(Phase(a, b, c, d, strs[e]) for a, b, c, d, e in model["phases"])
+    m["task_groups"] = tuple(
+        TaskGroup(name, fin, extra, tuple(Task(i, ti, strs[st], strs[df], strs[ow], dp)
+                                          for i, ti, st, df, ow, dp in tasks))
+        for name, fin, extra, tasks in model["task_groups"])
+    m["decisions"] = tuple(Decision(a, b, strs[c], d, e) for a, b, c, d, e in model["decisions"])
+    m["status_counts"] = tuple((strs[k], v) for k, v in model["status_counts"])
+    m["criteria"] = tuple(Criterion(*c) for c in model["criteria"])
+    m["recent"] = tuple(Recent(*r) for r in model["recent"])
+    for k in ("your_tasks", "timeline"):
+        m[k] = tuple(map(tuple, model[k]))
+    for k in ("action", "notes"):
+        m[k] = tuple(model[k])
+    return Dashboard(**m)
+
+
+def ir_path(src, where=None):
+    src = pathlib.Path(src)
+    return (pathlib.Path(where) if where else source_dir(src)) / (src.stem + ".ir.json")
+
+
+def load(src, cache=True, stats=None, where=None):
+    """The `Dashboard` for the Markdown file {src}, through its IR cache in
+    {where} (default: `rcache.source_dir(src)`). {stats}, when a dict, gets
+    "ir": "stat" / "digest" / "parsed"."""
+    src = pathlib.Path(src)
+    if not cache:
+        return _note(stats, "parsed", parse_dashboard(src))
+    path = ir_path(src, where)
+    st = os.stat(src)
+    stat = [st.st_mtime_ns, st.st_size]
+    salt = parser_salt()
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        data = None
+    if not isinstance(data, dict) or data.get("v") != VERSION or data.get("salt") != salt:
+        data = None
+    if data is not None and data.get("stat") == stat:
+        m = _restore(data)
+        if m is not None:
+            return _note(stats, "stat", m)
+    raw = src.read_bytes()
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if data is not None and data.get("digest") == digest:
+        m = _restore(data)
+        if m is not None:
+            data["stat"] = stat
+            _save(path, data)
+            return _note(stats, "digest", m)
+    m = parse_dashboard(src)
+    model, strs = dump(m)
+    _save(path, {"v": VERSION, "salt": salt, "stat": stat, "digest": digest,
+                 "strs": strs, "model": model})
+    return _note(stats, "parsed", m)
+
+
+def _restore(data):
+    """`restore()` of a cached record; None when it is malformed (stale)."""
+    try:
+        return restore(data["model"], data["strs"])
+    except (KeyError, TypeError, IndexError, AttributeError, ValueError):
+        return None
+
+
+def _note(stats, how, m):
+    if stats is not None:
+        stats["ir"] = how
+    return m
+
+
+def _save(path, data):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+                   encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parse a dashboard.md once into its cached IR.")
+    ap.add_argument("src", type=pathlib.Path)
+    ap.add_argument("--no-cache", action="store_true", help="parse, don't read or write the IR")
+    args = ap.parse_args(argv)
+    st = {}
+    t0 = time.perf_counter()
+    m = load(args.src, not args.no_cache, st)
+    ms = (time.perf_counter() - t0) * 1000
+    where = "" if args.no_cache else f" ({ir_path(args.src)})"
+    print(f"{args.src}: {st['ir']} in {ms:.1f} ms{where} · {len(m.phases)} phases, "
+          f"{sum(len(g.tasks) for g in m.task_groups)} active tasks, {len(m.decisions)} decisions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
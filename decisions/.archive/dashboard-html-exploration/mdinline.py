@@ -0,0 +1,83 @@
+"""
+Single-pass inline Markdown for the emitters' one-line fields.
+
+build.py's `md_inline` and viz.py's `mdi` used to html-escape and then run
+four `re.sub` passes (links, bold, code, italic) over every task title,
+decision selection, criterion, recent item and Action Required line — the
+biggest CPU cost of an emit, paid again for strings that repeat run after
+run. `Inline` makes one left-to-right scan with a single precompiled
+alternation and recurses only into the (short) inside of a construct;
+`renderer()` wraps it in a bounded LRU cache keyed on the input string.
+
+The output is the same HTML as the sequential passes: each construct's
+inside is rendered with every construct (as the later passes reached it),
+and the italic `(?<![*\\w])` / `(?![*\\w])` boundaries see an adjacent
+construct as the tag it turns into. The one difference is delimiters that
+*cross* (`**a [b** c](d)`): the passes emit mis-nested tags there, the
+scan gives the leftmost construct precedence and keeps the HTML well formed.
+"""
+
+import html
+import re
+from functools import lru_cache
+
+CACHE = 4096        # distinct strings kept per renderer
+TOKEN = re.compile(r"\[(?P<text>[^\]]+)\]\((?P<href>[^)]+)\)"
+                   r"|\*\*(?P<strong>[^*]+)\*\*"
+                   r"|`(?P<code>[^`]+)`"
+                   r"|\*(?P<em>(?:[^*]|\*\*[^*]+\*\*)+)\*")     # bold runs first: may nest
+STRONG = re.compile(r"\*\*[^*]+\*\*")
+STAR_OR_WORD = re.compile(r"[*\w]")
+
+
+class Inline:
+    """Inline renderer: {link} is a format string over {text} / {href}
+    (both already HTML); {em} enables `*italic*`."""
+
+    __slots__ = ("link", "em")
+
+    def __init__(self, link, em=True):
+        self.link = link
+        self.em = em
+
+    def __call__(self, s):
+        return self.scan(html.escape(s))
+
+    def scan(self, s):
+        """Render escaped text {s} in one pass."""
+        out, done, pos, edge = [], 0, 0, 0   # edge: end of the last construct
+        search = TOKEN.search
+        while True:
+            m = search(s, pos)
+            if m is None:
+                break
+            a, b = m.span()
+            kind = m.lastgroup
+            if kind == "em" and not (self.em and self._em_edges(s, a, b, edge)):
+                pos = a + 1
+                continue
+            out.append(s[done:a])
+            g = m.group(kind)
+            if kind == "href":
+                out.append(self.link.format(text=self.scan(m.group("text")), href=self.scan(g)))
+            else:
+                out.append(f"<{kind}>{self.scan(g)}</{kind}>")
+            done = pos = edge = b
+        if not out:
+            return s
+        out.append(s[done:])
+        return "".join(out)
+
+    @staticmethod
+    def _em_edges(s, a, b, edge):
+        """`*x*` at s[a:b] is italic unless a `*` / word character touches it —
+        text next to a construct reads as its tag, i.e. as a boundary."""
+        if a and a != edge and STAR_OR_WORD.match(s, a - 1):
+            return False
+        return (b == len(s) or not STAR_OR_WORD.match(s, b)
+                or STRONG.match(s, b) is not None)
+
+
+def renderer(link, em=True, maxsize=CACHE):
+    """An LRU-cached `Inline(link, em)`: str -> HTML."""
+    return lru_cache(maxsize=maxsize)(Inline(link, em))
@@ -0,0 +1,339 @@
+"""
+Stdlib Markdown -> HTML for the spec subset the dashboards embed.
+
+viz.py used to ship every spec section as raw Markdown in a
+`<script type="text/markdown">` and pull marked.js from a CDN to parse it in
+the browser on first open — a network fetch plus a client-side parse per
+section, and nothing at all offline. `render()` does that work once, at emit
+time, for the constructs the specs actually use:
+
+  blocks   ATX headings, paragraphs, `---` rules, fenced (``` / ~~~) and
+           indented code, `>` blockquotes (nested), `-`/`*`/`+` and `1.`/`1)`
+           lists with nesting, loose/tight items and `[ ]`/`[x]` task boxes,
+           GFM pipe tables with alignment, `<!-- -->` comments (dropped)
+  inline   code spans, backslash escapes, `**`/`__` strong, `*`/`_` emphasis,
+           `~~` strike, links / images (`[t](url "title")`), `<url>`
+           autolinks, bare http(s) URLs, hard breaks (two spaces / `\\`)
+
+Raw HTML is escaped, not passed through: the source is an authored spec and
+the output lands inside someone's dashboard. Entity references (`&mdash;`)
+survive. Caching is the caller's business — viz.py keys each section's
+output by content hash through rcache.
+"""
+
+import html
+import re
+
+HEADING = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+FENCE = re.compile(r"^( {0,3})(`{3,}|~{3,})[ \t]*([^`\s]*)[^`]*$")
+HR = re.compile(r"^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$")
+QUOTE = re.compile(r"^ {0,3}> ?")
+ITEM = re.compile(r"^( {0,3})([-*+]|\d{1,9}[.)])(?:([ \t]+)(.*)|$)")
+TABLE_SEP = re.compile(r"^ {0,3}\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$")
+TASK = re.compile(r"^\[([ xX])\][ \t]+")
+
+CODE_SPAN = re.compile(r"(?<!`)(`+)(?!`)(.+?)(?<!`)\1(?!`)", re.S)
+ESCAPED = re.compile(r"\\([!\"#$%&'()*+,\-./:;<=>?@\[\\\]^_`{|}~])")
+HARD_BREAK = re.compile(r"(?: {2,}|\\)\n")
+AUTOLINK = re.compile(r"<((?:https?|mailto|ftp):[^\s<>]+)>")
+LINK = re.compile(r"(!?)\[((?:[^\[\]]|\[[^\[\]]*\])*)\]"
+                  r"\(\s*<?([^\s()<>]*(?:\([^\s()]*\)[^\s()<>]*)*)>?(?:\s+\"([^\"]*)\")?\s*\)")
+BARE_URL = re.compile(r"(?<![\w/=\"'])(https?://[^\s<]*[^\s<.,:;!?'\")\]*_~])")
+STRONG = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+EM = re.compile(r"(?<![*\w\\])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![*\w])"
+                r"|(?<![_\w])_(?=[^\s_])(.+?)(?<=[^\s_])_(?![_\w])")
+STRIKE = re.compile(r"~~(?=\S)(.+?)(?<=\S)~~")
+SLOT = re.compile("\x00(\\d+)\x00")
+LOOSE_AMP = re.compile(r"&(?!#?\w+;)")
+
+
+def esc(s):
+    """Escape text for HTML, leaving existing entity references alone."""
+    return LOOSE_AMP.sub("&amp;", s).replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _url(u):
+    u = u.strip()
+    if re.match(r"(?i)\s*(javascript|vbscript|data):", u) and not u.lower().startswith("data:image/"):
+        return "#"
+    return html.escape(u, quote=True)
+
+
+# ---- inline -------------------------------------------------------------------
+
+def inline(text):
+    """Render one paragraph's worth of inline Markdown."""
+    slots = []
+    out = _inline(text.replace("\x00", "\ufffd"), slots)     # NUL delimits the slot markers
+    while "\x00" in out:
+        out = SLOT.sub(lambda m: slots[int(m.group(1))], out)
+    return out
+
+
+def _inline(text, slots):
+    def keep(h):
+        slots.append(h)
+        return f"\x00{len(slots) - 1}\x00"
+
+    text = CODE_SPAN.sub(lambda m: keep(f"<code>{esc(_code_text(m.group(2)))}</code>"), text)
+    text = HARD_BREAK.sub(lambda m: keep("<br>") + "\n", text)
+    text = ESCAPED.sub(lambda m: keep(esc(m.group(1))), text)
+    text = AUTOLINK.sub(lambda m: keep(f'<a href="{_url(m.group(1))}">{esc(m.group(1))}</a>'), text)
+
+    def link(m):
+        bang, label, url, title = m.groups()
+        t = f' title="{html.escape(title)}"' if title else ""
+        if bang:
+            return keep(f'<img src="{_url(url)}" alt="{html.escape(label)}"{t}>')
+        return keep(f'<a href="{_url(url)}"{t}>{_inline(label, slots)}</a>')
+
+    text = LINK.sub(link, text)
+    text = BARE_URL.sub(lambda m: keep(f'<a href="{_url(m.group(1))}">{esc(m.group(1))}</a>'), text)
+    text = esc(text)
+    text = STRONG.sub(r"<strong>\2</strong>", text)
+    text = EM.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", text)
+    return STRIKE.sub(r"<del>\1</del>", text)
+
+
+def _code_text(s):
+    s = s.replace("\n", " ")
+    if len(s) > 2 and s[0] == s[-1] == " " and s.strip():
+        s = s[1:-1]
+    return s
+
+
+# ---- blocks -------------------------------------------------------------------
+
+def render(md):
+    """Render a Markdown document (or section) to an HTML string."""
+    lines = md.replace("\r\n", "\n").replace("\r", "\n").expandtabs(4).split("\n")
+    return "\n".join(_blocks(lines)) + "\n"
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(" "))
+
+
+def _item(line):
+    """ITEM match usable as a list item (not an hr like `- - -`), else None."""
+    if HR.match(line):
+        return None
+    return ITEM.match(line)
+
+
+def _interrupts(line, in_para=True):
+    """Does {line} start a new block (ending a paragraph / lazy continuation)?"""
+    if HEADING.match(line) or FENCE.match(line) or QUOTE.match(line) or HR.match(line):
+        return True
+    m = _item(line)
+    if not m:
+        return False
+    if in_para:      # CommonMark: empty items and ordered lists not starting at 1 can't interrupt
+        if not (m.group(4) or "").strip():
+            return False
+        if m.group(2)[0].isdigit() and int(m.group(2)[:-1]) != 1:
+            return False
+    return True
+
+
+def _cells(line):
+    s = line.strip()
+    if s.startswith("|"):
+        s = s[1:]
+    if s.endswith("|") and not s.endswith("\\|"):
+        s = s[:-1]
+    cells, cur, tick = [], [], 0
+    i = 0
+    while i < len(s):
+        ch = s[i]
+        if ch == "\\" and i + 1 < len(s) and s[i + 1] == "|":
+            cur.append("|")
+            i += 2
+            continue
+        if ch == "`":
+            tick ^= 1
+        if ch == "|" and not tick:
+            cells.append("".join(cur).strip())
+            cur = []
+        else:
+            cur.append(ch)
+        i += 1
+    cells.append("".join(cur).strip())
+    return cells
+
+
+def _table(lines, i):
+    head = _cells(lines[i])
+    aligns = []
+    for c in _cells(lines[i + 1]):
+        left, right = c.startswith(":"), c.endswith(":")
+        aligns.append("center" if left and right else "right" if right else "left" if left else "")
+    if len(aligns) != len(head):
+        return None, i
+    n = len(head)
+
+    def row(cells, tag):
+        cells = (cells + [""] * n)[:n]
+        return "<tr>" + "".join(
+            f'<{tag}{f" align={chr(34)}{a}{chr(34)}" if a else ""}>{inline(c)}</{tag}>'
+            for c, a in zip(cells, aligns)) + "</tr>"
+
+    out = ["<table>", "<thead>", row(head, "th"), "</thead>"]
+    j, body = i + 2, []
+    while j < len(lines) and lines[j].strip() and not _interrupts(lines[j], False):
+        body.append(row(_cells(lines[j]), "td"))
+        j += 1
+    if body:
+        out += ["<tbody>"] + body + ["</tbody>"]
+    out.append("</table>")
+    return "\n".join(out), j
+
+
+def _list(lines, i):
+    first = _item(lines[i])
+    marker = first.group(2)
+    ordered = marker[0].isdigit()
+    kind = marker[-1]                       # bullet char, or "." / ")"
+    items, loose = [], False
+    n = len(lines)
+    while i < n:
+        m = _item(lines[i])
+        if not m or m.group(2)[0].isdigit() != ordered or m.group(2)[-1] != kind:
+            break
+        pad = m.group(3) or " "
+        if len(pad) > 4 or not (m.group(4) or "").strip():
+            pad = " "                        # over-indented text is content, not padding
+        col = len(m.group(1)) + len(m.group(2)) + len(pad)
+        body = [(m.group(3) or "")[len(pad):] + (m.group(4) or "")]
+        i += 1
+        head = i                              # first line after the item marker
+        while i < n:
+            line = lines[i]
+            if not line.strip():
+                body.append("")
+                i += 1
+                continue
+            if _indent(line) >= col:
+                body.append(line[col:])
+                i += 1
+                continue
+            if body[-1] == "" or _interrupts(line, False) or _item(line):
+                break
+            body.append(line.strip())        # lazy paragraph continuation
+            i += 1
+        trailing = 0
+        while body and body[-1] == "":
+            body.pop()
+            trailing += 1
+        if "" in body[1:]:
+            loose = True                      # blank line between an item's blocks
+        if trailing and i < n and _item(lines[i]):
+            nxt = _item(lines[i])
+            if nxt.group(2)[0].isdigit() == ordered and nxt.group(2)[-1] == kind:
+                loose = True                  # blank line between items
+        items.append(body)
+        if trailing and (i >= n or not _item(lines[i])):
+            i = max(i - trailing, head)       # leave the blanks to the caller, never the marker
+            break
+    start = int(marker[:-1]) if ordered else 1
+    tag = "ol" if ordered else "ul"
+    out = [f'<{tag}{f" start={chr(34)}{start}{chr(34)}" if ordered and start != 1 else ""}>']
+    for body in items:
+        box = ""
+        t = TASK.match(body[0]) if body else None
+        if t:
+            box = f'<input type="checkbox" disabled{" checked" if t.group(1) != " " else ""}> '
+            body = [body[0][t.end():]] + body[1:]
+        inner = "\n".join(_blocks(body, tight=not loose))
+        out.append(f"<li>{box}{inner}</li>")
+    out.append(f"</{tag}>")
+    return "\n".join(out), i
+
+
+def _blocks(lines, tight=False):
+    out = []
+    i, n = 0, len(lines)
+    while i < n:
+        line = lines[i]
+        s = line.strip()
+        if not s:
+            i += 1
+            continue
+
+        if _indent(line) >= 4:                               # indented code
+            buf = []
+            while i < n and (_indent(lines[i]) >= 4 or not lines[i].strip()):
+                buf.append(lines[i][4:])
+                i += 1
+            while buf and not buf[-1].strip():
+                buf.pop()
+            out.append(f"<pre><code>{esc(chr(10).join(buf))}\n</code></pre>")
+            continue
+
+        m = FENCE.match(line)
+        if m:
+            ind, fence, lang = len(m.group(1)), m.group(2), m.group(3)
+            close = re.compile(r"^ {0,3}" + re.escape(fence[0]) + "{" + str(len(fence)) + r",}[ \t]*$")
+            buf, i = [], i + 1
+            while i < n and not close.match(lines[i]):
+                buf.append(lines[i][min(ind, _indent(lines[i])):])
+                i += 1
+            i += 1
+            cls = f' class="language-{html.escape(lang)}"' if lang else ""
+            body = esc("\n".join(buf)) + ("\n" if buf else "")
+            out.append(f"<pre><code{cls}>{body}</code></pre>")
+            continue
+
+        if s.startswith("<!--"):                              # comment: drop
+            while i < n and "-->" not in lines[i]:
+                i += 1
+            i += 1
+            continue
+
+        m = HEADING.match(line)
+        if m:
+            lvl = len(m.group(1))
+            out.append(f"<h{lvl}>{inline(m.group(2) or '')}</h{lvl}>")
+            i += 1
+            continue
+
+        if HR.match(line):
+            out.append("<hr>")
+            i += 1
+            continue
+
+        if QUOTE.match(line):
+            buf = []
+            while i < n and lines[i].strip():
+                if QUOTE.match(lines[i]):
+                    buf.append(QUOTE.sub("", lines[i], count=1))
+                elif _interrupts(lines[i]):
+                    break
+                else:
+                    buf.append(lines[i])                     # lazy continuation
+                i += 1
+            out.append("<blockquote>\n" + "\n".join(_blocks(buf)) + "\n</blockquote>")
+            continue
+
+        if "|" in line and i + 1 < n and TABLE_SEP.match(lines[i + 1]) and "-" in lines[i + 1]:
+            table, j = _table(lines, i)
+            if table is not None:
+                out.append(table)
+                i = j
+                continue
+
+        if _item(line):
+            block, i = _list(lines, i)
+            out.append(block)
+            continue
+
+        para = [line.lstrip()]                               # paragraph
+        i += 1
+        while i < n and lines[i].strip() and not _interrupts(lines[i]):
+            if "|" in lines[i] and i + 1 < n and TABLE_SEP.match(lines[i + 1]):
+                break
+            para.append(lines[i].lstrip())
+            i += 1
+        text = inline("\n".join(para).rstrip())
+        out.append(text if tight else f"<p>{text}</p>")
+    return out
@@ -0,0 +1,284 @@
+"""
+Single-pass, line-oriented scanner for template dashboard Markdown.
+
+build.py and viz.py used to re-split the whole file on `## ` headings every
+time they wanted a section, and ran a separate `re.search`/`re.findall` over
+all of RAW for the META block, the title line, the completion figure, the
+acceptance criteria, recent activity, ... — about a dozen whole-file passes
+per render. `scan()` reads the source ONCE, line by line, through a small
+state machine and hands back every section, `### ` sub-block, table, list
+item, fenced block, `<!-- MARKER -->` region and META field.
+
+The source may be a str, a path, an open text file, or any iterable of lines,
+so large dashboards can be streamed straight from disk without holding the
+raw text and the parsed lines in memory at the same time. Stdlib only.
+"""
+
+import os
+import re
+
+TITLE_RX = re.compile(r"^\*\*(.+?)\*\*\s*·\s*(.*)$")
+COMPLETE_RX = re.compile(r"\*\*(\d+)% complete\*\*")
+META_FIELD_RX = re.compile(r"^([a-z_]+):\s*(.*)$")
+MARKER_RX = re.compile(r"^<!-- ([A-Z][A-Z ]*[A-Z]) -->$")
+
+
+class Block:
+    """One `## ` section (or one `### ` sub-block inside it).
+
+    `lines` are the raw body lines (heading excluded, no trailing newline).
+    Tables are lists of cell-lists with the header and separator rows already
+    dropped; `items` are the texts of top-level `- ` list items. A section's
+    tables/items include those of its sub-blocks, so callers that used to
+    regex the whole section body see the same rows.
+    """
+
+    __slots__ = ("heading", "lines", "tables", "items", "subs", "fences",
+                 "markers")
+
+    def __init__(self, heading=""):
+        self.heading = heading
+        self.lines = []
+        self.tables = []
+        self.items = []
+        self.subs = []
+        self.fences = []
+        self.markers = {}
+
+    @property
+    def title(self):
+        """Heading text without the leading `#`s."""
+        return self.heading.lstrip("#").strip()
+
+    @property
+    def text(self):
+        return "\n".join(self.lines)
+
+    @property
+    def rows(self):
+        """Every data row of every table in the block, in source order."""
+        return [r for t in self.tables for r in t]
+
+    def sub(self, name):
+        """First `### ` sub-block whose heading contains {name}."""
+        name = name.lower()
+        for s in self.subs:
+            if name in s.heading.lower():
+                return s
+        return EMPTY
+
+    def marked(self, name):
+        """Lines between `<!-- {name} -->` and `<!-- END {name} -->`, or None."""
+        span = self.markers.get(name)
+        if span is None:
+            return None
+        return self.lines[span[0]:span[1]]
+
+    def __bool__(self):
+        return bool(self.heading or self.lines)
+
+
+EMPTY = Block()
+
+
+class Doc:
+    """Everything one pass over a dashboard yields."""
+
+    __slots__ = ("meta", "title", "complete", "preamble", "sections", "fences")
+
+    def __init__(self):
+        self.meta = {}
+        self.title = None           # (project, phase label, started) or None
+        self.complete = None        # "99" from **99% complete**
+        self.preamble = Block()     # everything before the first `## `
+        self.sections = []
+        self.fences = []            # (lang, text) for every ``` block
+
+    def section(self, name):
+        """The `## ` section whose heading contains {name} (case-insensitive).
+
+        Matches the old `re.split(r"^(## .*)$")` lookup: first hit wins, a
+        level-3 'Your Tasks' can never be mistaken for `## Tasks`.
+        """
+        name = name.lower()
+        for s in self.sections:
+            if name in s.heading.lower():
+                return s
+        return EMPTY
+
+    def fence(self, lang):
+        """Body of the first ```{lang} block anywhere in the file, or ''."""
+        for lg, body in self.fences:
+            if lg == lang:
+                return body
+        return ""
+
+
+def _lines(src):
+    """Yield newline-stripped lines from a str, path, file, or iterable."""
+    if isinstance(src, os.PathLike):
+        with open(src, encoding="utf-8") as f:
+            yield from (ln.rstrip("\r\n") for ln in f)
+        return
+    if isinstance(src, str):
+        # walk the string in place rather than splitlines(): no second copy
+        i, n = 0, len(src)
+        while i < n:
+            j = src.find("\n", i)
+            if j < 0:
+                j = n
+            yield src[i:j].rstrip("\r")
+            i = j + 1
+        return
+    for ln in src:
+        yield ln.rstrip("\r\n")
+
+
+def _cells(line):
+    return [c.strip() for c in line.strip("|").split("|")]
+
+
+def _is_sep(cells):
+    return set("".join(cells)) <= set("-: ")
+
+
+def scan(src):
+    """Parse a dashboard in one pass and return a `Doc`."""
+    doc = Doc()
+    sec = doc.preamble
+    sub = None
+    table = None        # rows of the table being read, header still included
+    fence = None        # [lang, lines] while inside ```
+    meta = None         # True while inside <!-- DASHBOARD META
+    seen_meta = False
+    open_marks = {}     # marker name -> (block, start index) pairs
+
+    def close_table():
+        nonlocal table
+        if table is None:
+            return
+        rows = table
+        if len(rows) > 1 and _is_sep(rows[1]):
+            rows = rows[2:]
+        rows = [r for r in rows if not _is_sep(r)]
+        sec.tables.append(rows)
+        if sub is not None:
+            sub.tables.append(rows)
+        table = None
+
+    for line in _lines(src):
+        # ---- inside a fenced block: collect verbatim, nothing else applies
+        if fence is not None:
+            if line.lstrip().startswith("```"):
+                body = "\n".join(fence[1])
+                doc.fences.append((fence[0], body))
+                sec.fences.append((fence[0], body))
+                if sub is not None:
+                    sub.fences.append((fence[0], body))
+                fence = None
+            else:
+                fence[1].append(line)
+            sec.lines.append(line)
+            if sub is not None:
+                sub.lines.append(line)
+            continue
+
+        # ---- META comment
+        if meta:
+            if line.strip().startswith("-->"):
+                meta = False
+            else:
+                m = META_FIELD_RX.match(line)
+                if m:
+                    doc.meta[m.group(1)] = m.group(2)
+            sec.lines.append(line)
+            continue
+        if not seen_meta and line.startswith("<!-- DASHBOARD META"):
+            meta = seen_meta = True
+            sec.lines.append(line)
+            continue
+
+        stripped = line.strip()
+
+        # ---- headings open a new block
+        if line.startswith("## "):
+            close_table()
+            open_marks.clear()
+            sec, sub = Block(line), None
+            doc.sections.append(sec)
+            continue
+        if line.startswith("### "):
+            close_table()
+            sub = Block(line)
+            sec.subs.append(sub)
+            sec.lines.append(line)
+            continue
+
+        sec.lines.append(line)
+        if sub is not None:
+            sub.lines.append(line)
+
+        # ---- header probes, only until they hit
+        if doc.title is None:
+            m = TITLE_RX.match(line)
+            if m:
+                rest = re.split(r"\s*·\s*", m.group(2), maxsplit=1)
+                doc.title = (m.group(1), rest[0], rest[1] if len(rest) > 1 else "")
+        if doc.complete is None:
+            m = COMPLETE_RX.search(line)
+            if m:
+                doc.complete = m.group(1)
+
+        # ---- tables
+        if stripped.startswith("|"):
+            if table is None:
+                table = []
+            table.append(_cells(stripped))
+            continue
+        close_table()
+
+        if stripped.startswith("```"):
+            fence = [stripped[3:].strip(), []]
+            continue
+
+        if line.startswith("- "):
+            sec.items.append(line[2:])
+            if sub is not None:
+                sub.items.append(line[2:])
+            continue
+
+        # ---- <!-- NAME --> ... <!-- END NAME --> regions
+        if stripped.startswith("<!--"):
+            m = MARKER_RX.match(stripped)
+            if m:
+                name = m.group(1)
+                if name.startswith("END "):
+                    for blk, start in open_marks.pop(name[4:], ()):
+                        blk.markers[name[4:]] = (start, len(blk.lines) - 1)
+                else:
+                    open_marks[name] = [(sec, len(sec.lines))] + (
+                        [(sub, len(sub.lines))] if sub is not None else [])
+
+    close_table()
+    if fence is not None:       # unterminated ``` — keep what we have
+        doc.fences.append((fence[0], "\n".join(fence[1])))
+    return doc
+
+
+def scan_meta(path, limit=64):
+    """Just the DASHBOARD META fields of the file at {path}: reads no further
+    than the comment's end, or {limit} lines when there is no META."""
+    meta, inside = {}, False
+    with open(path, encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if inside:
+                if line.strip().startswith("-->"):
+                    break
+                m = META_FIELD_RX.match(line.rstrip("\n"))
+                if m:
+                    meta[m.group(1)] = m.group(2)
+            elif line.startswith("<!-- DASHBOARD META"):
+                inside = True
+            elif i >= limit:
+                break
+    return meta
@@ -0,0 +1,167 @@
+"""
+Parsed dashboard model shared by the render targets.
+
+`parse_dashboard(src)` runs the single `mdscan` pass and folds the result into
+a `Dashboard`: a `__slots__` object whose phases, task groups, tasks,
+decisions, criteria and recent items are NamedTuple records (tuple-backed, no
+per-row `__dict__`). build.py's `emit_console()` and viz.py's `emit_v2()` take
+this model, so one warm interpreter can parse and render many projects
+in-process:
+
+    from model import parse_dashboard
+    from viz import emit_v2
+    html = emit_v2(parse_dashboard(pathlib.Path(".claude/dashboard.md")))
+
+`src` is anything `mdscan.scan` accepts: text, a path, a file, or lines.
+For a dashboard file, `ir.load(path)` returns the same model through a
+cached, compact JSON form, so further targets skip the parse.
+"""
+
+import re
+from typing import NamedTuple
+
+import mdscan
+
+
+class Phase(NamedTuple):
+    name: str           # "Phase 46 — Personal Style Rules" / "Unphased"
+    n: str              # "46" / "Unphased"
+    done: int
+    total: int
+    status: str
+
+
+class Task(NamedTuple):
+    id: str
+    title: str
+    status: str
+    diff: str
+    owner: str
+    deps: str
+
+
+class TaskGroup(NamedTuple):
+    name: str
+    finished: int       # "✅ N tasks finished"
+    extra: str          # " (+2 archived non-finished)" or ""
+    tasks: tuple        # active Task rows
+
+
+class Decision(NamedTuple):
+    id: str
+    title: str
+    status: str
+    sel: str            # selected-option text
+    link: str           # decision record path, "" when unlinked
+
+
+class Criterion(NamedTuple):
+    done: bool
+    name: str
+    note: str
+
+
+class Recent(NamedTuple):
+    date: str
+    text: str           # everything after the date, e.g. "Task 854 — Finished: …"
+
+
+class Dashboard:
+    """Everything the emitters need from one dashboard.md."""
+
+    __slots__ = ("meta", "name", "phase_label", "started", "complete",
+                 "status_counts", "phases", "criteria", "criteria_summary",
+                 "recent", "task_groups", "decisions", "your_tasks",
+                 "timeline", "mermaid", "action", "notes")
+
+    def __init__(self, **kw):
+        for k in self.__slots__:
+            setattr(self, k, kw[k])
+
+    @property
+    def active_phases(self):
+        return [p for p in self.phases if "Complete" not in p.status]
+
+    @property
+    def done_phases(self):
+        return [p for p in self.phases if "Complete" in p.status]
+
+    @property
+    def superseded(self):
+        return sum(1 for d in self.decisions if d.status.lower() == "superseded")
+
+
+PHASE_ROW = re.compile(r"^(Phase .*|Unphased)$")
+ACC_ITEM = re.compile(r"^\[([ x])\] (.*?) — \*(.*?)\*$")
+RECENT_ITEM = re.compile(r"^\*\*(\d{4}-\d\d-\d\d)\*\* — (.*?)$")
+ACC_SUMMARY = (re.compile(r"\*\*(\d+/\d+) criteria passed\*\*"),
+               re.compile(r"(\d+/\d+) criteria"))
+YOUR_TASK = re.compile(r"^\*\*(T?\d+)\*\* — (.*?)$")
+FINISHED = re.compile(r"✅ (\d+) tasks? finished\s*(\([^)]*\))?")
+SEL_LINK = re.compile(r"\[(.*)\]\((.*)\)$", re.S)
+
+
+def _phase(c):
+    return Phase(c[0], c[0].split("—")[0].strip().replace("Phase ", ""),
+                 int(c[1]), int(c[2]), c[3])
+
+
+def _task_group(blk):
+    finished = next(filter(None, map(FINISHED.search, blk.lines)), None)
+    return TaskGroup(
+        blk.title,
+        int(finished.group(1)) if finished else 0,
+        (" " + finished.group(2)) if finished and finished.group(2) else "",
+        tuple(Task(*c[:6]) for c in blk.rows if len(c) >= 6))
+
+
+def _decision(c):
+    lm = SEL_LINK.match(c[3])
+    return Decision(c[0], c[1], c[2], lm.group(1) if lm else c[3],
+                    lm.group(2) if lm else "")
+
+
+def parse_dashboard(src):
+    """Parse a dashboard (text, path, file or lines) into a `Dashboard`."""
+    doc = mdscan.scan(src)
+    prog = doc.section("Progress")
+
+    status_counts, phases = [], []
+    for c in prog.rows:
+        if len(c) == 2 and c[1].isdigit():
+            status_counts.append((c[0], int(c[1])))
+        elif (len(c) == 4 and PHASE_ROW.match(c[0]) and c[1].isdigit()
+              and c[2].isdigit()):
+            phases.append(_phase(c))
+
+    criteria = tuple(Criterion(m.group(1) == "x", m.group(2), m.group(3))
+                     for m in map(ACC_ITEM.match, prog.items) if m)
+    summary = next((m.group(1) for rx in ACC_SUMMARY
+                    for m in map(rx.search, prog.lines) if m),
+                   f"{len(criteria)} criteria")
+
+    notes = doc.section("Notes")
+    user = notes.marked("USER SECTION")
+    name, label, started = doc.title or ("", "", "")
+
+    return Dashboard(
+        meta=doc.meta,
+        name=name, phase_label=label, started=started,
+        complete=int(doc.complete or 0),
+        status_counts=tuple(status_counts),
+        phases=tuple(phases),
+        criteria=criteria,
+        criteria_summary=summary,
+        recent=tuple(Recent(*m.groups())
+                     for m in map(RECENT_ITEM.match, prog.items) if m),
+        task_groups=tuple(_task_group(b) for b in doc.section("Tasks").subs),
+        decisions=tuple(_decision(c) for c in doc.section("Decisions").rows
+                        if len(c) >= 4),
+        your_tasks=tuple(m.groups() for m in
+                         map(YOUR_TASK.match, doc.section("Action Required").items)
+                         if m),
+        timeline=tuple(tuple(c) for c in prog.sub("Timeline").rows if len(c) >= 3),
+        mermaid=doc.fence("mermaid").strip(),
+        action=tuple(doc.section("Action Required").lines),
+        notes=tuple(notes.lines if user is None else user),
+    )
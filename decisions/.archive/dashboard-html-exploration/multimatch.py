@@ -0,0 +1,179 @@
+"""
+Multi-pattern matcher: many regexes, one scan of the text.
+
+sweep.py used to run `re.findall` once per feature over the whole dashboard
+and then re-run the same regex line by line from line 1 to find an example
+line number — 50+ full passes per file. `MultiMatcher` compiles the feature
+set once and answers counts, first-hit offsets and line numbers for every
+pattern from a single pass:
+
+  1. Literal prefilter. Each pattern's required literals (e.g. `OVERDUE`,
+     "```mermaid", `Absorbed`, one per top-level alternative) are pulled out of
+     its parsed form and joined into ONE prefix-trie regex. That regex walks
+     the text once; every hit names a candidate line and the patterns whose
+     literal it saw.
+  2. Verification. Per candidate line, only those patterns run, and only over
+     that line.
+  3. Line numbers come from `bisect` over a newline-offset array built once
+     per text.
+
+Patterns that could span lines (`\\s`, `[^…]`, anchors, DOTALL) or have no
+usable literal fall back to a plain full-text `finditer`, so results always
+equal per-pattern `re.findall` counts.
+"""
+
+import re
+from bisect import bisect_left
+from typing import NamedTuple
+
+try:
+    from re import _parser as sre_parse, _constants as sre_c
+except ImportError:                                     # Python < 3.11
+    import sre_parse
+    import sre_constants as sre_c
+
+MIN_LITERAL = 2
+
+
+def _rank(run):
+    # emoji/markup runs are far rarer in a dashboard than plain words, so a
+    # short "❓ " makes a better prefilter key than a long "ecision"
+    return len(run) >= MIN_LITERAL, not run.isascii(), len(run)
+# constructs that can match "\n" or behave differently per line than per text
+NOT_LINE_LOCAL = re.compile(r"\\[sSDWnZA]|\[\^|\(\?[a-z]*s|(?<!\\)[\^$]")
+
+
+class Hit(NamedTuple):
+    count: int
+    offset: int         # first match, char offset into the text
+    lineno: int         # 1-based line of the first match
+    line: str           # that line, unstripped
+
+
+def _required(sub):
+    """Literals such that every match contains at least one, or None."""
+    best, run, alts = "", "", None
+    for op, av in sub:
+        if op is sre_c.LITERAL:
+            run += chr(av)
+            continue
+        best, run = max(best, run, key=_rank), ""
+        if alts is None:
+            if op is sre_c.BRANCH:
+                parts = [_required(a) for a in av[1]]
+            elif op is sre_c.SUBPATTERN:
+                parts = [_required(av[-1])]
+            else:
+                continue
+            if all(parts):
+                alts = set().union(*parts)
+    best = max(best, run, key=_rank)
+    if len(best) >= MIN_LITERAL:
+        return {best}
+    return alts
+
+
+def trie_regex(words):
+    """One regex matching any of {words}, factored into a prefix trie.
+
+    `re` tries the branches of a flat `a|b|c` alternation one by one at every
+    position; a trie tests one character class per position instead and keeps
+    the engine's first-character skip. Greedy `?` makes each hit the longest
+    literal starting there.
+    """
+    root = {}
+    for w in words:
+        node = root
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        alts = [re.escape(ch) + emit(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:%s)" % "|".join(alts)
+        if "" in node:
+            return "(?:%s)?" % body
+        return body
+
+    return emit(root)
+
+
+def required_literals(pattern):
+    """Public wrapper: literal set for a regex source, or None if unfilterable."""
+    tree = sre_parse.parse(pattern)
+    if tree.state.flags & sre_c.SRE_FLAG_IGNORECASE:
+        return None
+    return _required(tree)
+
+
+class MultiMatcher:
+    """Compile {patterns} (name, regex) once; `scan(text)` -> {name: Hit}."""
+
+    def __init__(self, patterns):
+        self.full = []          # (name, compiled) scanned over the whole text
+        by_lit = {}             # literal -> [(name, compiled)] it can confirm
+        for name, rx in patterns:
+            req = None if NOT_LINE_LOCAL.search(rx) else required_literals(rx)
+            if req:
+                for lit in req:
+                    by_lit.setdefault(lit, []).append((name, re.compile(rx)))
+            else:
+                self.full.append((name, re.compile(rx)))
+        # scan() restarts one char after each hit, so hits may overlap and every
+        # start position reports its longest literal; shorter literals that are
+        # substrings of a reported one are folded in through `self.implied`.
+        self.implied = {lit: [p for other, ps in by_lit.items() if other in lit
+                              for p in ps] for lit in by_lit}
+        self.prefilter = re.compile(trie_regex(by_lit)) if by_lit else None
+
+    def scan(self, text):
+        """One pass over {text}; {name: Hit} for every pattern that matched."""
+        nl = [m.start() for m in re.finditer("\n", text)]
+        found = {}
+
+        def record(name, n, off, ls, le):
+            if name in found:
+                c, o, ln, line = found[name]
+                found[name] = Hit(c + n, o, ln, line)
+            else:
+                found[name] = Hit(n, off, bisect_left(nl, off) + 1, text[ls:le])
+
+        def verify(ls, le, todo):
+            line = text[ls:le]
+            for name, rx in todo.values():
+                ms = list(rx.finditer(line))
+                if ms:
+                    record(name, len(ms), ls + ms[0].start(), ls, le)
+
+        if self.prefilter is not None:
+            implied, search, end = self.implied, self.prefilter.search, len(text)
+            ls = le = -1
+            todo = {}
+            m = search(text)
+            while m is not None:
+                pos = m.start()
+                if pos >= le:                       # hit on a new line
+                    if todo:
+                        verify(ls, le, todo)
+                        todo = {}
+                    i = bisect_left(nl, pos)
+                    ls = nl[i - 1] + 1 if i else 0
+                    le = nl[i] if i < len(nl) else end
+                for p in implied[m.group()]:
+                    todo[p[0]] = p
+                m = search(text, pos + 1)
+            if todo:
+                verify(ls, le, todo)
+
+        for name, rx in self.full:
+            it = rx.finditer(text)
+            first = next(it, None)
+            if first is None:
+                continue
+            off = first.start()
+            i = bisect_left(nl, off)
+            record(name, 1 + sum(1 for _ in it), off, nl[i - 1] + 1 if i else 0,
+                   nl[i] if i < len(nl) else len(text))
+        return found
@@ -0,0 +1,50 @@
+"""
+Paint-cost profiles for the emitted CSS: "full" (the designed look) and
+"lite" (the same layout with paint-cheap equivalents).
+
+Both emitters ship styles that cost a repaint on every scroll frame, which
+older laptops cannot keep up with once the page holds a few thousand rows:
+
+  - build.py's body background is a `feTurbulence` noise filter (an SVG
+    filter rasterised under the whole page);
+  - the sticky masthead has `backdrop-filter: blur(10px)`, i.e. a blur of
+    whatever scrolls beneath it, every frame;
+  - every card / stat / `.af` carries a layered `box-shadow` (`--shadow`,
+    `--sh`), and build.py's critical-path rows an inset one;
+  - viz.py's phase `.cell`s lift with a `transform` + shadow on hover.
+
+"lite" appends overrides after the emitter's CSS, so the full styles stay
+the single source of layout: the noise and blur go (the masthead becomes
+opaque paper), shadows become the existing 1px borders, hover lifts become
+an outline. It also adds `content-visibility:auto` with an intrinsic size
+on long repeated rows (tasks, decisions, spec sections, timeline rows) and
+`contain:content` on cards, so rows off screen are neither laid out nor
+painted; smooth scrolling is dropped too, so anchor jumps land where the
+estimated row sizes say rather than animating past rows that resize as they
+render. The windowed decisions list (declist.py) is left alone: it already
+keeps only visible rows in the DOM, and measures the ones it draws.
+
+Mode selection: `lite_mode("auto", n)` switches to lite above LITE_AUTO rows
+(`rows(m)`: open task rows plus decisions — what the page lays out);
+"full" / "lite" force either.
+"""
+
+LITE_AUTO = 1200
+MODES = ("auto", "full", "lite")
+
+
+def rows(m):
+    """Repeated rows a `Dashboard` puts in the DOM: open tasks + decisions."""
+    return sum(len(g.tasks) for g in m.task_groups) + len(m.decisions)
+
+
+def lite_mode(mode, n, above=LITE_AUTO):
+    """True when a page of {n} rows should render lite under {mode}."""
+    return mode == "lite" or (mode == "auto" and n > above)
+
+
+# shared by both emitters; each adds its own (build.CSS_LITE, viz.CSS_LITE)
+LITE_CSS = ("\n/* ---- lite paint profile (paint.py) ---- */\n"
+            ":root{--shadow:none;--sh:none} body{background-image:none} html{scroll-behavior:auto}"
+            " header.mast{backdrop-filter:none;-webkit-backdrop-filter:none;background:var(--paper)}"
+            " #dlist:not([data-win])>.dec{content-visibility:auto;contain-intrinsic-size:auto 42px}\n")
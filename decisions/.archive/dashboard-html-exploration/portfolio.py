@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Portfolio mode: every downstream dashboard rendered as its v2 page, plus an
+`index.html` rollup, in one run.
+
+We used to loop `viz.py SRC OUT` over ~60 projects in shell, paying an
+interpreter start, the imports and every regex compile per project. This
+takes the same roots as sweep.py (`find_dashboards`) and:
+
+  - skips a project outright when its dashboard file is untouched (stat), or
+    when its META `task_hash` / `spec_fingerprint` / `generated` /
+    `decision_count` match the last run (only the META comment is read);
+  - renders the rest in a process pool bounded by the core count (`-j`),
+    each worker a warm interpreter that keeps viz.py's compiled templates and
+    regexes across the projects it is handed, loads the model through the
+    project's cached IR (ir.py), and renders through the output's own
+    `RenderCache` (only changed sections re-emit). The IR and spec index
+    of a project are kept in OUT_DIR/.dashcache/<project>/ and its trend
+    snapshots in the history store (history.py), so nothing is written into
+    the scanned projects;
+  - writes `index.html`: % complete, phases done, blocked phases, open
+    verification debt and drift per project, with portfolio totals on top.
+
+Output: OUT_DIR/<project>.html + OUT_DIR/index.html (default ./portfolio/);
+run state lives in OUT_DIR/.dashcache/portfolio.json, per-project caches
+beside it.
+
+Usage: python3 portfolio.py [ROOT ...] [-o OUT_DIR] [-j N] [--decisions MODE] [--paint MODE] [--assets MODE] [--history PATH] [--no-cache]
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from declist import MODES, window_mode
+from mdscan import scan_meta
+from rcache import NOCACHE, RenderCache, cache_dir, doc_key, source_salt, stream_if_changed, write_if_changed
+from sweep import DEFAULT_ROOTS, find_dashboards
+from tmpl import Template
+import assets
+import history
+import ir
+import paint
+import viz
+
+VERSION = 1
+HERE = pathlib.Path(__file__).parent
+SALT = (__file__, *viz.SALT)          # edits here or in the v2 emitter re-render everything
+META_KEYS = ("task_hash", "spec_fingerprint", "generated", "decision_count")
+
+
+def meta_key(meta):
+    """What decides "unchanged" for a project; None when there is no
+    task_hash to go on (such a project is always handed to a worker)."""
+    return [meta.get(k) for k in META_KEYS] if meta.get("task_hash") else None
+
+
+def summary(m, out):
+    """The index row for a parsed dashboard."""
+    meta = m.meta
+    return {"name": m.name, "out": out, "complete": m.complete,
+            "phases": len(m.phases), "done": len(m.done_phases),
+            "active": len(m.active_phases),
+            "blocked": [p.n for p in m.phases if "blocked" in p.status.lower()],
+            "debt": _int(meta.get("verification_debt")),
+            "drift": _int(meta.get("drift_deferrals")),
+            "tasks": meta.get("task_count", "?"), "decisions": len(m.decisions),
+            "spec": meta.get("spec_version", ""), "generated": meta.get("generated", "")}
+
+
+def _int(s):
+    try:
+        return int(s or 0)
+    except ValueError:
+        return 0
+
+
+def render_one(src, out, decisions="auto", use_cache=True, paint_mode="auto",
+               lite_above=paint.LITE_AUTO, asset_mode="cdn", history_db=None):
+    """Worker: render {src} to {out} as viz.py would, recording its snapshot
+    in {history_db} (default history.DB). Returns (summary row, wrote,
+    sections rendered)."""
+    src, out = pathlib.Path(src), pathlib.Path(out)
+    where = None
+    if use_cache:                   # the project's caches live under OUT_DIR, never in the project
+        where = cache_dir(out) / out.stem
+        where.mkdir(exist_ok=True)
+    m = ir.load(src, cache=use_cache, where=where)
+    spec = viz.load_spec(src.parent, cache=use_cache, where=where)
+    windowed = window_mode(decisions, len(m.decisions))
+    lite = paint.lite_mode(paint_mode, paint.rows(m), lite_above)
+    trend = history.record(src, m, history_db)
+    cache = RenderCache(out, source_salt(*SALT)) if use_cache else NOCACHE
+    key = doc_key(m, spec, windowed, lite, trend, assets.key(asset_mode))
+    wrote = False
+    if not cache.fresh(key):
+        wrote = stream_if_changed(out, viz.stream_v2(m, spec, cache, windowed, lite, trend, asset_mode))
+        cache.save(key)
+    return summary(m, out.name), wrote, cache.misses
+
+
+def out_names(files):
+    """{dashboard path: output file name}: the project directory's name,
+    de-duplicated in path order."""
+    names, seen = {}, set()
+    for f in files:
+        base = re.sub(r"[^\w.-]+", "-", pathlib.Path(f).parent.parent.name).strip("-") or "project"
+        name, n = base, 1
+        while name.lower() in seen or name.lower() == "index":
+            n += 1
+            name = f"{base}-{n}"
+        seen.add(name.lower())
+        names[f] = name + ".html"
+    return names
+
+
+# ---- run state: dashboard path -> [mtime_ns, size, META key, row] ------------
+def load_state(path, salt):
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    ok = data.get("v") == VERSION and data.get("salt") == salt
+    return data.get("projects", {}) if ok else {}
+
+
+def save_state(path, salt, projects):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"v": VERSION, "salt": salt, "projects": projects},
+                              ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def render_all(files, out_dir, jobs=None, decisions="auto", use_cache=True,
+               paint_mode="auto", lite_above=paint.LITE_AUTO, asset_mode="cdn",
+               history_db=None):
+    """Render every dashboard in {files} into {out_dir}, skipping unchanged
+    ones. Returns ({path: row}, stats)."""
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    salt = f"{source_salt(*SALT)}:{decisions}:{paint_mode}:{lite_above}:{assets.key(asset_mode)}"
+    state_path = cache_dir(out_dir) / "portfolio.json" if use_cache else None
+    state = load_state(state_path, salt) if state_path else {}
+    names = out_names(files)
+    rows, stale, new_state = {}, [], {}
+    stats = {"projects": len(files), "stat": 0, "meta": 0, "rendered": 0, "written": 0, "sections": 0}
+    for f in files:
+        st = os.stat(f)
+        out = out_dir / names[f]
+        old = state.get(f)
+        if old and old[3]["out"] == names[f] and out.exists():
+            if old[:2] == [st.st_mtime_ns, st.st_size]:
+                rows[f], new_state[f] = old[3], old
+                stats["stat"] += 1
+                continue
+            key = meta_key(scan_meta(f))
+            if key is not None and key == old[2]:
+                rows[f] = old[3]
+                new_state[f] = [st.st_mtime_ns, st.st_size, key, old[3]]
+                stats["meta"] += 1
+                continue
+        stale.append((f, st))
+    if stale:
+        args = [(f, out_dir / names[f], decisions, use_cache, paint_mode, lite_above,
+                 asset_mode, history_db) for f, _ in stale]
+        workers = min(jobs or os.cpu_count() or 1, len(stale))
+        if workers == 1:
+            results = [render_one(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(render_one, *zip(*args)))
+        for (f, st), (row, wrote, misses) in zip(stale, results):
+            rows[f] = row
+            new_state[f] = [st.st_mtime_ns, st.st_size, meta_key(scan_meta(f)), row]
+            stats["rendered"] += 1
+            stats["written"] += wrote
+            stats["sections"] += misses
+    if state_path:
+        save_state(state_path, salt, new_state)
+    return {f: rows[f] for f in files}, stats
+
+
+# ---- index page -------------------------------------------------------------
+def totals(rows):
+    return {"projects": len(rows),
+            "complete": round(sum(r["complete"] for r in rows) / len(rows)) if rows else 0,
+            "phases": sum(r["phases"] for r in rows), "done": sum(r["done"] for r in rows),
+            "blocked": sum(len(r["blocked"]) for r in rows),
+            "debt": sum(r["debt"] for r in rows), "drift": sum(r["drift"] for r in rows)}
+
+
+def attention(r):
+    """Index order: blocked phases, then debt + drift, then least complete."""
+    return (-len(r["blocked"]), -(r["debt"] + r["drift"]), r["complete"], r["name"].lower())
+
+
+INDEX_CSS = r"""
+.plist{display:grid;grid-template-columns:repeat(auto-fill,minmax(300px,1fr));gap:12px}
+.proj{display:block;text-decoration:none;color:inherit;background:var(--card);border:1px solid var(--line);border-radius:12px;padding:13px 15px;box-shadow:var(--sh)}
+.proj:hover{border-color:var(--line2);transform:translateY(-1px)}
+.proj.bad{border-color:#e3b6ac} .proj .pn{font-family:"Fraunces",serif;font-weight:600;font-size:15px}
+.proj .pc{float:right;font-family:"IBM Plex Mono",monospace;font-weight:600}
+.proj .pbar{height:6px;border-radius:3px;background:var(--paper-2);margin:8px 0;overflow:hidden}
+.proj .pbar>i{display:block;height:100%;background:linear-gradient(90deg,var(--brand),var(--brand2))}
+.proj .pf{display:flex;gap:12px;flex-wrap:wrap;font-size:11.5px;color:var(--soft)} .proj .pf b{color:var(--ink);font-family:"IBM Plex Mono",monospace}
+.proj .pf .bad b,.proj .pf .bad{color:var(--bad)} .proj .pf .warn b{color:var(--warn)}
+"""
+
+INDEX = Template("portfolio-index", """<!doctype html><html lang="en"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>Portfolio — {{ t['projects'] }} dashboards</title>
+{{{ font_links }}}<style>{{{ style }}}</style>
+<svg width="0" height="0"><defs><linearGradient id="g" x1="0" y1="0" x2="1" y2="1"><stop offset="0" stop-color="var(--brand)"/><stop offset="1" stop-color="var(--brand2)"/></linearGradient></defs></svg></head>
+<body><header class="mast"><div class="mast-in"><span class="crumb">Portfolio</span><h1>{{ t['projects'] }} projects</h1>
+<span class="tv">read-only rollup · each card opens the project's v2 dashboard</span></div></header><div class="wrap">
+<section><div class="pulse">{{{ ring(t['complete']/100) }}}<div></div>
+<div class="pmeta"><div class="row"><div><div class="big">{{ t['done'] }}<span style="color:var(--soft);font-size:18px">/{{ t['phases'] }}</span></div><div class="lbl">phases done</div></div>
+<div><div class="big"{{{ ' style="color:var(--bad)"' if t['blocked'] else '' }}}>{{ t['blocked'] }}</div><div class="lbl">blocked phases</div></div></div>
+<div class="row"><div><div class="big" style="color:var(--{{{ 'warn' if t['debt'] else 'ok' }}})">{{ t['debt'] }}</div><div class="lbl">verif debt</div></div>
+<div><div class="big" style="color:var(--{{{ 'warn' if t['drift'] else 'ok' }}})">{{ t['drift'] }}</div><div class="lbl">drift</div></div></div></div></div></section>
+<section><h2 class="st">Projects · needing attention first</h2><div class="plist">
+{% for r in rows %}<a class="proj{{{ ' bad' if r['blocked'] else '' }}}" href="{{ r['out'] }}"><span class="pc">{{ r['complete'] }}%</span><span class="pn">{{ r['name'] or r['out'][:-5] }}</span>
+<div class="pbar"><i style="width:{{ r['complete'] }}%"></i></div><div class="pf"><span><b>{{ r['done'] }}/{{ r['phases'] }}</b> phases</span><span><b>{{ r['active'] }}</b> active</span>
+{% if r['blocked'] %}<span class="bad"><b>{{ len(r['blocked']) }}</b> blocked ({{ ', '.join('P' + n for n in r['blocked']) }})</span>{% end %}
+{% if r['debt'] %}<span class="warn"><b>{{ r['debt'] }}</b> verif debt</span>{% end %}{% if r['drift'] %}<span class="warn"><b>{{ r['drift'] }}</b> drift</span>{% end %}
+<span><b>{{ r['tasks'] }}</b> tasks</span><span>{{ r['spec'] }}</span><span>{{ r['generated'][:10] }}</span></div></a>
+{% end %}</div></section>
+<footer>single read-only HTML rollup · state of record = each project's task JSON</footer></div></body></html>""")
+
+
+def write_index(rows, out_dir, asset_mode="cdn"):
+    """Write OUT_DIR/index.html (only when its bytes change)."""
+    rows = sorted(rows, key=attention)
+    page = INDEX.render(rows=rows, t=totals(rows), ring=viz.ring, style=viz.CSS + INDEX_CSS,
+                        font_links=assets.font_links(asset_mode))
+    return write_if_changed(pathlib.Path(out_dir) / "index.html",
+                            "".join(assets.embed([page], asset_mode)))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render every downstream dashboard as its v2 page, plus a portfolio index.")
+    ap.add_argument("roots", nargs="*", default=DEFAULT_ROOTS,
+                    help="dirs holding projects, project dirs, or dashboard globs (default: $SWEEP_ROOTS or ~/Developer)")
+    ap.add_argument("-o", "--out-dir", type=pathlib.Path, default=HERE / "portfolio", help="output directory")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores; 1 = serial)")
+    ap.add_argument("--decisions", choices=MODES, default="auto", help="decision list mode, as viz.py")
+    ap.add_argument("--paint", choices=paint.MODES, default="auto", help="paint profile, as viz.py")
+    ap.add_argument("--lite-above", type=int, default=paint.LITE_AUTO, metavar="N",
+                    help="--paint auto threshold, as viz.py")
+    ap.add_argument("--assets", choices=assets.MODES, default="auto", help="font delivery, as viz.py")
+    ap.add_argument("--history", type=pathlib.Path, default=history.DB, metavar="PATH",
+                    help="progress snapshot store, as viz.py")
+    ap.add_argument("--no-cache", action="store_true", help="re-render every project, don't touch .dashcache/")
+    args = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    files = find_dashboards(args.roots)
+    if not files:
+        print(f"no dashboards under {', '.join(args.roots)}", file=sys.stderr)
+        return 1
+    args.assets = assets.resolve(args.assets)
+    rows, st = render_all(files, args.out_dir, args.jobs, args.decisions, not args.no_cache,
+                          args.paint, args.lite_above, args.assets, args.history)
+    wrote = write_index(rows.values(), args.out_dir, args.assets)
+    print(f"{st['projects']} projects → {args.out_dir}: {st['rendered']} rendered "
+          f"({st['written']} written, {st['sections']} sections), {st['stat']} untouched, "
+          f"{st['meta']} unchanged by META, index {'written' if wrote else 'unchanged'} "
+          f"· {(time.perf_counter() - t0) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
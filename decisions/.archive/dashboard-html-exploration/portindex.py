@@ -0,0 +1,215 @@
+"""
+Cross-project full-text index of tasks, decisions, acceptance criteria and
+Action Required items, kept by sweep.py in `.dashcache/sweep.db`.
+
+sweep.py only counts regex hits per project, so "which projects decided X"
+or "where else did we hit this blocker" meant grepping every dashboard by
+hand. `update()` keeps a stdlib `sqlite3` database with one row per parsed
+record (model.py) and an FTS5 index over it:
+
+    files(id, path, project, mtime_ns, size, digest)
+    items(id, file, kind, ref, title, status, body, grp, link)
+        kind  task / decision / criterion / action
+        ref   T123 / DEC-004 / "" ;  body: deps / selection / note / heading
+        grp   task group or Action Required heading
+    items_fts(ref, title, body, status)   external content = items, kept in
+                                          step by triggers
+
+Incremental like the sweep cache: a file whose (mtime, size) is unchanged
+is not opened; a touched file is hashed (blake2b) and re-parsed only when
+its bytes changed, and then only its own rows are replaced, in one
+transaction for the whole run. Parsing fans out over a process pool when
+several files changed. Files no longer under the sweep roots drop out.
+
+Records come from the dashboard's IR (ir.py), kept under the caller's
+cache directory (`.dashcache/ir/`), never beside the scanned dashboards.
+
+`query()` is an FTS5 MATCH ranked by bm25 (title weighted over body), so a
+portfolio-wide question is a millisecond lookup, not a rescan. Plain words
+work; FTS5 syntax (`"exact phrase"`, `prefix*`, `a OR b`, `title:x`) is
+passed through. The tokenizer splits ids at the hyphen, so a hyphenated
+word is searched as a phrase: `DEC-004` as `"DEC 004"` and `DEC-07*` as
+`"DEC 07"*` (DEC-070 … DEC-079). A query FTS5 still cannot parse is
+retried with every word quoted.
+
+Usage: python3 sweep.py [ROOT ...] --query TEXT [--kind KIND] [--limit N]
+"""
+
+import hashlib
+import os
+import pathlib
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import ir
+
+VERSION = 2
+KINDS = ("task", "decision", "criterion", "action")
+LIMIT = 25
+HYPHENATED = re.compile(r'(?<![\w"-])(\w+(?:-\w+)+)(\*?)(?![\w"-])')
+
+SCHEMA = """
+CREATE TABLE files(id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, project TEXT NOT NULL,
+                   mtime_ns INTEGER, size INTEGER, digest TEXT);
+CREATE TABLE items(id INTEGER PRIMARY KEY, file INTEGER NOT NULL REFERENCES files(id),
+                   kind TEXT NOT NULL, ref TEXT, title TEXT, status TEXT, body TEXT,
+                   grp TEXT, link TEXT);
+CREATE INDEX items_file ON items(file);
+CREATE VIRTUAL TABLE items_fts USING fts5(ref, title, body, status, content='items',
+                                          content_rowid='id', tokenize='unicode61 remove_diacritics 2');
+CREATE TRIGGER items_ai AFTER INSERT ON items BEGIN
+  INSERT INTO items_fts(rowid, ref, title, body, status)
+  VALUES (new.id, new.ref, new.title, new.body, new.status);
+END;
+CREATE TRIGGER items_ad AFTER DELETE ON items BEGIN
+  INSERT INTO items_fts(items_fts, rowid, ref, title, body, status)
+  VALUES ('delete', old.id, old.ref, old.title, old.body, old.status);
+END;
+"""
+
+
+def connect(path=None):
+    """The index at {path} (None: an in-memory one), created or rebuilt when
+    its schema version is not ours."""
+    con = sqlite3.connect(":memory:" if path is None else str(path))
+    if con.execute("PRAGMA user_version").fetchone()[0] != VERSION:
+        con.executescript("DROP TABLE IF EXISTS items_fts; DROP TABLE IF EXISTS items;"
+                          " DROP TABLE IF EXISTS files;")
+        con.executescript(SCHEMA)
+        con.execute(f"PRAGMA user_version = {VERSION}")
+        con.commit()
+    return con
+
+
+def _digest(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def action_items(lines):
+    """(heading, item) for every list item of the Action Required section."""
+    out, head = [], ""
+    for line in lines:
+        t = line.strip()
+        if t.startswith("#"):
+            head = t.lstrip("#").strip()
+        elif t[:2] in ("- ", "* "):
+            out.append((head, t[2:].strip()))
+    return out
+
+
+def records(path, ir_dir=None):
+    """Item rows (kind, ref, title, status, body, grp, link) of one dashboard,
+    loaded through its IR in {ir_dir} (None: parsed, nothing cached)."""
+    if ir_dir is None:
+        m = ir.load(path, cache=False)
+    else:
+        where = pathlib.Path(ir_dir) / hashlib.blake2b(str(path).encode(), digest_size=8).hexdigest()
+        where.mkdir(parents=True, exist_ok=True)
+        m = ir.load(path, where=where)
+    rows = [("task", "T" + t.id, t.title, t.status, "" if t.deps in ("—", "") else t.deps,
+             g.name, "") for g in m.task_groups for t in g.tasks]
+    rows += [("decision", d.id, d.title, d.status, d.sel, "", d.link) for d in m.decisions]
+    rows += [("criterion", "", c.name, "met" if c.done else "open", c.note, "", "")
+             for c in m.criteria]
+    rows += [("action", "", item, "", head, head, "") for head, item in action_items(m.action)]
+    return rows
+
+
+def update(con, files, project, jobs=None, ir_dir=None):
+    """Bring the index up to date with {files}; {project}(path) names a file's
+    project, {ir_dir} holds their IR caches (see `records`). Returns
+    {"files", "stat", "digest", "indexed", "removed", "items"}."""
+    known = {p: (i, mt, sz, dg) for i, p, mt, sz, dg in
+             con.execute("SELECT id, path, mtime_ns, size, digest FROM files")}
+    st = {"files": len(files), "stat": 0, "digest": 0, "indexed": 0, "removed": 0, "items": 0}
+    touched, stale, parsed = [], [], []
+    for f in files:
+        s = os.stat(f)
+        old = known.get(f)
+        if old and (old[1], old[2]) == (s.st_mtime_ns, s.st_size):
+            st["stat"] += 1
+            continue
+        with open(f, "rb") as fh:
+            dg = _digest(fh.read())
+        if old and old[3] == dg:
+            touched.append((s.st_mtime_ns, s.st_size, old[0]))
+            st["digest"] += 1
+        else:
+            stale.append((f, s.st_mtime_ns, s.st_size, dg))
+    if stale:
+        paths = [f for f, *_ in stale]
+        if jobs == 1 or len(paths) == 1:
+            parsed = [records(p, ir_dir) for p in paths]
+        else:
+            workers = min(jobs or os.cpu_count() or 1, len(paths))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parsed = list(pool.map(records, paths, repeat(ir_dir)))
+    gone = known.keys() - set(files)
+    with con:
+        con.executemany("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", touched)
+        for f in gone:
+            con.execute("DELETE FROM items WHERE file = ?", (known[f][0],))
+            con.execute("DELETE FROM files WHERE id = ?", (known[f][0],))
+        for (f, mt, sz, dg), rows in zip(stale, parsed):
+            if f in known:
+                fid = known[f][0]
+                con.execute("DELETE FROM items WHERE file = ?", (fid,))
+                con.execute("UPDATE files SET mtime_ns = ?, size = ?, digest = ? WHERE id = ?",
+                            (mt, sz, dg, fid))
+            else:
+                fid = con.execute("INSERT INTO files(path, project, mtime_ns, size, digest)"
+                                  " VALUES (?, ?, ?, ?, ?)", (f, project(f), mt, sz, dg)).lastrowid
+            con.executemany("INSERT INTO items(file, kind, ref, title, status, body, grp, link)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [(fid, *r) for r in rows])
+            st["indexed"] += 1
+    st["removed"] = len(gone)
+    st["items"] = con.execute("SELECT count(*) FROM items").fetchone()[0]
+    return st
+
+
+def _phrases(text):
+    """{text} with each bare hyphenated word (`DEC-07*`) as a phrase (`"DEC 07"*`)."""
+    return HYPHENATED.sub(lambda m: '"' + m.group(1).replace("-", " ") + '"' + m.group(2), text)
+
+
+def _quoted(text):
+    return " ".join('"' + w.replace('"', '""') + '"' for w in text.split())
+
+
+def query(con, text, kind=None, limit=LIMIT):
+    """(hits, {project: matches}) for the FTS5 query {text}. Hits are
+    (project, kind, ref, status, title, snippet, grp, link, path), best first."""
+    where = "items_fts MATCH ?" + (" AND i.kind = ?" if kind else "")
+    hits_sql = ("SELECT f.project, i.kind, i.ref, i.status, i.title,"
+                " snippet(items_fts, 2, '«', '»', '…', 10), i.grp, i.link, f.path"
+                " FROM items_fts JOIN items i ON i.id = items_fts.rowid JOIN files f ON f.id = i.file"
+                f" WHERE {where} ORDER BY bm25(items_fts, 3.0, 4.0, 1.0, 1.0) LIMIT ?")
+    count_sql = ("SELECT f.project, count(*) FROM items_fts JOIN items i ON i.id = items_fts.rowid"
+                 f" JOIN files f ON f.id = i.file WHERE {where} GROUP BY f.project ORDER BY 2 DESC, 1")
+    phrased, quoted = _phrases(text), _quoted(text)
+    for q in (phrased, quoted):
+        args = (q, kind) if kind else (q,)
+        try:
+            hits = con.execute(hits_sql, (*args, limit)).fetchall()
+            return hits, dict(con.execute(count_sql, args).fetchall())
+        except sqlite3.OperationalError:
+            if q == quoted:
+                raise
+    return [], {}
+
+
+def print_hits(hits, per_project, out=None):
+    """The `sweep.py --query` report."""
+    total = sum(per_project.values())
+    print(f"{total} matches in {len(per_project)} projects"
+          + (": " + ", ".join(f"{p}({n})" for p, n in per_project.items()) if per_project else ""),
+          file=out)
+    for project, kind, ref, status, title, snip, grp, link, path in hits:
+        head = " ".join(x for x in (ref, f"[{status}]" if status else "", title[:90]) if x)
+        print(f"  {project:24s} {kind:9s} {head}", file=out)
+        if "«" in snip:
+            print(f"  {'':24s} {'':9s} {snip}", file=out)
+    if total > len(hits):
+        print(f"  … {total - len(hits)} more (--limit)", file=out)
@@ -0,0 +1,265 @@
+"""
+Opt-in per-stage profiling for the render pipeline: `--profile` on build.py,
+viz.py and sweep.py.
+
+A slow regen used to leave us guessing between the Markdown scan, the model
+fold (table parsing), inline Markdown, the SVG builders (`donut`, `ring`, the
+phase `cells` grid, the flow graph) and the final write. With a `Profiler`
+started, the pipeline records for every stage: wall time (total and self,
+i.e. minus nested stages), call count and — with `--profile alloc` — the
+allocation high-water mark above the stage's entry level (tracemalloc; this
+slows the run, so compare times only between runs of the same mode).
+
+Stages come from three places:
+
+  - `stage(name, **args)` blocks around the coarse steps (load, parse, write);
+  - `instrument(module, *names)` swaps module-level functions for timed
+    wrappers — only while profiling, so the functions themselves carry no
+    timers when the flag is off;
+  - `cache(c)` wraps a render cache so every fragment becomes a
+    `section:<kind>` stage (hit / miss, bytes), and `stream(name, chunks)`
+    times each pull on a template stream, which separates emitting from
+    writing inside `stream_if_changed`.
+
+With no profiler running (`ACTIVE is None`) `stage()` returns a shared no-op
+context and `cache()` / `stream()` return their argument, so the call sites
+cost one global lookup per run, not per row.
+
+`finish(path)` writes a Chrome trace-event JSON (open in chrome://tracing or
+https://ui.perfetto.dev) and returns a text summary by self time. Process
+pool work (sweep.py's per-file scans) is recorded from `timed_call()`
+results; perf_counter is the system monotonic clock, so worker timestamps
+line up with the parent's.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+MODES = ("time", "alloc")
+PER_NAME = 500          # trace events kept per stage name; totals count every call
+ACTIVE = None
+
+
+class _Null:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL = _Null()
+
+
+class _Stage:
+    __slots__ = ("prof", "name", "args", "t0", "child", "m0", "peak")
+
+    def __init__(self, prof, name, args=None):
+        self.prof, self.name, self.args = prof, name, args
+
+    def __enter__(self):
+        self.prof._open(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.prof._close(self)
+        return False
+
+
+class Profiler:
+    """Stage timings for one run. Not thread-safe: stages nest on one stack."""
+
+    def __init__(self, mode="time"):
+        self.alloc = mode == "alloc"
+        self.stack, self.events, self.kept = [], [], Counter()
+        self.stats = {}         # name -> [calls, total s, self s, peak alloc bytes]
+        self.pid, self.tid = os.getpid(), threading.get_ident()
+        if self.alloc:
+            tracemalloc.start()
+        self.t0 = time.perf_counter()
+
+    # ---- stages --------------------------------------------------------------
+    def stage(self, name, args=None):
+        return _Stage(self, name, args)
+
+    def _open(self, s):
+        s.child = 0.0
+        if self.alloc:
+            s.m0, s.peak = tracemalloc.get_traced_memory()[0], 0
+            tracemalloc.reset_peak()
+        s.t0 = time.perf_counter()
+        self.stack.append(s)
+
+    def _close(self, s):
+        t1 = time.perf_counter()
+        self.stack.pop()
+        dt = t1 - s.t0
+        hw = 0
+        if self.alloc:
+            peak = max(tracemalloc.get_traced_memory()[1], s.peak)
+            hw = max(0, peak - s.m0)
+        if self.stack:
+            parent = self.stack[-1]
+            parent.child += dt
+            if self.alloc:
+                parent.peak = max(parent.peak, peak)
+        self._count(s.name, dt, dt - s.child, hw)
+        self._event(s.name, s.t0, dt, self.pid, self.tid, s.args)
+
+    def _count(self, name, total, own, hw=0):
+        st = self.stats.get(name)
+        if st is None:
+            st = self.stats[name] = [0, 0.0, 0.0, 0]
+        st[0] += 1
+        st[1] += total
+        st[2] += own
+        st[3] = max(st[3], hw)
+
+    def _event(self, name, t0, dt, pid, tid, args):
+        if self.kept[name] >= PER_NAME:
+            return
+        self.kept[name] += 1
+        ev = {"name": name, "cat": name.split(":")[0].split(".")[0], "ph": "X",
+              "ts": round((t0 - self.t0) * 1e6, 1), "dur": round(dt * 1e6, 1),
+              "pid": pid, "tid": tid}
+        if args:
+            ev["args"] = args
+        self.events.append(ev)
+
+    def record(self, name, t0, t1, pid, args=None):
+        """A stage that ran elsewhere (a pool worker), from `timed_call()`."""
+        self._count(name, t1 - t0, t1 - t0)
+        self._event(name, t0, t1 - t0, pid, 0, args)
+
+    # ---- hooks ---------------------------------------------------------------
+    def wrap(self, fn, name):
+        @functools.wraps(fn)
+        def timed(*a, **k):
+            s = _Stage(self, name)
+            self._open(s)
+            try:
+                return fn(*a, **k)
+            finally:
+                self._close(s)
+        timed.__wrapped_by_prof__ = True
+        return timed
+
+    def instrument(self, module, *names):
+        """Replace module.<name> for each of {names} with a timed wrapper."""
+        label = getattr(module, "__name__", "?").replace("__main__", "main")
+        for n in names:
+            fn = getattr(module, n)
+            if not getattr(fn, "__wrapped_by_prof__", False):
+                setattr(module, n, self.wrap(fn, f"{label}.{n}"))
+
+    def stream(self, name, chunks):
+        """{chunks}, with the time spent producing each one as stage {name}."""
+        it = iter(chunks)
+        while True:
+            s = _Stage(self, name)
+            self._open(s)
+            try:
+                chunk = next(it)
+            except StopIteration:
+                return
+            finally:
+                self._close(s)
+            yield chunk
+
+    # ---- output --------------------------------------------------------------
+    def finish(self, path=None):
+        """Write the trace to {path} (if given); return the text summary."""
+        wall = time.perf_counter() - self.t0
+        if self.alloc:
+            tracemalloc.stop()
+        if path is not None:
+            meta = [{"name": "process_name", "ph": "M", "pid": self.pid,
+                     "args": {"name": "render"}}]
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": meta + self.events, "displayTimeUnit": "ms"}, f)
+            os.replace(tmp, path)
+        return self.summary(wall, path)
+
+    def summary(self, wall, path=None, limit=25):
+        rows = sorted(self.stats.items(), key=lambda kv: -kv[1][2])
+        w = max([len(n) for n, _ in rows[:limit]] + [5])
+        out = [f"profile: {wall * 1000:.1f} ms wall"
+               + (f" · trace {path}" if path else ""),
+               f"  {'stage':<{w}} {'calls':>7} {'total ms':>9} {'self ms':>9}"
+               + (f" {'alloc KiB':>10}" if self.alloc else "")]
+        for name, (calls, total, own, hw) in rows[:limit]:
+            out.append(f"  {name:<{w}} {calls:>7} {total * 1000:>9.2f} {own * 1000:>9.2f}"
+                       + (f" {hw / 1024:>10.1f}" if self.alloc else ""))
+        if len(rows) > limit:
+            out.append(f"  … {len(rows) - limit} more stages in the trace")
+        return "\n".join(out)
+
+
+class _ProfiledCache:
+    """A render cache whose fragments are `section:<kind>` stages."""
+
+    def __init__(self, prof, inner):
+        self._prof, self._inner = prof, inner
+
+    def frag(self, kind, data, render):
+        s = _Stage(self._prof, "section:" + kind)
+        self._prof._open(s)
+        misses = self._inner.misses
+        try:
+            out = self._inner.frag(kind, data, render)
+        except BaseException:
+            self._prof._close(s)
+            raise
+        s.args = {"miss": self._inner.misses != misses, "bytes": len(out)}
+        self._prof._close(s)
+        return out
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+# ---- module-level entry points (no-ops while ACTIVE is None) -------------------
+def start(mode="time"):
+    global ACTIVE
+    ACTIVE = Profiler(mode)
+    return ACTIVE
+
+
+def stage(name, **args):
+    p = ACTIVE
+    return NULL if p is None else p.stage(name, args or None)
+
+
+def cache(c):
+    return c if ACTIVE is None else _ProfiledCache(ACTIVE, c)
+
+
+def stream(name, chunks):
+    return chunks if ACTIVE is None else ACTIVE.stream(name, chunks)
+
+
+def instrument(module, *names):
+    if ACTIVE is not None:
+        ACTIVE.instrument(module, *names)
+
+
+def finish(path=None):
+    """Stop the active profiler; its summary (None when none was running)."""
+    global ACTIVE
+    p, ACTIVE = ACTIVE, None
+    return None if p is None else p.finish(path)
+
+
+def timed_call(fn, *args):
+    """fn(*args) -> (result, (t0, t1, pid)): picklable, for pool workers."""
+    t0 = time.perf_counter()
+    res = fn(*args)
+    return res, (t0, time.perf_counter(), os.getpid())
@@ -0,0 +1,189 @@
+"""
+On-disk render cache for the HTML emitters.
+
+A regen usually touches one task, yet build.py / viz.py used to rebuild every
+section and rewrite the output file every time — bumping its mtime and waking
+every file watcher. `RenderCache` keeps the emitted HTML of each fragment
+(tasks per phase, decisions, timeline, spec sections, ...) keyed by a content
+hash of the parsed data that produced it, so only changed fragments are
+re-emitted. A document-level key (META `task_hash` / `spec_fingerprint` +
+every fragment input + the emitter's own source) lets an unchanged dashboard
+skip emission entirely, and `write_if_changed()` / `stream_if_changed()` only
+touch the output when its bytes actually differ.
+
+Cache files live in `.dashcache/` next to the output, one JSON file per
+output. Entries not used by the latest render are dropped on save, so the
+cache never grows past one document's worth of fragments. Caches derived
+from a *source* (the IR, the spec index) go under `source_dir()`, this
+tool's own `.dashcache/`, because a source may sit in another project's
+`.claude/`, which must never be written to.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+
+VERSION = 1
+HERE = pathlib.Path(__file__).parent
+
+
+def digest(*parts):
+    """Short stable hash of arbitrary parsed data (records are tuples -> repr)."""
+    h = hashlib.blake2b(digest_size=12)
+    for p in parts:
+        h.update(repr(p).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def doc_key(model, *extra):
+    """Document-level key: META hashes plus every parsed field of {model}."""
+    meta = model.meta
+    return digest(meta.get("task_hash"), meta.get("spec_fingerprint"),
+                  meta.get("decision_count"),
+                  *(getattr(model, k) for k in model.__slots__), *extra)
+
+
+def source_salt(*files):
+    """Hash of the emitter source files, so a code change invalidates the cache."""
+    h = hashlib.blake2b(digest_size=12)
+    for f in files:
+        h.update(pathlib.Path(f).read_bytes())
+    return h.hexdigest()
+
+
+def cache_dir(near):
+    """`.dashcache/` beside {near} (a file or directory), created on demand."""
+    near = pathlib.Path(near)
+    d = (near if near.is_dir() else near.parent) / ".dashcache"
+    d.mkdir(exist_ok=True)
+    return d
+
+
+def source_dir(src):
+    """This tool's cache directory for the source file or directory {src}:
+    `.dashcache/src/<hash of its resolved path>/` beside the emitters,
+    created on demand."""
+    key = hashlib.blake2b(str(pathlib.Path(src).resolve()).encode("utf-8"), digest_size=8)
+    d = cache_dir(HERE) / "src" / key.hexdigest()
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+class NoCache:
+    """Stand-in used by library callers: always renders, never stores."""
+
+    hits = misses = 0
+
+    def frag(self, kind, data, render):
+        return render()
+
+    def val(self, x):
+        """A scalar that can change between renders (watch mode anchors it)."""
+        return str(x)
+
+    def fresh(self, doc_key):
+        return False
+
+    def save(self, doc_key=None):
+        pass
+
+
+NOCACHE = NoCache()
+
+
+class RenderCache:
+    """Fragment cache for one output file."""
+
+    def __init__(self, output, salt=""):
+        output = pathlib.Path(output)
+        self.path = cache_dir(output) / (output.name + ".json")
+        self.output = output
+        self.salt = salt
+        self.hits = self.misses = 0
+        self._old, self._new, self._doc = {}, {}, None
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("v") == VERSION and data.get("salt") == salt:
+            self._old = data.get("frags", {})
+            self._doc = data.get("doc")
+
+    def frag(self, kind, data, render):
+        """Return cached HTML for ({kind}, {data}), calling render() on a miss."""
+        key = kind + ":" + digest(data)
+        out = self._new.get(key)
+        if out is None:
+            out = self._old.get(key)
+            if out is None:
+                self.misses += 1
+                out = render()
+            else:
+                self.hits += 1
+            self._new[key] = out
+        return out
+
+    def val(self, x):
+        return str(x)
+
+    def fresh(self, doc_key):
+        """True when the last render had the same document key and its output
+        is still on disk — the caller can skip emission altogether."""
+        return doc_key == self._doc and self.output.exists()
+
+    def save(self, doc_key=None):
+        frags = self._new if self._new else self._old
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"v": VERSION, "salt": self.salt,
+                                   "doc": doc_key, "frags": frags},
+                                  ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def write_if_changed(path, text):
+    """Write {text} to {path} only when the bytes differ. Returns True if written."""
+    path = pathlib.Path(path)
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def stream_if_changed(path, chunks, buffering=1 << 16):
+    """write_if_changed() for a stream of str {chunks} (tmpl.Template.stream):
+    written through a buffered file to a temp sibling while being compared
+    with the current bytes, so neither version is ever held whole in memory.
+    Returns True if {path} was replaced."""
+    path = pathlib.Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        old = open(path, "rb")
+    except OSError:
+        old = None
+    same = old is not None
+    try:
+        with open(tmp, "wb", buffering=buffering) as f:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                f.write(data)
+                if same and old.read(len(data)) != data:
+                    same = False
+        if same and old.read(1) == b"":
+            tmp.unlink()
+            return False
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        if old is not None:
+            old.close()
+    os.replace(tmp, path)
+    return True
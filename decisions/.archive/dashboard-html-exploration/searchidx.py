@@ -0,0 +1,110 @@
+"""
+Precomputed client-side search index for the decision lists.
+
+decFilter() used to walk every `.dec` row on each keystroke, test
+`data-search.includes(q)` and toggle `style.display` row by row — and the
+`data-search` attribute repeated each decision's id, title and selection a
+second time in the HTML. With thousands of decisions typing lagged.
+
+`decision_index()` builds a compact inverted index in Python and both
+emitters embed it as JSON (`<script type="application/json" id="dix">`):
+
+    w  sorted vocabulary (lower-cased word tokens of id, title, selection)
+    p  per word, its postings: doc*3 + field (0 id, 1 title, 2 selection),
+       delta-encoded
+    s  per doc, 0 decided / 1 superseded
+    n  row counts per status filter
+
+`SEARCH_JS` (shared by build.py and viz.py) answers a query without touching
+the DOM. On first use it derives a trigram -> vocabulary-word map from `w`
+(shipping it would more than double the payload for no gain); every query
+token ≥ 3 chars then narrows the vocabulary through that map and confirms
+with `includes`, shorter tokens scan the vocabulary.
+All tokens must match (AND). Docs are ranked by exact-word > prefix >
+substring hits, weighted id > title > selection. The page then only marks the
+hit rows (`.hit` + CSS `order`) — status filtering is a CSS attribute on the
+list — so a keystroke costs O(hits), not O(rows), and input is debounced.
+In windowed mode (declist.py) the same order is handed to `decWindow()`.
+"""
+
+import json
+import re
+
+TOKEN = re.compile(r"\w+")
+
+
+def tokens(text):
+    return TOKEN.findall(text.lower())
+
+
+def _delta(nums):
+    out, prev = [], 0
+    for n in nums:
+        out.append(n - prev)
+        prev = n
+    return out
+
+
+def decision_index(decisions):
+    """JSON search index for {decisions} (model.Decision rows, in DOM order)."""
+    post = {}
+    for i, d in enumerate(decisions):
+        for field, text in enumerate((d.id, d.title, d.sel)):
+            for t in tokens(text):
+                post.setdefault(t, set()).add(i * 3 + field)
+    vocab = sorted(post)
+    sup = [int(d.status.lower() == "superseded") for d in decisions]
+    idx = {"w": vocab,
+           "p": [_delta(sorted(post[w])) for w in vocab],
+           "s": sup,
+           "n": {"all": len(sup), "decided": len(sup) - sum(sup), "superseded": sum(sup)}}
+    return embed_json(idx)
+
+
+def embed_json(obj):
+    """Compact JSON that is safe inside a <script> element."""
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+            .replace("</", "<\\/").replace("<!--", "<\\!--"))
+
+
+SEARCH_JS = r"""
+let DIX=null;
+function decIndex(){if(!DIX){const el=document.getElementById('dix');DIX=el?JSON.parse(el.textContent):{w:[],p:[],s:[],n:{}};
+ const un=a=>{let v=0;return a.map(d=>v+=d);};DIX.p=DIX.p.map(un);DIX.g=new Map();
+ DIX.w.forEach((w,i)=>{for(let k=0;k+3<=w.length;k++){const t=w.slice(k,k+3),g=DIX.g.get(t);
+  if(!g)DIX.g.set(t,[i]);else if(g[g.length-1]!==i)g.push(i);}});}return DIX;}
+function decSearch(q){/* -> ranked doc indices, or null for an empty query */
+ const toks=q.toLowerCase().match(/[\p{L}\p{N}_]+/gu);if(!toks)return null;
+ const X=decIndex(),FW=[4,2,1];let score=null;
+ for(const t of toks){let words;
+  if(t.length>=3){let c=null;for(let k=0;k+3<=t.length;k++){const g=X.g.get(t.slice(k,k+3));if(!g)return[];
+    if(c===null)c=g;else{const s=new Set(g);c=c.filter(w=>s.has(w));}if(!c.length)return[];}
+   words=c.filter(w=>X.w[w].includes(t));}
+  else{words=[];X.w.forEach((w,i)=>{if(w.includes(t))words.push(i);});}
+  const cur=new Map();
+  for(const wi of words){const w=X.w[wi],m=w===t?3:w.startsWith(t)?2:1;
+   for(const p of X.p[wi]){const doc=(p/3)|0,v=m*FW[p%3];if((cur.get(doc)||0)<v)cur.set(doc,v);}}
+  if(score===null)score=cur;else{for(const[doc,v]of score){const c=cur.get(doc);if(c===undefined)score.delete(doc);else score.set(doc,v+c);}}
+  if(!score.size)return[];}
+ return[...score.keys()].sort((a,b)=>score.get(b)-score.get(a)||a-b);}
+let DEC_ROWS=null,DEC_HITS=[],DEC_T=0;
+function decApply(q,f){/* mark ranked hits (or re-window them); returns the shown count */
+ const list=document.getElementById('dlist'),hits=decSearch(q),X=decIndex();
+ const want=f==='all'?-1:f==='superseded'?1:0;
+ if(list.dataset.win!==undefined){/* declist.py windowed mode: hand over the order */
+  let order=hits;if(order===null&&want>=0)order=X.s.flatMap((s,i)=>s===want?[i]:[]);
+  else if(order&&want>=0)order=order.filter(i=>X.s[i]===want);
+  decWindow(order);return order?order.length:X.n.all;}
+ DEC_ROWS=DEC_ROWS||list.querySelectorAll('.dec');
+ for(const i of DEC_HITS){DEC_ROWS[i].classList.remove('hit');DEC_ROWS[i].style.order='';}
+ list.dataset.f=f;
+ if(hits===null){list.classList.remove('q');DEC_HITS=[];return X.n[f]||0;}
+ DEC_HITS=want<0?hits:hits.filter(i=>X.s[i]===want);
+ DEC_HITS.forEach((i,r)=>{DEC_ROWS[i].classList.add('hit');DEC_ROWS[i].style.order=r;});
+ list.classList.add('q');return DEC_HITS.length;}
+function decInput(){clearTimeout(DEC_T);DEC_T=setTimeout(decFilter,120);}
+"""
+
+SEARCH_CSS = ("#dlist.q{display:flex;flex-direction:column} #dlist.q>.dec:not(.hit){display:none}"
+              " #dlist[data-f=decided]>.dec[data-status=superseded],"
+              "#dlist[data-f=superseded]>.dec[data-status=decided]{display:none}")
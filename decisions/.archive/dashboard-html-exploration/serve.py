@@ -0,0 +1,309 @@
+"""
+Watch-and-serve mode for the emitters: `build.py --watch [--serve]`,
+`viz.py --watch [--serve]`.
+
+Operators keep the dashboard open all day and used to regenerate by hand —
+a cold Python start and a full-page reload per edit. `run()` instead keeps
+the emitter process (and its parsed model) warm:
+
+  - `Watcher` polls the dashboard Markdown, the `spec_v*.md` files and the
+    task JSON directories (stat only; the task directories are listed in
+    full only every FULL_SCAN seconds, their own mtimes every tick) and
+    reports a change once the files have been quiet for DEBOUNCE seconds.
+  - The emitter re-parses only the input that changed and re-renders through
+    a `LiveCache`: an in-memory fragment cache that also wraps every fragment
+    (and every `cache.val()` scalar) in `<!--f:ID-->…<!--/f:ID-->` anchors.
+  - The output file is rewritten with the anchors stripped (byte-identical to
+    a one-shot run), and with `--serve` the page is served from memory by a
+    stdlib ThreadingHTTPServer on 127.0.0.1 with an ETag (304 on match).
+  - Open tabs hold an EventSource on /events. When only fragments changed,
+    just those are pushed (`patch` event) and swapped in place between their
+    anchors — open <details>, scroll and search input survive. A change to
+    the page outside any fragment, or to a fragment carrying a <script>,
+    sends `reload`.
+
+Edit-to-screen latency is one poll interval + the debounce + the re-render
+(~20 ms for the styler dashboard), well under 100 ms.
+"""
+
+import hashlib
+import http.server
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from rcache import digest, write_if_changed
+
+PORT = 8765
+INTERVAL = 0.04      # seconds between polls
+DEBOUNCE = 0.03      # quiet time before a change is acted on
+FULL_SCAN = 1.0      # seconds between full listings of the watched directories
+HEARTBEAT = 15.0     # SSE keep-alive comment interval
+
+ANCHOR = re.compile(r"<!--/?f:[\w.-]+-->")
+FRAGMENT = re.compile(r"<!--f:([\w.-]+)-->.*?<!--/f:\1-->", re.S)
+
+CLIENT_JS = r"""
+(()=>{const es=new EventSource('/events');
+ const anchor=id=>{const w=document.createTreeWalker(document.body,NodeFilter.SHOW_COMMENT);let n;
+  while((n=w.nextNode()))if(n.data==='f:'+id)return n;return null;};
+ es.addEventListener('patch',e=>{for(const [id,html] of JSON.parse(e.data)){const a=anchor(id);
+  if(!a){location.reload();return;}let n=a.nextSibling;
+  while(n&&!(n.nodeType===8&&n.data==='/f:'+id)){const x=n.nextSibling;n.remove();n=x;}
+  const t=document.createElement('template');t.innerHTML=html;a.after(t.content);}});
+ es.addEventListener('reload',()=>location.reload());})();
+"""
+
+
+class LiveCache:
+    """In-memory `rcache` stand-in for watch mode: fragments are reused across
+    renders by content key, and every fragment / `val()` comes back wrapped
+    in comment anchors named `kind.n` (n-th of its kind in render order)."""
+
+    def __init__(self):
+        self.hits = self.misses = 0
+        self._old, self._new, self._seen = {}, {}, Counter()
+        self.frags = {}
+
+    def begin(self):
+        """Start a render: last render's fragments become the reuse pool."""
+        self._old, self._new = self._new or self._old, {}
+        self._seen.clear()
+        self.frags = {}
+        self.hits = self.misses = 0
+
+    def frag(self, kind, data, render):
+        key = kind + ":" + digest(data)
+        out = self._new.get(key)
+        if out is None:
+            out = self._old.get(key)
+            if out is None:
+                self.misses += 1
+                out = render()
+            else:
+                self.hits += 1
+            self._new[key] = out
+        return self._mark(kind, out)
+
+    def val(self, x):
+        return self._mark("v", str(x))
+
+    def _mark(self, kind, html):
+        fid = f"{kind}.{self._seen[kind]}"
+        self._seen[kind] += 1
+        self.frags[fid] = html
+        return f"<!--f:{fid}-->{html}<!--/f:{fid}-->"
+
+    def fresh(self, doc_key):
+        return False
+
+    def save(self, doc_key=None):
+        pass
+
+
+def skeleton(page):
+    """The <body> of an anchored page with every fragment emptied."""
+    return FRAGMENT.sub(r"<!--f:\1-->", page[page.find("<body"):])
+
+
+def changes(old, new):
+    """('patch', [(id, html)]) / ('reload', None) / (None, None) between two
+    (page, frags) renders."""
+    if old is None:
+        return None, None
+    (opage, ofrags), (npage, nfrags) = old, new
+    if ofrags.keys() != nfrags.keys() or skeleton(opage) != skeleton(npage):
+        return "reload", None
+    diff = [(fid, html) for fid, html in nfrags.items() if ofrags[fid] != html]
+    if any("<script" in html for _, html in diff):
+        return "reload", None
+    return ("patch", diff) if diff else (None, None)
+
+
+class Watcher:
+    """Debounced stat poller over {files}() (a callable: the set can grow,
+    e.g. a new spec_v*.md) and the files inside {dirs}."""
+
+    def __init__(self, files, dirs=()):
+        self.files, self.dirs = files, [str(d) for d in dirs]
+        self._listed, self._last_full, self.state = {}, 0.0, {}
+        self.state = self._snapshot(full=True)
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _snapshot(self, full=False):
+        snap = {str(p): self._stat(p) for p in self.files()}
+        for d in self.dirs:
+            snap[d] = self._stat(d)
+        if full or any(snap[d] != self.state.get(d) for d in self.dirs):
+            self._listed = {}
+            for d in self.dirs:
+                try:
+                    with os.scandir(d) as it:
+                        for e in it:
+                            if e.is_file():
+                                st = e.stat()
+                                self._listed[e.path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    pass
+            self._last_full = time.monotonic()
+        snap.update(self._listed)
+        return snap
+
+    def poll(self):
+        """Paths changed since the last poll (empty when nothing did), once
+        they have been quiet for DEBOUNCE."""
+        full = time.monotonic() - self._last_full >= FULL_SCAN
+        snap = self._snapshot(full)
+        if snap == self.state:
+            return set()
+        while True:
+            time.sleep(DEBOUNCE)
+            again = self._snapshot(full=True)
+            if again == snap:
+                break
+            snap = again
+        changed = {p for p in snap.keys() | self.state.keys()
+                   if snap.get(p) != self.state.get(p)}
+        self.state = snap
+        return changed
+
+
+class Hub:
+    """The served page + its SSE subscribers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.body, self.etag, self.clients = b"", '""', []
+
+    def publish(self, page):
+        i = page.rfind("</body>")
+        data = (page[:i] + f"<script>{CLIENT_JS}</script>" + page[i:]).encode("utf-8")
+        with self.lock:
+            self.body = data
+            self.etag = '"' + hashlib.blake2b(data, digest_size=12).hexdigest() + '"'
+
+    def send(self, event, data=None):
+        msg = f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+        with self.lock:
+            for q in self.clients:
+                q.put(msg)
+
+    def handler(self):
+        hub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path in ("/", "/index.html"):
+                    with hub.lock:
+                        body, etag = hub.body, hub.etag
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.end_headers()
+                        return
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.send_header("Cache-Control", "no-cache")
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif self.path == "/events":
+                    self.events()
+                else:
+                    self.send_error(404)
+
+            def events(self):
+                q = queue.Queue()
+                with hub.lock:
+                    hub.clients.append(q)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    while True:
+                        try:
+                            msg = q.get(timeout=HEARTBEAT)
+                        except queue.Empty:
+                            msg = b": keep-alive\n\n"
+                        self.wfile.write(msg)
+                        self.wfile.flush()
+                except OSError:
+                    pass
+                finally:
+                    with hub.lock:
+                        hub.clients.remove(q)
+                    self.close_connection = True
+
+        return Handler
+
+
+def run(out, render, files, dirs=(), serve=False, port=PORT):
+    """Watch {files}() + {dirs}; on each change call {render}(changed paths,
+    cache) -> page str (rendered through the LiveCache {cache}), rewrite {out}
+    and, with {serve}, push the difference to open tabs. Runs until ^C."""
+    cache = LiveCache()
+    watcher = Watcher(files, dirs)
+    hub = Hub() if serve else None
+    last = None
+
+    def cycle(changed):
+        nonlocal last
+        t0 = time.perf_counter()
+        cache.begin()
+        page = render(changed, cache)
+        wrote = write_if_changed(out, ANCHOR.sub("", page))
+        cur = (page, cache.frags)
+        event, data = changes(last, cur)
+        last = cur
+        if hub:
+            hub.publish(page)
+            if event:
+                hub.send(event, data)
+        ms = (time.perf_counter() - t0) * 1000
+        what = (f"{len(data)} fragment(s) pushed" if event == "patch" else
+                "reload pushed" if event == "reload" else "no visible change")
+        print(f"{time.strftime('%H:%M:%S')} {len(changed)} changed · {cache.misses} rendered / "
+              f"{cache.hits} reused · {what}{'' if wrote else ' · file unchanged'} · {ms:.0f} ms",
+              file=sys.stderr)
+
+    cycle(set())
+    server = None
+    if serve:
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), hub.handler())
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"serving {out.name} on http://127.0.0.1:{server.server_port}/ (live)", file=sys.stderr)
+    print("watching for changes — ^C to stop", file=sys.stderr)
+    try:
+        while True:
+            changed = watcher.poll()
+            if changed:
+                try:
+                    cycle(changed)
+                except Exception as e:          # keep watching through a bad edit
+                    print(f"render failed: {type(e).__name__}: {e}", file=sys.stderr)
+            else:
+                time.sleep(INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server:
+            server.shutdown()
@@ -0,0 +1,275 @@
+"""
+Per-section fingerprint index over every spec_v*.md version, and the
+section-level delta between two versions.
+
+viz.py used to take the last `spec_v*.md` by *string* sort (spec_v9 after
+spec_v15) and embed it whole; reviewers had no way to see which sections
+moved since the version a task was planned against. `SpecIndex` splits each
+version into its `## ` sections (mdscan), hashes each one and keeps the
+hashes in `specindex.json` under this tool's cache, keyed by the spec
+directory (rcache.source_dir; never beside the specs, which live in the
+project) or in the directory a caller passes as `where`:
+
+    {"v": VERSION, "files": {name: {"stat": [mtime_ns, size],
+                                    "sections": [[title, hash], ...]}},
+     "diffs": {"<old hash>:<new hash>": unified diff}}
+
+A section is hashed and diffed with trailing whitespace dropped and runs of
+blank lines collapsed (`_normal`), so the blank lines that separate it from
+the next heading do not count: appending a section after the last one does
+not mark that one changed. A version whose (mtime, size) is unchanged is
+never re-read or re-hashed.
+`delta(latest, base)` compares the two hash lists — no text diff at all for
+unchanged sections — and only a section whose hash differs is diffed
+(difflib, per section, against that section of the base version), the
+result kept under its hash pair, so a 1 MB spec is not diffed on every regen
+and an edited section is diffed once.
+
+Sections match across versions by heading; a repeated heading matches by
+occurrence (`Notes`, `Notes#2`, ...).
+
+Usage: python3 specindex.py SPEC_DIR [--base vN] [--no-cache]
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import pathlib
+import re
+import sys
+from typing import NamedTuple
+
+import mdscan
+from rcache import source_dir
+
+VERSION = 2
+SPEC_RX = re.compile(r"spec_v(\d+)")
+CONTEXT = 2             # unified-diff context lines
+
+
+class Mark(NamedTuple):
+    """How one section of the latest version relates to the base version."""
+    status: str         # "changed" / "new" / "" (unchanged)
+    since: str          # version label its current text dates from, e.g. "v9"
+    diff: str           # unified diff against the base version ("" unless changed)
+
+
+class Spec(NamedTuple):
+    """What viz.py renders: the latest version, marked against {base}."""
+    stem: str
+    sections: list      # [(title, raw section md)]
+    base: str           # base version label ("" when there is only one version)
+    marks: tuple        # Mark per section
+    removed: tuple      # titles present in base, gone from latest
+
+
+def version_key(path):
+    """Sort key: spec_v9 < spec_v10 < spec_v15b."""
+    stem = pathlib.Path(path).stem
+    m = SPEC_RX.match(stem)
+    return (int(m.group(1)) if m else -1, stem)
+
+
+def label(stem):
+    """`spec_v14` -> `v14`."""
+    return stem[5:] if stem.startswith("spec_") else stem
+
+
+def _keyed(titles):
+    """Headings made unique by occurrence."""
+    seen, out = {}, []
+    for t in titles:
+        n = seen[t] = seen.get(t, 0) + 1
+        out.append(t if n == 1 else f"{t}#{n}")
+    return out
+
+
+BLANKS = re.compile(r"\n(?:[ \t]*\n)+")
+
+
+def _normal(text):
+    """Section text as compared: no trailing whitespace, one blank line at most."""
+    return BLANKS.sub("\n\n", text.rstrip())
+
+
+def _digest(text):
+    return hashlib.blake2b(_normal(text).encode("utf-8"), digest_size=12).hexdigest()
+
+
+def read_sections(path):
+    """[(title, raw section md)] of one spec file."""
+    return [(b.title, b.heading + "\n\n" + b.text + "\n") for b in mdscan.scan(pathlib.Path(path)).sections]
+
+
+class SpecIndex:
+    """Section hashes of every spec version in {spec_dir}."""
+
+    def __init__(self, spec_dir, cache=True, where=None):
+        self.dir = pathlib.Path(spec_dir)
+        self.path = None
+        if cache:
+            self.path = (pathlib.Path(where) if where else source_dir(self.dir)) / "specindex.json"
+        self.files, self.diffs, self._text = {}, {}, {}
+        self.hashed = 0
+        self.dirty = False
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("v") == VERSION:
+            self.files, self.diffs = data["files"], data.get("diffs", {})
+
+    def refresh(self):
+        """Bring the index up to date; returns the version stems, oldest first."""
+        paths = sorted(self.dir.glob("spec_v*.md"), key=version_key)
+        names = [p.name for p in paths]
+        for gone in self.files.keys() - set(names):
+            del self.files[gone]
+            self.dirty = True
+        for p in paths:
+            st = p.stat()
+            stat = [st.st_mtime_ns, st.st_size]
+            ent = self.files.get(p.name)
+            if ent and ent["stat"] == stat:
+                continue
+            secs = self.sections_of(p.name, reread=True)
+            self.files[p.name] = {"stat": stat,
+                                  "sections": [[t, _digest(raw)] for t, raw in secs]}
+            self.hashed += 1
+            self.dirty = True
+        return [p.stem for p in paths]
+
+    def sections_of(self, name, reread=False):
+        """[(title, raw)] of spec file {name}, read at most once per run."""
+        if reread or name not in self._text:
+            self._text[name] = read_sections(self.dir / name)
+        return self._text[name]
+
+    def hashes(self, stem):
+        """{section key: hash} of version {stem}."""
+        secs = self.files[stem + ".md"]["sections"]
+        return dict(zip(_keyed(t for t, _ in secs), (h for _, h in secs)))
+
+    def since(self, stems):
+        """{section key: label of the version its current hash dates from}
+        for the last of {stems} (oldest first)."""
+        cur = self.hashes(stems[-1])
+        out = {k: label(stems[-1]) for k in cur}
+        open_ = set(cur)
+        for stem in reversed(stems[:-1]):
+            if not open_:
+                break
+            old = self.hashes(stem)
+            for k in list(open_):
+                if old.get(k) == cur[k]:
+                    out[k] = label(stem)
+                else:
+                    open_.discard(k)
+        return out
+
+    def diff(self, base, latest, key, old_hash, new_hash):
+        """Unified diff of section {key} between two versions, cached by hash pair."""
+        pair = f"{old_hash}:{new_hash}"
+        if pair not in self.diffs:
+            old = dict(zip(_keyed(t for t, _ in self.sections_of(base + ".md")),
+                           (raw for _, raw in self.sections_of(base + ".md"))))[key]
+            new = dict(zip(_keyed(t for t, _ in self.sections_of(latest + ".md")),
+                           (raw for _, raw in self.sections_of(latest + ".md"))))[key]
+            self.diffs[pair] = "\n".join(difflib.unified_diff(
+                _normal(old).splitlines(), _normal(new).splitlines(), label(base), label(latest),
+                n=CONTEXT, lineterm=""))
+            self.dirty = True
+        return self.diffs[pair]
+
+    def delta(self, stems, base=None):
+        """Marks of the latest version in {stems} against {base} (a stem;
+        default: the version before it). Returns (base, marks, removed)."""
+        latest = stems[-1]
+        if base is None:
+            base = stems[-2] if len(stems) > 1 else None
+        if base is None or base == latest:
+            return "", tuple(Mark("", label(latest), "") for _ in self.hashes(latest)), ()
+        new, old = self.hashes(latest), self.hashes(base)
+        since = self.since(stems[:stems.index(latest) + 1])
+        used, marks = set(), []
+        for k, h in new.items():
+            if k not in old:
+                marks.append(Mark("new", since[k], ""))
+            elif old[k] != h:
+                used.add(f"{old[k]}:{h}")
+                marks.append(Mark("changed", since[k], self.diff(base, latest, k, old[k], h)))
+            else:
+                marks.append(Mark("", since[k], ""))
+        if self.diffs.keys() - used:        # keep only the diffs this delta uses
+            self.diffs = {p: d for p, d in self.diffs.items() if p in used}
+            self.dirty = True
+        return label(base), tuple(marks), tuple(k for k in old if k not in new)
+
+    def save(self):
+        if self.path is None or not self.dirty:
+            return
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"v": VERSION, "files": self.files, "diffs": self.diffs},
+                                  ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def resolve(stems, base):
+    """A --base argument (`v12`, `12`, `spec_v12`) -> its stem, or None."""
+    if base is None:
+        return None
+    want = base if base.startswith("spec_") else "spec_v" + base.lstrip("v")
+    if want not in stems:
+        raise ValueError(f"no {want}.md (have {', '.join(label(s) for s in stems)})")
+    return want
+
+
+def load(spec_dir, base=None, cache=True, where=None):
+    """The latest spec in {spec_dir} as a `Spec` marked against {base}
+    (`v12` / `spec_v12`; default the previous version), or None. The index
+    is kept in {where} (default: `rcache.source_dir(spec_dir)`)."""
+    idx = SpecIndex(spec_dir, cache, where)
+    stems = idx.refresh()
+    if not stems:
+        return None
+    latest = stems[-1]
+    base_label, marks, removed = idx.delta(stems, resolve(stems, base))
+    spec = Spec(latest, idx.sections_of(latest + ".md"), base_label, marks, removed)
+    idx.save()
+    return spec
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Index spec_v*.md sections and show what changed.")
+    ap.add_argument("spec_dir", type=pathlib.Path)
+    ap.add_argument("--base", help="compare against this version (default: the previous one)")
+    ap.add_argument("--no-cache", action="store_true", help="re-hash every version, don't touch .dashcache/")
+    args = ap.parse_args(argv)
+    idx = SpecIndex(args.spec_dir, not args.no_cache)
+    stems = idx.refresh()
+    if not stems:
+        print(f"no spec_v*.md in {args.spec_dir}", file=sys.stderr)
+        return 1
+    try:
+        want = resolve(stems, args.base)
+    except ValueError as e:
+        ap.error(str(e))
+    base, marks, removed = idx.delta(stems, want)
+    idx.save()
+    keys = list(idx.hashes(stems[-1]))
+    print(f"{label(stems[-1])} vs {base or '—'}: {len(stems)} versions, {idx.hashed} (re)hashed")
+    for k, mk in zip(keys, marks):
+        if mk.status:
+            print(f"  {mk.status:8s} {k}  (since {mk.since})")
+    for k in removed:
+        print(f"  removed  {k}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,44 @@
 """Sweep every downstream dashboard for the edge-case features the HTML
 prototype was never tested against. Sources REAL examples for the shakedown
 corpus. Python regex = reliable empty-vs-match semantics (no BSD-grep quirk);
-SECTION-TOGGLES presence is the positive control."""
-import re, glob, os
+SECTION-TOGGLES presence is the positive control.
 
-FILES = sorted(glob.glob("/Users/erikemilsson/Developer/*/.claude/dashboard.md"))
+Usage: python3 sweep.py [ROOT ...] [-j N] [--no-cache] [--profile] [--index] [--query TEXT [--kind KIND] [--limit N]]
+Files are scanned in a process pool; results are cached in .dashcache/sweep.json
+keyed on (path, mtime, size), so an unchanged dashboard is never re-read.
+--index brings the cross-project FTS5 index (.dashcache/sweep.db, portindex.py) up to date;
+--query does too, then searches it across all projects instead of printing the feature report.
+A project is named by its directory path (~ for $HOME), so same-named projects under
+different roots stay apart.
+--profile times find / cache / scan (one trace slice per file, per worker) / report (prof.py)."""
+import glob, os, sys, json, hashlib, pathlib, argparse, functools
+from concurrent.futures import ProcessPoolExecutor
+from multimatch import MultiMatcher
+from rcache import cache_dir
+import portindex, prof
 
-def proj(p): return p.split("/Developer/")[1].split("/")[0]
+HERE = pathlib.Path(__file__).parent
+# search roots: each is a directory holding projects (-> */.claude/dashboard.md),
+# a project directory, or a glob; override with args or SWEEP_ROOTS (os.pathsep-separated)
+DEFAULT_ROOTS = os.environ.get("SWEEP_ROOTS", "~/Developer").split(os.pathsep)
+
+def find_dashboards(roots):
+    files = set()
+    for r in roots:
+        r = os.path.expanduser(r)
+        if glob.has_magic(r) or r.endswith(".md"):
+            files.update(map(os.path.abspath, glob.glob(r)))
+        else:
+            files.update(map(os.path.abspath, glob.glob(os.path.join(r, "*", ".claude", "dashboard.md"))))
+            files.update(map(os.path.abspath, glob.glob(os.path.join(r, ".claude", "dashboard.md"))))
+    return sorted(files)
+
+HOME = os.path.expanduser("~")
+
+def proj(p):
+    """The project directory of <project>/.claude/dashboard.md {p}, with $HOME as ~."""
+    d = os.path.dirname(os.path.dirname(os.path.abspath(p)))
+    return "~" + d[len(HOME):] if d.startswith(HOME + os.sep) else d
 
 # feature -> regex. Ordered by the cleave: INTERACTION features first
 # (the ones a read-only HTML view structurally can't host), then DISPLAY-only.
@@ -39,43 +71,132 @@ FEATURES = [
   ("CONTROL",     "section_toggles",   r"SECTION TOGGLES"),   # positive control: must hit ALL
 ]
 
-data = {}
-sizes = {}
-for f in FILES:
-    txt = open(f, encoding="utf-8").read()
-    data[proj(f)] = txt
-    sizes[proj(f)] = (txt.count("\n")+1, len(txt))
-
-projects = list(data.keys())
-print(f"{len(projects)} dashboards:")
-for p in projects:
-    print(f"   {p:34s} {sizes[p][0]:>4} lines  {sizes[p][1]:>7} chars")
-print()
-
-def first_example(rx, txt):
-    for i, line in enumerate(txt.splitlines(), 1):
-        if re.search(rx, line):
-            return i, line.strip()[:96]
-    return None
-
-print("FEATURE PRESENCE  (cleave | feature : projects that have it)\n" + "="*72)
-last_cleave = None
-for cleave, name, rx in FEATURES:
-    if cleave != last_cleave:
-        print(f"\n--- {cleave} " + "-"*(68-len(cleave)))
-        last_cleave = cleave
-    hits = []
-    for p in projects:
-        c = len(re.findall(rx, data[p]))
-        if c: hits.append(f"{p}({c})")
-    mark = "✓" if hits else "·"
-    print(f"{mark} {name:20s} {len(hits):>2}/{len(projects)}  {', '.join(hits) if hits else '— none —'}")
-
-print("\n\nREAL EXAMPLE LINES  (one per feature, sourced for the corpus)\n" + "="*72)
-for cleave, name, rx in FEATURES:
-    if name == "section_toggles": continue
-    for p in projects:
-        ex = first_example(rx, data[p])
-        if ex:
-            print(f"[{name}] {p}:{ex[0]}\n    {ex[1]}")
-            break
+FEATURES_SIG = hashlib.blake2b(repr(FEATURES).encode(), digest_size=8).hexdigest()
+
+MATCHER = MultiMatcher([(name, rx) for _, name, rx in FEATURES])
+
+def scan(path):
+    """(lines, chars, {feature: [count, first line no, first line]}) for one dashboard."""
+    with open(path, encoding="utf-8") as f:
+        txt = f.read()
+    hits = {name: [h.count, h.lineno, h.line.strip()[:96]]
+            for name, h in MATCHER.scan(txt).items()}
+    return [txt.count("\n")+1, len(txt), hits]
+
+# ---- persistent results cache: path -> (mtime_ns, size, scan result) --------------
+def load_cache(path):
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data["files"] if data.get("features") == FEATURES_SIG else {}
+
+def save_cache(path, files):
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"features": FEATURES_SIG, "files": files}), encoding="utf-8")
+    os.replace(tmp, path)
+
+def sweep(files, jobs=None, cache_path=None):
+    """Scan every file, re-reading only those whose (mtime, size) changed.
+    Returns ({path: result}, n_scanned). Stale files fan out over a process pool."""
+    cache = load_cache(cache_path) if cache_path else {}
+    out, stale = {}, []
+    for f in files:
+        st = os.stat(f)
+        hit = cache.get(f)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            out[f] = hit[2]
+        else:
+            stale.append((f, st.st_mtime_ns, st.st_size))
+    if stale:
+        paths = [f for f, _, _ in stale]
+        p = prof.ACTIVE
+        fn = functools.partial(prof.timed_call, scan) if p else scan
+        if jobs == 1 or len(paths) == 1:
+            results = list(map(fn, paths))
+        else:
+            workers = jobs or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(fn, paths, chunksize=len(paths) // (4 * workers) + 1))
+        if p:   # per-file stages, timed inside the workers
+            for f, (res, (t0, t1, pid)) in zip(paths, results):
+                p.record("scan", t0, t1, pid, {"file": proj(f), "chars": res[1]})
+            results = [res for res, _ in results]
+        for (f, mt, sz), res in zip(stale, results):
+            out[f] = res
+            cache[f] = [mt, sz, res]
+    if cache_path:
+        save_cache(cache_path, {f: cache[f] for f in files})
+    return out, len(stale)
+
+def report(results):
+    """Feature presence and example lines for {results} ({path: scan result}),
+    keyed by path so projects with the same name under different roots stay apart."""
+    files = list(results)
+    print(f"{len(files)} dashboards:")
+    for f in files:
+        print(f"   {proj(f):34s} {results[f][0]:>4} lines  {results[f][1]:>7} chars")
+    print()
+
+    print("FEATURE PRESENCE  (cleave | feature : projects that have it)\n" + "="*72)
+    last_cleave = None
+    for cleave, name, rx in FEATURES:
+        if cleave != last_cleave:
+            print(f"\n--- {cleave} " + "-"*(68-len(cleave)))
+            last_cleave = cleave
+        hits = [f"{proj(f)}({results[f][2][name][0]})" for f in files if name in results[f][2]]
+        mark = "✓" if hits else "·"
+        print(f"{mark} {name:20s} {len(hits):>2}/{len(files)}  {', '.join(hits) if hits else '— none —'}")
+
+    print("\n\nREAL EXAMPLE LINES  (one per feature, sourced for the corpus)\n" + "="*72)
+    for cleave, name, rx in FEATURES:
+        if name == "section_toggles": continue
+        for f in files:
+            ex = results[f][2].get(name)
+            if ex:
+                print(f"[{name}] {proj(f)}:{ex[1]}\n    {ex[2]}")
+                break
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sweep downstream dashboards for edge-case features.")
+    ap.add_argument("roots", nargs="*", default=DEFAULT_ROOTS,
+                    help="dirs holding projects, project dirs, or dashboard globs (default: $SWEEP_ROOTS or ~/Developer)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores; 1 = serial)")
+    ap.add_argument("--no-cache", action="store_true", help="re-read every dashboard, don't touch the cache")
+    ap.add_argument("--index", action="store_true", help="bring the cross-project search index up to date "
+                    "(implied by --query)")
+    ap.add_argument("--query", metavar="TEXT", help="full-text search tasks / decisions / criteria / action items "
+                    "of every project (FTS5 syntax: \"phrase\", prefix*, OR, title:word)")
+    ap.add_argument("--kind", choices=portindex.KINDS, help="--query only this kind of record")
+    ap.add_argument("--limit", type=int, default=portindex.LIMIT, help="--query hits listed (default %(default)s)")
+    ap.add_argument("--profile", nargs="?", const="time", choices=prof.MODES,
+                    help="time each stage and file; prints a summary and writes a Chrome trace to .dashcache/")
+    args = ap.parse_args(argv)
+    if args.profile:
+        prof.start(args.profile)
+    with prof.stage("find"):
+        files = find_dashboards(args.roots)
+    cache_path = None if args.no_cache else cache_dir(HERE) / "sweep.json"
+    ist = None
+    if args.index or args.query:
+        with prof.stage("index", files=len(files)):
+            con = portindex.connect(None if args.no_cache else cache_dir(HERE) / "sweep.db")
+            ist = portindex.update(con, files, proj, args.jobs,
+                                   None if args.no_cache else cache_dir(HERE) / "ir")
+    if args.query:
+        with prof.stage("query"):
+            portindex.print_hits(*portindex.query(con, args.query, args.kind, args.limit))
+    else:
+        with prof.stage("sweep", files=len(files)):
+            results, scanned = sweep(files, args.jobs, cache_path)
+        with prof.stage("report"):
+            report(results)
+        print(f"\n({scanned} scanned, {len(files)-scanned} from cache)", file=sys.stderr)
+    if ist:
+        print(f"(index: {ist['indexed']} parsed, {ist['digest']} touched but unchanged, {ist['stat']} untouched, "
+              f"{ist['removed']} dropped · {ist['items']} items)", file=sys.stderr)
+    if args.profile:
+        print(prof.finish(cache_dir(HERE) / "sweep.trace.json"), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
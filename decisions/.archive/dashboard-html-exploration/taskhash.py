@@ -0,0 +1,328 @@
+"""
+Incremental task_hash: a persistent Merkle tree over the active tasks.
+
+META `task_hash` is one sha256 over the sorted `id:status:difficulty:owner`
+rows of every active task (taskjson.task_hash, dashboard-render.py
+`--task-hash`). Recomputing it means reading and sorting every task, and a
+mismatch says only "stale". `TaskTree` keeps the same rows as the leaves of a
+three-level tree
+
+    root ── phase ── id bucket (numeric id // BUCKET) ── task row
+
+so a change to one task rehashes one bucket, its phase and the root, and
+comparing two trees descends only into the subtrees whose hashes differ:
+`diverged()` names the exact phases and task ids.
+
+The tree root is NOT the META hash — that stays the canonical flat sha256,
+byte-compatible with dashboard-render.py. `canonical()` hashes it from the
+leaf rows, which the tree keeps in sorted order (no task re-reading, no
+sort), and memoises it per root: while the root is unchanged it is a lookup.
+
+Leaves are keyed by task id, so two active task files sharing an id cannot
+both be leaves. `TreeStore.update` then falls back to the flat
+taskjson.task_hash, drops the tree (the next clean run rebuilds it) and
+names the ids in `duplicates`.
+
+The tree persists as `taskhash.json` beside the project's task record cache
+(taskjson.cache_file), with a few snapshots of the
+trees that produced earlier canonical hashes, so a stale dashboard's META
+`task_hash` can be matched back to the tree it was rendered from.
+
+Usage: python3 taskhash.py CLAUDE_DIR [--dashboard dashboard.md] [--no-cache]
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import pathlib
+import sys
+
+VERSION = 1
+BUCKET = 64          # task ids per bucket
+SNAPSHOTS = 4        # earlier trees kept, keyed by their canonical hash
+LEAF = 16            # hex digits of a leaf hash kept in a snapshot
+
+
+def _h(*parts):
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def bucket(tid):
+    """Bucket key for a task id: numeric ids group by range, others by hash."""
+    digits = "".join(c for c in tid if c.isdigit())
+    return f"{int(digits) // BUCKET:x}" if digits else "~" + _h(tid)[:2]
+
+
+def duplicates(tasks):
+    """Sorted ids shared by more than one active task of {tasks}."""
+    seen, dup = set(), set()
+    for t in tasks:
+        if not t.archived:
+            (dup if t.id in seen else seen).add(t.id)
+    return sorted(dup)
+
+
+def row(t):
+    """The canonical `id:status:difficulty:owner` row of a TaskRec."""
+    return f"{t.id}:{t.status}:{t.diff}:{t.owner}"
+
+
+class TaskTree:
+    """Merkle tree over task rows: root -> phase -> id bucket -> leaf.
+
+    Node hashes are recomputed lazily: `set`/`remove` mark a bucket dirty,
+    `root()` rehashes dirty buckets, then their phases, then the root."""
+
+    def __init__(self):
+        self.leaves = {}        # id -> (phase, row)
+        self.rows = []          # sorted rows, for canonical()
+        self.members = {}       # phase -> bucket -> {id}
+        self.bhash = {}         # phase -> bucket -> hash
+        self.phash = {}         # phase -> hash
+        self.dirty = set()      # (phase, bucket)
+        self.memo = {}          # root -> canonical hash
+        self._root = _h()
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        tree = cls()
+        tree.update(tasks)
+        return tree
+
+    def set(self, tid, phase, r):
+        old = self.leaves.get(tid)
+        if old == (phase, r):
+            return False
+        if old:
+            self.remove(tid)
+        self.leaves[tid] = (phase, r)
+        bisect.insort(self.rows, r)
+        b = bucket(tid)
+        self.members.setdefault(phase, {}).setdefault(b, set()).add(tid)
+        self.dirty.add((phase, b))
+        return True
+
+    def remove(self, tid):
+        phase, r = self.leaves.pop(tid)
+        del self.rows[bisect.bisect_left(self.rows, r)]
+        b = bucket(tid)
+        self.members[phase][b].discard(tid)
+        self.dirty.add((phase, b))
+
+    def update(self, tasks):
+        """Bring the leaves in line with {tasks} (TaskRec; archived ones are
+        ignored, as in the canonical hash). Returns the changed task ids."""
+        cur = {t.id: (t.phase, row(t)) for t in tasks if not t.archived}
+        if cur == self.leaves:
+            return []
+        gone = self.leaves.keys() - cur.keys()
+        for tid in gone:
+            self.remove(tid)
+        changed = [tid for tid, (phase, r) in cur.items() if self.set(tid, phase, r)]
+        return changed + sorted(gone)
+
+    def apply(self, changed, removed=()):
+        """Incremental `update`: only the task records decoded since the last
+        run ({changed}) and those whose files went away ({removed}). Each one
+        costs a leaf insert plus one dirty bucket. Returns the changed ids."""
+        ids = []
+        for t in removed:
+            if not t.archived and t.id in self.leaves:
+                self.remove(t.id)
+                ids.append(t.id)
+        for t in changed:
+            if not t.archived and self.set(t.id, t.phase, row(t)):
+                ids.append(t.id)
+        return ids
+
+    def root(self):
+        if not self.dirty:
+            return self._root
+        phases = set()
+        for phase, b in self.dirty:
+            ids = self.members.get(phase, {}).get(b)
+            if ids:
+                self.bhash.setdefault(phase, {})[b] = _h(
+                    *(f"{tid}:{_h(self.leaves[tid][1])}" for tid in sorted(ids)))
+            else:
+                self.members.get(phase, {}).pop(b, None)
+                self.bhash.get(phase, {}).pop(b, None)
+            phases.add(phase)
+        for phase in phases:
+            buckets = self.bhash.get(phase)
+            if buckets:
+                self.phash[phase] = _h(*(f"{b}:{buckets[b]}" for b in sorted(buckets)))
+            else:
+                self.members.pop(phase, None)
+                self.bhash.pop(phase, None)
+                self.phash.pop(phase, None)
+        self.dirty.clear()
+        self._root = _h(*(f"{p}:{self.phash[p]}" for p in sorted(self.phash)))
+        return self._root
+
+    def canonical(self):
+        """META task_hash: sha256 over the sorted rows, newline-joined with a
+        trailing newline (taskjson.task_hash / dashboard-render.py)."""
+        root = self.root()
+        if root not in self.memo:
+            text = "\n".join(self.rows) + "\n"
+            self.memo = {root: "sha256:" + hashlib.sha256(text.encode("utf-8")).hexdigest()}
+        return self.memo[root]
+
+    def snapshot(self):
+        """The node hashes, rows reduced to leaf hashes: enough to diff against."""
+        root = self.root()
+        return {"root": root, "phases": dict(self.phash), "buckets": {
+            ph: {b: [h, {tid: _h(self.leaves[tid][1])[:LEAF] for tid in self.members[ph][b]}]
+                 for b, h in bs.items()} for ph, bs in self.bhash.items()}}
+
+    def diverged(self, snap):
+        """[(phase, [task ids])] that differ between this tree and {snap} (a
+        `snapshot()`), descending only into subtrees whose hashes differ."""
+        if self.root() == snap["root"]:
+            return []
+        out = []
+        for phase in sorted(set(self.phash) | set(snap["phases"])):
+            if self.phash.get(phase) == snap["phases"].get(phase):
+                continue
+            mine, theirs = self.bhash.get(phase, {}), snap["buckets"].get(phase, {})
+            ids = []
+            for b in set(mine) | set(theirs):
+                if b in theirs and mine.get(b) == theirs[b][0]:
+                    continue
+                old = theirs[b][1] if b in theirs else {}
+                new = {tid: _h(self.leaves[tid][1])[:LEAF]
+                       for tid in self.members.get(phase, {}).get(b, ())}
+                ids += [tid for tid in set(old) | set(new) if old.get(tid) != new.get(tid)]
+            out.append((phase, sorted(ids)))
+        return out
+
+    # ---- persistence ---------------------------------------------------------
+
+    def to_json(self):
+        self.root()
+        return {"leaves": self.leaves, "root": self._root, "phases": self.phash,
+                "buckets": self.bhash, "memo": self.memo}
+
+    @classmethod
+    def from_json(cls, data):
+        """Rebuild from `to_json()` without rehashing: node hashes are restored."""
+        tree = cls()
+        tree.leaves = {tid: tuple(v) for tid, v in data["leaves"].items()}
+        tree.rows = sorted(r for _, r in tree.leaves.values())
+        for tid, (phase, _) in tree.leaves.items():
+            tree.members.setdefault(phase, {}).setdefault(bucket(tid), set()).add(tid)
+        tree.bhash, tree.phash = data["buckets"], data["phases"]
+        tree._root, tree.memo = data["root"], data.get("memo", {})
+        return tree
+
+
+class TreeStore:
+    """`taskhash.json`: the current tree + snapshots of the trees
+    behind the last few canonical hashes."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.tree, self.snaps = TaskTree(), {}
+        self.duplicates = []
+        if path is None:
+            return
+        try:
+            data = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("v") == VERSION:
+            self.tree = TaskTree.from_json(data["tree"])
+            self.snaps = data.get("snapshots", {})
+
+    def update(self, tasks, delta=None):
+        """Update the tree from {tasks} — or, when {delta} = (changed, removed)
+        records are given and the stored tree accounts for the rest, from just
+        those. Returns (canonical hash, changed ids). With duplicate active
+        ids the hash is the flat one and every duplicate id counts as changed."""
+        from taskjson import task_hash
+
+        self.duplicates = duplicates(tasks)
+        if self.duplicates:
+            self.tree = TaskTree()
+            return task_hash(tasks), list(self.duplicates)
+        changed = self.tree.apply(*delta) if delta and self.tree.leaves else None
+        if changed is None or len(self.tree.leaves) != sum(not t.archived for t in tasks):
+            changed = self.tree.update(tasks)
+        canon = self.tree.canonical()
+        if canon not in self.snaps:
+            self.snaps[canon] = self.tree.snapshot()
+            while len(self.snaps) > SNAPSHOTS:
+                del self.snaps[next(iter(self.snaps))]
+        return canon, changed
+
+    def diverged(self, task_hash):
+        """Subtrees changed since the tree whose canonical hash is {task_hash};
+        None when that tree is no longer on record."""
+        snap = self.snaps.get(task_hash)
+        return None if snap is None else self.tree.diverged(snap)
+
+    def save(self, changed=True):
+        if self.path is None or not changed:
+            return
+        tmp = pathlib.Path(self.path).with_suffix(".tmp")
+        tmp.write_text(json.dumps({"v": VERSION, "tree": self.tree.to_json(),
+                                   "snapshots": self.snaps},
+                                  ensure_ascii=False, separators=(",", ":")),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def describe(diverged, limit=8):
+    """One line per diverged phase: `Phase 12: T1203, T1210 (+3 more)`."""
+    lines = []
+    for phase, ids in diverged:
+        more = f" (+{len(ids) - limit} more)" if len(ids) > limit else ""
+        lines.append(f"{'Phase ' + phase if phase else 'Unphased'}: "
+                     f"{', '.join(ids[:limit])}{more}")
+    return lines
+
+
+def main(argv=None):
+    from mdscan import scan_meta
+    from taskjson import cache_file, load
+
+    ap = argparse.ArgumentParser(description="Canonical task_hash for a .claude/ "
+                                 "directory, kept incrementally as a Merkle tree.")
+    ap.add_argument("claude_dir", type=pathlib.Path)
+    ap.add_argument("--dashboard", type=pathlib.Path,
+                    help="check this dashboard's META task_hash; exit 1 when stale")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="rebuild the tree from scratch, don't touch .dashcache/")
+    args = ap.parse_args(argv)
+    cpath = None if args.no_cache else cache_file(args.claude_dir)
+    tasks, _, st = load(args.claude_dir, cache_path=cpath)
+    store = TreeStore(cpath and cpath.with_name("taskhash.json"))
+    known = set(store.snaps)
+    canon, changed = store.update(tasks, (st["changed"], st["removed"]))
+    store.save(bool(changed) or canon not in known)
+    print(canon)
+    if store.duplicates:
+        print(f"duplicate task ids {', '.join(store.duplicates)}: flat hash, no tree",
+              file=sys.stderr)
+    else:
+        print(f"merkle root {store.tree.root()[:16]}…, {len(store.tree.leaves)} tasks, "
+              f"{len(changed)} changed since last run", file=sys.stderr)
+    if args.dashboard:
+        meta = scan_meta(args.dashboard).get("task_hash", "")
+        if meta == canon:
+            print("dashboard: fresh", file=sys.stderr)
+            return 0
+        div = store.diverged(meta)
+        print(f"dashboard: STALE (task_hash {meta[:23]}…)", file=sys.stderr)
+        for line in (describe(div) if div is not None
+                     else ["no tree on record for that hash; full regen"]):
+            print("  " + line, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Task-JSON ingestion: the dashboard model straight from `.claude/`.
+
+build.py / viz.py get tasks back out of the *rendered* Markdown by scraping
+the `## Tasks` tables — a renderer-of-a-renderer that FINDINGS.md flags as the
+wrong source of truth. This module reads the state of record instead, the way
+`.claude/scripts/dashboard-render.py` does:
+
+    .claude/tasks/task-*.json               active tasks
+    .claude/tasks/archive/task-*.json       archived tasks (phase counts only)
+    .claude/support/decisions/decision-*.md decision records (front matter +
+                                            the checked `- [x]` option)
+
+and folds them into the same `model.Dashboard` the emitters take. Phase,
+task-group, status-count, decision and META task fields come from the JSON;
+sections that only exist in the Markdown (criteria, timeline, mermaid, notes,
+Action Required, …) are carried over from a parsed dashboard when one is
+given.
+
+Files are decoded on a thread pool, and the decoded records are cached per
+`.claude/` directory (`cache_file()`) keyed by (path, mtime, size) — on a regen only the tasks that
+changed since the last run are read and decoded again.
+
+Counting follows dashboard-render.py: archived Finished tasks count into a
+phase's done/total, Absorbed tasks never count, archived tasks in any other
+status are left out and surfaced as "(+N archived non-finished)"; a phase's
+name is the most common one across active + archived tasks; no phase is
+"Unphased". `task_hash` is the canonical sha256 over the sorted
+`id:status:difficulty:owner` rows of the active tasks.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from model import Dashboard, Decision, Phase, Task, TaskGroup
+from rcache import source_dir
+from taskhash import TreeStore, describe
+
+VERSION = 1
+STATUS_ORDER = ("Finished", "In Progress", "Awaiting Verification", "Pending",
+                "Blocked", "On Hold", "Broken Down", "Absorbed")
+DECIDED = {"approved": "Decided", "implemented": "Decided", "decided": "Decided",
+           "superseded": "Superseded", "partially_superseded": "Partially Superseded"}
+FRONT = re.compile(r"\A---\n(.*?)\n---\n", re.S)
+FIELD = re.compile(r"^([a-z_]+):[ \t]*(.*)$", re.M)
+CHECKED = re.compile(r"^- \[x\] (.+)$", re.M)
+
+
+class TaskRec(NamedTuple):
+    id: str
+    title: str
+    status: str
+    diff: str
+    owner: str
+    deps: tuple         # task ids, then decision ids
+    phase: str          # "46" / "" when unphased
+    phase_name: str
+    archived: bool
+
+
+def _task(path, archived):
+    """Decoded record (a JSON-able list, see TaskRec) for one task file."""
+    with open(path, encoding="utf-8") as f:
+        t = json.load(f)
+    phase = t.get("phase")
+    name = t.get("phase_name") or ""
+    if isinstance(phase, str) and "—" in phase:      # "Phase 46 — Personal Style Rules"
+        phase, name = (s.strip() for s in phase.split("—", 1))
+    phase = "" if phase in (None, "", "None") else str(phase).replace("Phase ", "").strip()
+    deps = [str(d) for d in t.get("dependencies") or []]
+    deps += [str(d) for d in t.get("decision_dependencies") or [] if str(d) not in deps]
+    return [str(t.get("id", "")), t.get("title", ""), t.get("status", ""),
+            str(t.get("difficulty", "")), t.get("owner", ""), deps, phase, name,
+            archived]
+
+
+def _decision(path):
+    """Decoded record ([id, title, status, selected, file name]) for one decision."""
+    text = pathlib.Path(path).read_text(encoding="utf-8")
+    m = FRONT.match(text)
+    front = dict(FIELD.findall(m.group(1))) if m else {}
+    sel = CHECKED.search(text)
+    status = front.get("status", "").strip().lower()
+    return [front.get("id", "").strip(), front.get("title", "").strip(),
+            DECIDED.get(status, status.replace("_", " ").title() or "Pending"),
+            sel.group(1).strip() if sel else "", os.path.basename(path)]
+
+
+class JsonCache:
+    """Decoded records keyed by path, valid while (mtime_ns, size) match."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.fresh = []                             # records decoded this run
+        if path is None:
+            return
+        try:
+            data = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("v") == VERSION:
+            self.entries = data.get("files", {})
+
+    def load(self, jobs, kind, files):
+        """Records for {files} [(path, stat, *args)], decoding only the stale ones
+        with {kind}(path, *args) on a thread pool. Returns (records, n_decoded)."""
+        out, stale = {}, []
+        for path, st, *args in files:
+            hit = self.entries.get(path)
+            if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                out[path] = hit[2]
+            else:
+                stale.append((path, st, args))
+        if stale:
+            def decode(item):
+                path, _, args = item
+                try:
+                    return kind(path, *args)
+                except (OSError, ValueError, AttributeError):
+                    return None                     # unreadable: skipped, retried next run
+            if jobs == 1 or len(stale) == 1:
+                results = list(map(decode, stale))
+            else:
+                with ThreadPoolExecutor(max_workers=jobs) as pool:
+                    results = list(pool.map(decode, stale))
+            for (path, st, _), rec in zip(stale, results):
+                if rec is not None:
+                    out[path] = rec
+                    self.entries[path] = [st.st_mtime_ns, st.st_size, rec]
+                    self.fresh.append(rec)
+                    self.dirty = True
+        return [out[p] for p, *_ in files if p in out], len(stale)
+
+    def dropped(self, keep):
+        """Cached records whose files are no longer among {keep} (a set)."""
+        return [e[2] for p, e in self.entries.items() if p not in keep]
+
+    def save(self, keep):
+        """Persist the entries for {keep} (paths); a no-op when nothing changed."""
+        if self.path is None or (not self.dirty and len(keep) == len(self.entries)):
+            return
+        tmp = pathlib.Path(self.path).with_suffix(".tmp")
+        tmp.write_text(json.dumps({"v": VERSION, "files": {p: self.entries[p] for p in keep
+                                                           if p in self.entries}},
+                                  ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def cache_file(claude_dir):
+    """The record cache for {claude_dir}: `tasks.json` in this tool's cache
+    directory for it (rcache.source_dir), so each project keeps its own."""
+    return source_dir(claude_dir) / "tasks.json"
+
+
+def _listing(directory, prefix, suffix):
+    """[(path, stat)] for the {prefix}*{suffix} files in {directory}, sorted."""
+    try:
+        with os.scandir(directory) as it:
+            found = [(e.path, e.stat()) for e in it if e.name.startswith(prefix)
+                     and e.name.endswith(suffix) and e.is_file()]
+    except FileNotFoundError:
+        return []
+    return sorted(found)
+
+
+def load(claude_dir, jobs=None, cache_path=None):
+    """(tasks, decisions, stats) read from a project's `.claude/` directory.
+
+    tasks are TaskRec (active, then archived), decisions are model.Decision;
+    stats = {"files": n, "decoded": n, "changed": [...], "removed": [...]}:
+    counts for the caller's report, and the task records decoded this run /
+    cached for files that have since gone (for taskhash's incremental tree)."""
+    claude_dir = pathlib.Path(claude_dir)
+    tasks_dir = claude_dir / "tasks"
+    cache = JsonCache(cache_path)
+    active = [(p, st, False) for p, st in _listing(tasks_dir, "task-", ".json")]
+    archived = [(p, st, True) for p, st in _listing(tasks_dir / "archive", "task-", ".json")]
+    decs = _listing(claude_dir / "support" / "decisions", "decision-", ".md")
+    jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+    trecs, n1 = cache.load(jobs, _task, active + archived)
+    drecs, n2 = cache.load(jobs, _decision, decs)
+    keep = {p for p, *_ in active + archived + decs}
+    removed = [r for r in cache.dropped(keep) if len(r) == len(TaskRec._fields)]
+    cache.save(keep)
+    tasks = [_rec(r) for r in trecs]
+    decisions = [Decision(i, t, s, sel, f"support/decisions/{f}" if f else "")
+                 for i, t, s, sel, f in sorted(drecs, key=lambda r: _num(r[0]))]
+    return tasks, decisions, {"files": len(active) + len(archived) + len(decs),
+                              "decoded": n1 + n2,
+                              "changed": [_rec(r) for r in cache.fresh
+                                          if len(r) == len(TaskRec._fields)],
+                              "removed": [_rec(r) for r in removed]}
+
+
+def _rec(r):
+    i, ti, s, d, o, dp, ph, pn, a = r
+    return TaskRec(i, ti, s, d, o, tuple(dp), ph, pn, a)
+
+
+def watch_dirs(claude_dir):
+    """The directories `load()` reads, for serve.Watcher."""
+    claude_dir = pathlib.Path(claude_dir)
+    return [claude_dir / "tasks", claude_dir / "tasks" / "archive",
+            claude_dir / "support" / "decisions"]
+
+
+def _num(s):
+    m = re.search(r"\d+", s)
+    return (int(m.group()) if m else 1 << 30, s)
+
+
+def task_hash(tasks):
+    """Canonical META task_hash over the active tasks."""
+    rows = sorted(f"{t.id}:{t.status}:{t.diff}:{t.owner}" for t in tasks if not t.archived)
+    return "sha256:" + hashlib.sha256(("\n".join(rows) + "\n").encode("utf-8")).hexdigest()
+
+
+def _phase_status(done, total, live, met):
+    """Phase table status; {met} = ids of finished tasks and decided decisions."""
+    if done >= total:
+        return "Complete"
+    if any(t.status in ("In Progress", "Awaiting Verification") for t in live):
+        return "Active"
+    eligible = [t.id for t in live
+                if t.status == "Pending" and all(d in met for d in t.deps)]
+    if eligible:
+        return f"Partially Actionable ({len(eligible)} eligible: {', '.join(eligible)})"
+    if live and all(t.status in ("Pending", "Blocked") for t in live):
+        return "Blocked (awaiting prior phase)"
+    return "Active"
+
+
+def build_model(tasks, decisions, base=None, thash=None):
+    """A `model.Dashboard` from task records + decisions; Markdown-only
+    sections (and any META not derivable from JSON) come from {base}.
+    {thash} is the precomputed task_hash (taskhash.TreeStore), if any."""
+    met = {t.id for t in tasks if t.status == "Finished"}
+    met.update(d.id for d in decisions if d.status == "Decided")
+    names, groups = {}, {}
+    for t in tasks:
+        names.setdefault(t.phase, Counter())
+        if t.phase_name:
+            names[t.phase][t.phase_name] += 1
+        groups.setdefault(t.phase, []).append(t)
+    phases, task_groups = [], []
+    for ph in sorted(groups, key=lambda p: (p == "", _num(p))):
+        vote = names[ph].most_common()
+        name = min(n for n, c in vote if c == vote[0][1]) if vote else ""
+        label = "Unphased" if not ph else f"Phase {ph}" + (f" — {name}" if name else "")
+        rows = [t for t in groups[ph] if t.status != "Absorbed"]
+        counted = [t for t in rows if not t.archived or t.status == "Finished"]
+        hidden = len(rows) - len(counted)
+        done = sum(t.status == "Finished" for t in counted)
+        live = [t for t in counted if t.status != "Finished"]
+        phases.append(Phase(label, ph or "Unphased", done, len(counted),
+                            _phase_status(done, len(counted), live, met)))
+        task_groups.append(TaskGroup(
+            label, done, f" (+{hidden} archived non-finished)" if hidden else "",
+            tuple(Task(t.id, t.title, t.status, t.diff, t.owner,
+                       ", ".join(t.deps) or "—") for t in live)))
+
+    active = [t for t in tasks if not t.archived]
+    counts = Counter(t.status for t in active)
+    order = [s for s in STATUS_ORDER if counts[s]] + sorted(s for s in counts if s not in STATUS_ORDER)
+    done = sum(p.done for p in phases)
+    total = sum(p.total for p in phases)
+    sup = sum(d.status == "Superseded" for d in decisions)
+    part = sum(d.status == "Partially Superseded" for d in decisions)
+    meta = dict(base.meta) if base else {
+        "generated": "", "spec_version": "?", "template_version": "?",
+        "verification_debt": "0", "drift_deferrals": "0"}
+    meta.update(task_count=str(len(active)), task_hash=thash or task_hash(tasks),
+                decision_count=str(len(decisions)),
+                decisions_approved=str(sum(d.status == "Decided" for d in decisions)),
+                decisions_superseded=str(sup), decisions_partially_superseded=str(part))
+
+    def carry(field, empty=()):
+        return getattr(base, field) if base else empty
+    return Dashboard(
+        meta=meta,
+        name=carry("name", ""), phase_label=carry("phase_label", ""),
+        started=carry("started", ""),
+        complete=round(100 * done / total) if total else 0,
+        status_counts=tuple((s, counts[s]) for s in order),
+        phases=tuple(phases),
+        criteria=carry("criteria"), criteria_summary=carry("criteria_summary", "0 criteria"),
+        recent=carry("recent"),
+        task_groups=tuple(task_groups),
+        decisions=tuple(decisions),
+        your_tasks=carry("your_tasks"), timeline=carry("timeline"),
+        mermaid=carry("mermaid", ""), action=carry("action"), notes=carry("notes"),
+    )
+
+
+def load_dashboard(claude_dir, base=None, jobs=None, cache_path=None):
+    """`build_model(*load(...))`: the Dashboard for a `.claude/` directory.
+    Returns (dashboard, stats); with a cache, task_hash comes from the
+    incremental Merkle tree beside it, and when {base}'s META task_hash is
+    stale stats["diverged"] names the phases / tasks that changed since.
+    stats["duplicates"] lists task ids shared by several active files."""
+    tasks, decisions, stats = load(claude_dir, jobs, cache_path)
+    store = TreeStore(cache_path and pathlib.Path(cache_path).with_name("taskhash.json"))
+    known = set(store.snaps)
+    thash, changed = store.update(tasks, (stats["changed"], stats["removed"]))
+    store.save(bool(changed) or thash not in known)
+    if store.duplicates:
+        stats["duplicates"] = store.duplicates
+    old = base.meta.get("task_hash", "") if base else thash
+    if old != thash:
+        div = store.diverged(old)
+        stats["diverged"] = (describe(div) if div is not None
+                             else ["(no Merkle tree on record for that hash)"])
+    return build_model(tasks, decisions, base, thash), stats
@@ -0,0 +1,59 @@
+"""
+Regression tests for mdrender.py inputs that used to hang the renderer.
+
+Each input renders in a child interpreter under a timeout, so a regression
+fails the test instead of hanging the run.
+
+Usage: python3 -m unittest test_mdrender
+"""
+
+import pathlib
+import subprocess
+import sys
+import unittest
+
+HERE = pathlib.Path(__file__).parent
+TIMEOUT = 10
+
+
+def render(md):
+    """mdrender.render({md}) in a child process; raises TimeoutExpired on a hang."""
+    code = "import sys, mdrender; sys.stdout.write(mdrender.render(sys.stdin.read()))"
+    done = subprocess.run([sys.executable, "-c", code], input=md, capture_output=True,
+                          text=True, cwd=HERE, timeout=TIMEOUT, check=True)
+    return done.stdout
+
+
+class EmptyListItem(unittest.TestCase):
+    """An empty item followed by an unindented line ends the list."""
+
+    def test_bullet(self):
+        self.assertEqual(render("-\nfoo"), "<ul>\n<li></li>\n</ul>\n<p>foo</p>\n")
+
+    def test_bullet_trailing_space(self):
+        self.assertEqual(render("* \nfoo"), "<ul>\n<li></li>\n</ul>\n<p>foo</p>\n")
+
+    def test_ordered(self):
+        self.assertEqual(render("1.\nbar"), "<ol>\n<li></li>\n</ol>\n<p>bar</p>\n")
+
+    def test_spec_section(self):
+        self.assertEqual(render("## 1. Scope\n\n-\nTBD"),
+                         "<h2>1. Scope</h2>\n<ul>\n<li></li>\n</ul>\n<p>TBD</p>\n")
+
+    def test_after_items(self):
+        self.assertEqual(render("- a\n-\n\nb"),
+                         "<ul>\n<li>a</li>\n<li></li>\n</ul>\n<p>b</p>\n")
+
+
+class Nul(unittest.TestCase):
+    """A NUL in the source cannot collide with the inline slot markers."""
+
+    def test_nul(self):
+        self.assertEqual(render("a\x00b"), "<p>a�b</p>\n")
+
+    def test_nul_with_code(self):
+        self.assertEqual(render("`x`\x000\x00"), "<p><code>x</code>�0�</p>\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
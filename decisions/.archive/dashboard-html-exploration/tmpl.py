@@ -0,0 +1,138 @@
+"""
+Compiled, streaming HTML templates for the emitters.
+
+build.py / viz.py used to assemble each page as one f-string, with the
+repeated sections built by `rows += ...` loops — quadratic in the worst case,
+and the finished document was held (then encoded, i.e. held twice) in memory
+before the write. A `Template` here compiles once into a Python generator
+function that yields the page chunk by chunk; `rcache.stream_if_changed()`
+writes those chunks through a buffered file, so the document never exists
+as one string and peak memory is about one section.
+
+Syntax (expressions are plain Python over the keyword arguments):
+
+    {{ expr }}               html-escaped str(expr)
+    {{{ expr }}}             raw: a str, or any iterable of str chunks
+                             (another template's `.stream()`, a generator)
+    {% for x in expr %} … {% end %}
+    {% if expr %} … {% elif expr %} … {% else %} … {% end %}
+
+Compiled code objects are cached in `.dashcache/tmpl-<name>.bin` (marshal,
+keyed by the template source and the interpreter's bytecode magic), so an
+emitter start-up pays for code generation only after a template changes.
+"""
+
+import hashlib
+import html
+import importlib.util
+import marshal
+import os
+import re
+
+from rcache import cache_dir
+
+VERSION = 1
+TOKEN = re.compile(r"\{\{\{(.+?)\}\}\}|\{\{(.+?)\}\}|\{%\s*(.+?)\s*%\}", re.S)
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def _raw(v):
+    if isinstance(v, str):
+        yield v
+    elif hasattr(v, "__iter__"):
+        yield from v
+    else:
+        yield str(v)
+
+
+def _esc(v):
+    return html.escape(str(v))
+
+
+def _source(text, name):
+    """Python source of the generator function `_t` for template {text}."""
+    out, depth, stack = ["def _t():"], 1, []
+    pad = lambda: "    " * depth
+    pos = 0
+    for m in TOKEN.finditer(text):
+        if m.start() > pos:
+            out.append(f"{pad()}yield {text[pos:m.start()]!r}")
+        pos = m.end()
+        raw, esc, stmt = m.groups()
+        if raw is not None:
+            out.append(f"{pad()}yield from _raw({raw.strip()})")
+        elif esc is not None:
+            out.append(f"{pad()}yield _esc({esc.strip()})")
+        else:
+            word = stmt.split(None, 1)[0]
+            if word in ("for", "if"):
+                out.append(f"{pad()}{stmt}:")
+                stack.append(word)
+                depth += 1
+            elif word in ("elif", "else"):
+                if not stack or stack[-1] != "if":
+                    raise TemplateError(f"{name}: {{% {stmt} %}} outside an if")
+                out.append(f"{'    ' * (depth - 1)}{stmt}:")
+            elif word == "end":
+                if not stack:
+                    raise TemplateError(f"{name}: unmatched {{% end %}}")
+                stack.pop()
+                out.append(f"{pad()}pass")
+                depth -= 1
+            else:
+                raise TemplateError(f"{name}: unknown tag {{% {stmt} %}}")
+    if pos < len(text):
+        out.append(f"{pad()}yield {text[pos:]!r}")
+    if stack:
+        raise TemplateError(f"{name}: unclosed {{% {stack[-1]} %}}")
+    out.append(f"{pad()}return")
+    return "\n".join(out) + "\n"
+
+
+def _compile(text, name):
+    key = hashlib.blake2b((f"{VERSION}\0{name}\0").encode("utf-8") + text.encode("utf-8")
+                          + importlib.util.MAGIC_NUMBER, digest_size=12).digest()
+    try:
+        path = cache_dir(HERE) / f"tmpl-{name}.bin"
+    except OSError:
+        path = None
+    if path is not None:
+        try:
+            data = path.read_bytes()
+            if data[:12] == key:
+                return marshal.loads(data[12:])
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+    code = compile(_source(text, name), f"<template {name}>", "exec")
+    if path is not None:
+        try:
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(key + marshal.dumps(code))
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return code
+
+
+class Template:
+    """One compiled template. `stream(**ctx)` yields str chunks, `render(**ctx)`
+    joins them (for fragments that go through the render cache)."""
+
+    __slots__ = ("name", "code")
+
+    def __init__(self, name, text):
+        self.name = name
+        self.code = _compile(text, name)
+
+    def stream(self, **ctx):
+        ns = {"_raw": _raw, "_esc": _esc, "__builtins__": __builtins__}
+        ns.update(ctx)
+        exec(self.code, ns)
+        return ns["_t"]()
+
+    def render(self, **ctx):
+        return "".join(self.stream(**ctx))
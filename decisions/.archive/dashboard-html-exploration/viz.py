@@ -9,79 +9,62 @@ Direction (user, 2026-06-23): one HTML file IS the dashboard (the .md can go);
 read-only (overview; act via CLI); cut bloat; lead with visualizations.
 Iteration 2 changes: drop the explanatory note + bare sparkline; Recent gets
 task descriptions; Decisions fully collapsed-by-default but openable + searchable;
-add a Flow/critical-path graph (mermaid.js, themed) + Timeline when present.
+add a Flow/critical-path graph (laid out to static SVG by flowsvg.py, themed) +
+Timeline when present.
+
+Importable: emit_v2(parse_dashboard(src), load_spec(src.parent)) -> HTML str; stream_v2() -> str chunks (tmpl.py).
 """
-import re, html, math, sys, pathlib
+import re, html, math, sys, time, pathlib
+import argparse
+from functools import lru_cache
+import assets, depgraph, history, ir, mdscan, paint, prof, serve, specindex
+from flowsvg import render as flow_svg
+from mdinline import renderer
+from mdrender import render as render_md
+from declist import MODES, WINDOW_AUTO, WINDOW_CSS, noscript, payload, window_mode
+from rcache import NOCACHE, RenderCache, cache_dir, doc_key, source_salt, stream_if_changed
+from searchidx import SEARCH_CSS, SEARCH_JS, decision_index
+from taskjson import cache_file, load_dashboard, watch_dirs
+from tmpl import Template
 HERE = pathlib.Path(__file__).parent
-SRC = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else HERE / "styler-dashboard.md"
-OUT = HERE / (sys.argv[2] if len(sys.argv) > 2 else "dashboard-v2.html")
-RAW = SRC.read_text(encoding="utf-8")
+SALT = (__file__, HERE/"searchidx.py", HERE/"declist.py", HERE/"mdrender.py", HERE/"flowsvg.py", HERE/"taskjson.py", HERE/"taskhash.py", HERE/"tmpl.py", HERE/"mdinline.py", HERE/"serve.py", HERE/"depgraph.py", HERE/"specindex.py", HERE/"paint.py", HERE/"history.py", HERE/"assets.py", HERE/"fontsub.py")   # edits here invalidate the render cache
 
 # ---- parse helpers -----------------------------------------------------------
-def sec(name):
-    parts = re.split(r"^(## .*)$", RAW, flags=re.M)
-    for i in range(1, len(parts), 2):
-        if name.lower() in parts[i].lower():
-            return parts[i+1]
-    return ""
-def subsec(block, name):
-    m = re.search(r"### .*?"+re.escape(name)+r".*?\n(.*?)(?=\n### |\n## |\Z)", block, re.S)
-    return m.group(1) if m else ""
-def rows(block):
-    out=[]
-    for ln in block.splitlines():
-        ln=ln.strip()
-        if not ln.startswith("|"): continue
-        c=[x.strip() for x in ln.strip("|").split("|")]
-        if set("".join(c))<=set("-: "): continue
-        out.append(c)
-    return out[1:] if out else []
-def mdi(s):
-    s=html.escape(s)
-    s=re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r'<a href="\2" target="_blank">\1</a>', s)
-    s=re.sub(r"\*\*([^*]+)\*\*", r"<strong>\1</strong>", s)
-    s=re.sub(r"`([^`]+)`", r"<code>\1</code>", s)
-    return s
-
-meta=dict(re.findall(r"^([a-z_]+):\s*(.*)$", re.search(r"<!-- DASHBOARD META(.*?)-->",RAW,re.S).group(1), re.M))
-pname=re.search(r"^\*\*(.+?)\*\*\s*·", RAW, re.M).group(1)
-complete=int(re.search(r"\*\*(\d+)% complete", RAW).group(1))
-prog=sec("Progress")
-status=[(m[0],int(m[1])) for m in re.findall(r"^\| (Finished|Pending|In Progress|Blocked|On Hold|Absorbed) \| (\d+) \|", prog, re.M)]
-phases=[{"name":m.group(1),"n":m.group(1).split("—")[0].strip().replace("Phase ",""),
-         "done":int(m.group(2)),"total":int(m.group(3)),"status":m.group(4)}
-        for m in re.finditer(r"^\| (Phase .*?|Unphased) \| (\d+) \| (\d+) \| (.*?) \|$", prog, re.M)]
-recent=re.findall(r"^- \*\*(\d{4}-\d\d-\d\d)\*\* — (?:Task (\d+) — )?(?:Finished: )?(.*?)$", prog, re.M)
-your_tasks=re.findall(r"^- \*\*(T?\d+)\*\* — (.*?)$", sec("Action Required"), re.M)
-# full decisions
-decisions=[]
-for c in rows(sec("Decisions")):
-    if len(c)<4: continue
-    lm=re.match(r"\[(.*)\]\((.*)\)$", c[3], re.S)
-    decisions.append({"id":c[0],"title":c[1],"status":c[2],
-                      "sel":lm.group(1) if lm else c[3],"link":lm.group(2) if lm else ""})
-# timeline rows (Date|Item|Status|Notes)
-timeline=[c for c in rows(subsec(prog,"Timeline")) if len(c)>=3]
-# mermaid block (the dependency / project-overview graph)
-mm=re.search(r"```mermaid\n(.*?)```", RAW, re.S)
-mermaid=mm.group(1).strip() if mm else ""
-# spec (collapsible browser) — render the project's spec_v{N}.md as collapsible HTML sections
-spec_files=sorted(SRC.parent.glob("spec_v*.md"))
-spec_html=""
-if spec_files:
-    sp=spec_files[-1]; stxt=sp.read_text(encoding="utf-8")
-    sparts=re.split(r"^(## .+)$", stxt, flags=re.M)
-    secs=[(sparts[i].lstrip('# ').strip(), sparts[i]+"\n"+sparts[i+1]) for i in range(1,len(sparts),2)]
-    def esc_md(t): return re.sub(r"</(script)", r"<\\/\1", t, flags=re.I)
-    if secs:
-        spc="".join(f'<details class="spc" data-h="{html.escape(t.lower(),quote=True)}"><summary>{html.escape(t)}</summary>'
-                    f'<div class="specbody"></div><script type="text/markdown" class="src">{esc_md(raw)}</script></details>'
-                    for t,raw in secs)
-        spec_html=(f'<details class="specwrap"><summary><b>📄 Specification</b> <span class="pill">{sp.stem}</span>'
-                   f'<span class="decsum">{len(secs)} sections · rendered &amp; browsable</span><span class="open">browse ▾</span></summary>'
-                   f'<div class="decin"><div class="dtools"><input id="sq" placeholder="filter {len(secs)} spec sections…" oninput="specFilter()"></div>'
-                   f'<div class="declist speclist">{spc}</div></div></details>')
+mdi=renderer('<a href="{href}" target="_blank">{text}</a>', em=False)   # links/bold/code; one cached scan (mdinline.py)
+RECENT_TEXT=re.compile(r"^(?:Task (\d+) — )?(?:Finished: )?(.*?)$")
+def load_spec(src_dir, base=None, cache=True, where=None):
+    """Latest spec_v*.md beside the dashboard (by version number) as a specindex.Spec — sections
+    plus changed/new marks and per-section diffs against {base} (default: previous version) — or None.
+    {where}: directory for the section index (default: this tool's cache, rcache.source_dir)."""
+    return specindex.load(src_dir, base, cache, where)
+def diff_html(diff, base):
+    """A section's unified diff (specindex) as a collapsible, coloured <pre>."""
+    lines=diff.splitlines()[2:]; add=sum(1 for l in lines if l[:1]=="+"); rem=sum(1 for l in lines if l[:1]=="-")
+    cls={"+":"di","-":"dd","@":"dh"}
+    body="\n".join(f'<span class="{cls[l[:1]]}">{html.escape(l)}</span>' if l[:1] in cls else html.escape(l) for l in lines)
+    return f'<details class="sdiff" open><summary>diff vs {base} · <span class="di">+{add}</span> <span class="dd">−{rem}</span></summary><pre>{body}</pre></details>'
+def spec_block(spec, frag=NOCACHE.frag):
+    """Collapsible spec browser — each section is rendered here (mdrender, cached by content
+    hash) into an inert <template> that is cloned into the page the first time it opens.
+    Sections changed / new since the base version carry a badge, changed ones their diff."""
+    if not spec or not spec.sections: return ""
+    secs,base=spec.sections,spec.base
+    def sec(t,raw,mk):
+        badge=(f'<span class="sbdg {mk.status}">{mk.status} since {base}</span>' if mk.status else
+               f'<span class="sbdg">since {mk.since}</span>' if base else "")
+        return (f'<details class="spc" data-h="{html.escape(t.lower(),quote=True)}" data-s="{mk.status}"><summary>{html.escape(t)}{badge}</summary>'
+                f'<div class="specbody"></div><template>{diff_html(mk.diff, base) if mk.diff else ""}{render_md(raw)}</template></details>')
+    spc="".join(frag("spec",(t,raw,base,mk),lambda: sec(t,raw,mk)) for (t,raw),mk in zip(secs,spec.marks))
+    nchg=sum(mk.status=="changed" for mk in spec.marks); nnew=sum(mk.status=="new" for mk in spec.marks)
+    delta=(f' · <b>{nchg}</b> changed, <b>{nnew}</b> new'+(f', <b>{len(spec.removed)}</b> removed' if spec.removed else "")+f' since {base}') if base else ""
+    gone=(f'<div class="cap">removed since {base}: {html.escape(", ".join(spec.removed))}</div>' if spec.removed else "")
+    return (f'<details class="specwrap"><summary><b>📄 Specification</b> <span class="pill">{spec.stem}</span>'
+            f'<span class="decsum">{len(secs)} sections{delta} · rendered &amp; browsable</span><span class="open">browse ▾</span></summary>'
+            f'<div class="decin"><div class="dtools"><input id="sq" placeholder="filter {len(secs)} spec sections…" oninput="specFilter()">'
+            +('<button class="fbtn" id="schg" onclick="specChanged(this)">changed only</button>' if nchg or nnew else "")+'</div>'
+            f'{gone}<div class="declist speclist">{spc}</div></div></details>')
 
+@lru_cache(maxsize=256)
 def scls(s):
     s=s.lower()
     if "complete" in s: return "ok"
@@ -111,64 +94,17 @@ def ring(f,size=150,th=14):
             f'stroke-dasharray="{C:.1f}" stroke-dashoffset="{C*(1-f):.1f}" transform="rotate(-90 {cx} {cy})"/>'
             f'<text x="50%" y="48%" class="ringn">{int(f*100)}<tspan class="rp">%</tspan></text>'
             f'<text x="50%" y="63%" class="ringl">COMPLETE</text></svg>')
-
-# ---- build sections ----------------------------------------------------------
-cells=""
-for p in phases:
-    pct=round(100*p["done"]/p["total"]) if p["total"] else 100; lab=p["n"] if p["n"].isdigit() else "U"
-    cells+=(f'<div class="cell {scls(p["status"])}" title="Phase {p["n"]} — {html.escape(p["name"].split("—")[-1].strip())} · {p["done"]}/{p["total"]} · {html.escape(p["status"])}">'
-            f'<span class="cn">{lab}</span><span class="cbar"><i style="height:{pct}%"></i></span></div>')
-active=[p for p in phases if "Complete" not in p["status"]]
-front="".join(f'<div class="af"><div class="afh"><b>Phase {p["n"]}</b> <span class="bdg {scls(p["status"])}">{html.escape(p["status"])}</span>'
-              f'<span class="affrac">{p["done"]}/{p["total"]}</span></div><div class="afn">{html.escape(p["name"].split("—",1)[-1].strip())}</div>'
-              f'<div class="afbar"><i style="width:{round(100*p["done"]/p["total"]) if p["total"] else 100}%"></i></div></div>' for p in active)
-segs=[(s,v,status_col.get(s,"#b8ad97")) for s,v in status]
-legend="".join(f'<div class="lg"><span class="dot" style="background:{status_col.get(s,"#b8ad97")}"></span><span class="lgn">{s}</span><b>{v}</b></div>' for s,v in status)
-att="".join(f'<li><span class="tid">{tid}</span>{mdi(desc[:130])}</li>' for tid,desc in your_tasks[:6])
-done_ph=len([p for p in phases if "Complete" in p["status"]])
-
-# Recent — now WITH descriptions
-recent_rows=""
-for d,t,desc in recent[:6]:
-    desc=re.sub(r"^(?:Finished:\s*)?§?\s*[\d.]+\s*—\s*","",desc).strip()  # trim "Finished:"/"§50.2 —"
-    recent_rows+=(f'<div class="rr"><span class="rd">{d[5:]}</span>'
-                  f'{f"<span class=tid>T{t}</span>" if t else ""}<span class="rt">{html.escape(desc[:64])}</span></div>')
-
-# Decisions — collapsed by default, openable + searchable
-dec_rows=""
-for d in decisions:
-    st="superseded" if d["status"].lower()=="superseded" else "decided"
-    search=html.escape((d["id"]+" "+d["title"]+" "+d["sel"]).lower(), quote=True)
-    link=f'<a href="{html.escape(d["link"])}" target="_blank">open record →</a>' if d["link"] else ""
-    dec_rows+=(f'<details class="dec" data-status="{st}" data-search="{search}"><summary>'
-               f'<span class="did">{html.escape(d["id"])}</span><span class="dt">{html.escape(d["title"])}</span>'
-               f'<span class="bdg {scls(d["status"])}">{html.escape(d["status"])}</span></summary>'
-               f'<div class="dbody"><span class="sel">{mdi(d["sel"])}</span>{link}</div></details>')
-ndec=len(decisions); nsup=sum(1 for d in decisions if d["status"].lower()=="superseded")
-decisions_block=(f'<details class="decwrap"><summary><b>📋 Decisions</b> '
-                 f'<span class="pill">{ndec}</span><span class="decsum">{ndec-nsup} decided · {nsup} superseded</span>'
-                 f'<span class="open">browse ▾</span></summary><div class="decin">'
-                 f'<div class="dtools"><input id="dq" placeholder="search {ndec} decisions… ( / )" oninput="decFilter()">'
-                 f'<button class="fbtn on" data-f="all">all</button><button class="fbtn" data-f="decided">decided</button>'
-                 f'<button class="fbtn" data-f="superseded">superseded</button><span class="pill" id="dcount">{ndec}</span></div>'
-                 f'<div class="declist">{dec_rows}<div class="empty" id="dempty" style="display:none">no match</div></div>'
-                 f'</div></details>') if decisions else ""
-
-# Flow / critical-path graph (mermaid, themed) — only when the source has one
-flow=(f'<section><h2 class="st">Flow · dependency &amp; critical path</h2>'
-      f'<div class="flowcard"><pre class="mermaid">{html.escape(mermaid)}</pre></div>'
-      f'<div class="cap">Rendered with mermaid.js + themed — the same graph that renders flaky / not-at-all in a Markdown viewer. Owners: ❗ you · 🤖 Claude · 👥 both.</div></section>') if mermaid else ""
-
-# Timeline — only when present
-tl_rows=""
-for c in timeline:
-    date,item,st=c[0],c[1],c[2]; note=c[3] if len(c)>3 else ""
-    over="over" if ("OVERDUE" in item or "~~" in date) else ""
-    date=date.replace("~~",""); item=re.sub(r"⚠️ OVERDUE:\s*","",item)
-    tl_rows+=(f'<div class="tlr {over}"><span class="tld">{html.escape(date)}</span>'
-              f'<span class="tli">{html.escape(item)}</span><span class="bdg {scls(st)}">{html.escape(st)}</span>'
-              f'{f"<span class=tln>{html.escape(note)}</span>" if note else ""}</div>')
-timeline_block=(f'<section><h2 class="st">Timeline</h2><div class="tlcard">{tl_rows}</div></section>') if tl_rows else ""
+def spark(vals,w=168,h=40,col="var(--brand)",zero=False):
+    """Line + area sparkline of {vals} (oldest first); y from min (or 0) to max."""
+    lo=0 if zero else min(vals); span=(max(vals)-lo) or 1; dx=w/max(len(vals)-1,1)
+    pts=" ".join(f"{i*dx:.1f},{h-2-(v-lo)/span*(h-4):.1f}" for i,v in enumerate(vals))
+    return (f'<svg viewBox="0 0 {w} {h}" preserveAspectRatio="none" class="spark"><polygon points="0,{h} {pts} {w},{h}" fill="{col}" opacity=".12"/>'
+            f'<polyline points="{pts}" fill="none" stroke="{col}" stroke-width="1.6" stroke-linejoin="round" vector-effect="non-scaling-stroke"/></svg>')
+def vbars(vals,w=168,h=40,col="var(--brand2)"):
+    """Bar sparkline of non-negative {vals}."""
+    top=max(vals) or 1; bw=w/len(vals); hs=[v/top*(h-2) for v in vals]
+    return (f'<svg viewBox="0 0 {w} {h}" preserveAspectRatio="none" class="spark">'
+            +"".join(f'<rect x="{i*bw+.5:.1f}" y="{h-b:.1f}" width="{max(bw-1,.5):.1f}" height="{b:.1f}" fill="{col}"/>' for i,b in enumerate(hs) if b)+'</svg>')
 
 CSS=r"""
 *{box-sizing:border-box} html{scroll-behavior:smooth}
@@ -193,6 +129,9 @@ section{margin:28px 0}
 .lg{display:flex;align-items:center;gap:8px;font-size:12.5px} .lg b{margin-left:auto;font-family:"IBM Plex Mono",monospace} .dot{width:10px;height:10px;border-radius:3px} .lgn{color:var(--soft)}
 .pmeta{display:flex;flex-direction:column;gap:10px;justify-self:end;text-align:right} .pmeta .big{font-family:"Fraunces",serif;font-size:30px;font-weight:600;line-height:1}
 .pmeta .lbl{font-size:11px;text-transform:uppercase;letter-spacing:.05em;color:var(--soft)} .pmeta .row{display:flex;gap:18px;justify-content:flex-end}
+.trend{display:grid;grid-template-columns:repeat(auto-fill,minmax(196px,1fr));gap:12px} .tc{background:var(--card);border:1px solid var(--line);border-radius:12px;padding:11px 14px;box-shadow:var(--sh)}
+.tch{display:flex;align-items:baseline;gap:8px;font-size:11px;text-transform:uppercase;letter-spacing:.05em;color:var(--soft);margin-bottom:6px} .tch b{margin-left:auto;font-family:"IBM Plex Mono",monospace;font-size:12.5px;color:var(--ink);text-transform:none;letter-spacing:0}
+.spark{display:block;width:100%;height:40px} .tcs{font-size:11.5px;color:var(--soft);margin-top:4px}
 .grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(46px,1fr));gap:6px}
 .cell{position:relative;aspect-ratio:1;border-radius:8px;border:1px solid var(--line);background:var(--card);display:flex;align-items:center;justify-content:center;overflow:hidden;transition:transform .1s}
 .cell:hover{transform:translateY(-2px);box-shadow:var(--sh);z-index:2} .cell .cn{font-family:"IBM Plex Mono",monospace;font-size:12px;font-weight:600;z-index:2}
@@ -205,6 +144,9 @@ section{margin:28px 0}
 .glegend{display:flex;gap:16px;margin-top:12px;font-size:11.5px;color:var(--soft)} .glegend span b{display:inline-block;width:10px;height:10px;border-radius:3px;margin-right:5px}
 .front{display:grid;grid-template-columns:repeat(auto-fit,minmax(220px,1fr));gap:12px;margin-top:16px}
 .af{background:var(--card);border:1px solid var(--line);border-radius:12px;padding:13px 15px;box-shadow:var(--sh)}
+.cpath{display:flex;flex-wrap:wrap;gap:6px;align-items:center} .cpa{color:var(--soft);font-size:12px}
+.cp{background:var(--card);border:1px solid var(--line);border-radius:9px;padding:5px 9px;font-size:12px;max-width:260px;overflow:hidden;text-overflow:ellipsis;white-space:nowrap}
+.cp b{font-family:"IBM Plex Mono",monospace;color:var(--brandink);margin-right:5px} .cp.bad{border-color:#e3b6ac}
 .afh{display:flex;align-items:center;gap:8px;font-size:13px}.affrac{margin-left:auto;font-family:"IBM Plex Mono",monospace;font-size:12px;color:var(--soft)}
 .afn{font-size:12.5px;color:var(--soft);margin:6px 0 9px;min-height:2.4em}
 .afbar{height:6px;border-radius:99px;background:var(--paper-2);overflow:hidden}.afbar>i{display:block;height:100%;background:linear-gradient(90deg,var(--brand),var(--brand2))}
@@ -233,12 +175,16 @@ section{margin:28px 0}
 .dbody{padding:2px 4px 12px 78px;font-size:12.5px;color:var(--soft)} .sel{display:block;background:var(--paper-2);color:var(--ink);padding:8px 11px;border-radius:7px;margin-bottom:6px} .empty{padding:16px;text-align:center;color:var(--soft)}
 /* flow + timeline */
 .flowcard{background:var(--card);border:1px solid var(--line);border-radius:14px;box-shadow:var(--sh);padding:18px;overflow:auto;text-align:center}
-.cap{font-size:12px;color:var(--soft);font-style:italic;margin-top:8px} .mermaid{margin:0}
+.cap{font-size:12px;color:var(--soft);font-style:italic;margin-top:8px} .flowsrc{margin:0;text-align:left}
 .tlcard{background:var(--card);border:1px solid var(--line);border-radius:14px;box-shadow:var(--sh);padding:6px 18px}
 .tlr{display:flex;gap:12px;align-items:baseline;padding:11px 0;border-bottom:1px solid var(--line);font-size:13px}.tlr:last-child{border:0}
 .tld{font-family:"IBM Plex Mono",monospace;font-size:12px;color:var(--soft);white-space:nowrap;min-width:84px} .tli{flex:1} .tln{color:var(--soft);font-size:12px}
 .tlr.over .tld{color:var(--bad);text-decoration:line-through} .tlr.over{background:#fbf0ec;margin:0 -18px;padding-left:18px;padding-right:18px}
 .specwrap{margin-top:18px} .speclist{max-height:540px}
+.sbdg{margin-left:8px;font-family:"IBM Plex Mono",monospace;font-size:10.5px;color:var(--soft)} .sbdg.changed{color:var(--warn)} .sbdg.new{color:var(--active)}
+.sdiff{margin:4px 0 10px} .sdiff>summary{cursor:pointer;font-family:"IBM Plex Mono",monospace;font-size:11px;color:var(--soft)}
+.sdiff pre{background:var(--paper-2);padding:8px 10px;border-radius:8px;overflow:auto;font-size:11px;line-height:1.45;margin:6px 0 0}
+.di{color:var(--ok)} .dd{color:var(--bad)} .dh{color:var(--soft)}
 .spc{border-bottom:1px solid var(--line)} .spc>summary{cursor:pointer;list-style:none;padding:9px 4px;font-size:12.5px;font-weight:500}
 .spc>summary::-webkit-details-marker{display:none} .spc>summary::before{content:"▸ ";color:var(--soft)} .spc[open]>summary::before{content:"▾ "} .spc>summary:hover{background:var(--paper-2)}
 .specbody{padding:4px 4px 14px 12px;font-size:12.5px;line-height:1.6}
@@ -250,47 +196,238 @@ section{margin:28px 0}
 .specbody ul,.specbody ol{padding-left:20px}.specbody blockquote{border-left:3px solid var(--line2);margin:6px 0;padding-left:12px;color:var(--soft)}
 footer{margin-top:34px;padding-top:14px;border-top:1px solid var(--line2);color:var(--mute);font-family:"IBM Plex Mono",monospace;font-size:11px}
 """
-JS=r"""
-function decFilter(){const q=(document.getElementById('dq').value||'').toLowerCase();
- const f=document.querySelector('.fbtn.on').dataset.f;let n=0;
- document.querySelectorAll('.dec').forEach(d=>{const ok=(f==='all'||d.dataset.status===f)&&(!q||d.dataset.search.includes(q));d.style.display=ok?'':'none';if(ok)n++;});
+CSS_LITE=(paint.LITE_CSS+".cell{transition:none} .cell:hover{transform:none;box-shadow:none;outline:2px solid var(--line2);outline-offset:-1px}"
+          " .pulse,.af,.att,.mini,.tc,.flowcard,.tlcard{contain:content} .spc{content-visibility:auto;contain-intrinsic-size:auto 38px}"
+          " .tlr{content-visibility:auto;contain-intrinsic-size:auto 44px}\n")   # paint-cheap overrides (paint.py)
+JS=SEARCH_JS+r"""
+function decFilter(){const q=document.getElementById('dq').value||'';
+ const f=document.querySelector('.fbtn.on').dataset.f;const n=decApply(q,f);
  document.getElementById('dcount').textContent=n;document.getElementById('dempty').style.display=n?'none':'';}
 document.addEventListener('click',e=>{if(e.target.classList.contains('fbtn')){document.querySelectorAll('.fbtn').forEach(b=>b.classList.remove('on'));e.target.classList.add('on');decFilter();}});
 document.addEventListener('keydown',e=>{if(e.key==='/'&&e.target.tagName!=='INPUT'){e.preventDefault();const dq=document.getElementById('dq');if(dq){dq.closest('details').open=true;dq.focus();}}});
-function specFilter(){const q=(document.getElementById('sq').value||'').toLowerCase();document.querySelectorAll('.spc').forEach(s=>{s.style.display=(!q||s.dataset.h.includes(q))?'':'none';});}
-document.addEventListener('toggle',e=>{const s=e.target;if(s.classList&&s.classList.contains('spc')&&s.open&&!s.dataset.r){const src=s.querySelector('.src'),body=s.querySelector('.specbody');if(src&&body&&window.marked){body.innerHTML=marked.parse(src.textContent);s.dataset.r='1';}}},true);
+function specFilter(){const q=(document.getElementById('sq').value||'').toLowerCase(),c=document.getElementById('schg'),only=c&&c.classList.contains('on');document.querySelectorAll('.spc').forEach(s=>{s.style.display=((!q||s.dataset.h.includes(q))&&(!only||s.dataset.s))?'':'none';});}
+function specChanged(b){b.classList.toggle('on');specFilter();}
+document.addEventListener('toggle',e=>{const s=e.target;if(s.classList&&s.classList.contains('spc')&&s.open&&!s.dataset.r){const t=s.querySelector('template'),body=s.querySelector('.specbody');if(t&&body){body.append(t.content.cloneNode(true));s.dataset.r='1';}}},true);
 """
-MERMAID = (r'''<script type="module">import mermaid from "https://cdn.jsdelivr.net/npm/mermaid@11/dist/mermaid.esm.min.mjs";
-mermaid.initialize({startOnLoad:true,theme:"base",themeVariables:{fontFamily:"IBM Plex Sans",primaryColor:"#fbf9f4",primaryBorderColor:"#cabfa8",primaryTextColor:"#211d17",lineColor:"#9a8f78",fontSize:"14px"}});</script>''') if mermaid else ""
-MARKED='<script src="https://cdn.jsdelivr.net/npm/marked/marked.min.js"></script>' if spec_html else ""
 
-HTMLDOC=f"""<!doctype html><html lang="en"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
-<title>{html.escape(pname)} — Dashboard</title>
-<link rel="preconnect" href="https://fonts.googleapis.com"><link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-<link href="https://fonts.googleapis.com/css2?family=Fraunces:opsz,wght@9..144,500;9..144,600&family=IBM+Plex+Mono:wght@400;500;600&family=IBM+Plex+Sans:wght@400;500;600&display=swap" rel="stylesheet">
-<!-- DASHBOARD META task_count={meta.get('task_count','?')} task_hash={meta.get('task_hash','')[:23]}… spec={meta.get('spec_version','?')} -->
-<style>{CSS}</style>
+# ---- section templates (tmpl.py: compiled once, cached in .dashcache/) -------
+CELLS=Template("v2-cells", """{% for p in phases %}<div class="cell {{{ scls(p.status) }}}" title="Phase {{{ p.n }}} — {{ p.name.split('—')[-1].strip() }} · {{{ p.done }}}/{{{ p.total }}} · {{ p.status }}">\
+<span class="cn">{{{ p.n if p.n.isdigit() else 'U' }}}</span><span class="cbar"><i style="height:{{{ round(100*p.done/p.total) if p.total else 100 }}}%"></i></span></div>{% end %}""")
+RECENT=Template("v2-recent", """{% for d,t,desc in rows %}<div class="rr"><span class="rd">{{{ d[5:] }}}</span>\
+{% if t %}<span class=tid>T{{{ t }}}</span>{% end %}<span class="rt">{{ desc[:64] }}</span></div>{% end %}""")
+TIMELINE=Template("v2-timeline", """{% if rows %}<section><h2 class="st">Timeline</h2><div class="tlcard">\
+{% for over,date,item,st,note in rows %}<div class="tlr {{{ over }}}"><span class="tld">{{ date }}</span>\
+<span class="tli">{{ item }}</span><span class="bdg {{{ scls(st) }}}">{{ st }}</span>\
+{% if note %}<span class=tln>{{ note }}</span>{% end %}</div>{% end %}</div></section>{% end %}""")
+
+def phase_cells(phases): return CELLS.render(phases=phases, scls=scls)
+
+def recent_block(recent):
+    rows=[]
+    for d,text in recent:
+        t,desc=RECENT_TEXT.match(text).groups()
+        desc=re.sub(r"^(?:Finished:\s*)?§?\s*[\d.]+\s*—\s*","",desc).strip()  # trim "Finished:"/"§50.2 —"
+        rows.append((d,t,desc))
+    return RECENT.render(rows=rows)
+
+def dec_row(d):
+    st="superseded" if d.status.lower()=="superseded" else "decided"
+    link=f'<a href="{html.escape(d.link)}" target="_blank">open record →</a>' if d.link else ""
+    return (f'<details class="dec" data-status="{st}"><summary>'
+            f'<span class="did">{html.escape(d.id)}</span><span class="dt">{html.escape(d.title)}</span>'
+            f'<span class="bdg {scls(d.status)}">{html.escape(d.status)}</span></summary>'
+            f'<div class="dbody"><span class="sel">{mdi(d.sel)}</span>{link}</div></details>')
+def decisions_html(decisions, windowed=False):
+    if not decisions: return ""
+    dec_rows=noscript(decisions, mdi) if windowed else "".join(dec_row(d) for d in decisions)
+    ndec=len(decisions); nsup=sum(1 for d in decisions if d.status.lower()=="superseded")
+    return (f'<details class="decwrap"><summary><b>📋 Decisions</b> '
+            f'<span class="pill">{ndec}</span><span class="decsum">{ndec-nsup} decided · {nsup} superseded</span>'
+            f'<span class="open">browse ▾</span></summary><div class="decin">'
+            f'<div class="dtools"><input id="dq" placeholder="search {ndec} decisions… ( / )" oninput="decInput()">'
+            f'<button class="fbtn on" data-f="all">all</button><button class="fbtn" data-f="decided">decided</button>'
+            f'<button class="fbtn" data-f="superseded">superseded</button><span class="pill" id="dcount">{ndec}</span></div>'
+            f'<div class="declist" id="dlist" data-f="all"{" data-win" if windowed else ""}>{dec_rows}<div class="empty" id="dempty" style="display:none">no match</div></div>'
+            f'</div></details><script type="application/json" id="dix">{decision_index(decisions)}</script>'
+            +(payload(decisions, mdi, scls) if windowed else ""))
+
+def flow_block(mermaid):
+    if not mermaid: return ""
+    return (f'<section><h2 class="st">Flow · dependency &amp; critical path</h2>'
+            f'<div class="flowcard">{flow_svg(mermaid) or f"<pre class=flowsrc>{html.escape(mermaid)}</pre>"}</div>'
+            f'<div class="cap">Laid out at render time as static SVG (no mermaid.js) — the same graph that renders flaky / not-at-all in a Markdown viewer. Owners: ❗ you · 🤖 Claude · 👥 both.</div></section>')
+
+def crit_html(g, titles, top=5):
+    """Critical path + the tasks that unblock the most, from depgraph.analyze() — precomputed, no client graph work."""
+    if not g.critical and not g.cycle and not any(a.unblocks for a in g.anns): return ""
+    cp=lambda tid,extra="",cls="": f'<span class="cp{cls}" title="{html.escape(titles.get(tid,""),quote=True)}"><b>T{tid}</b>{html.escape(titles.get(tid,""))}{extra}</span>'
+    path=g.path; arrow='<span class="cpa">→</span>'
+    chain=arrow.join(cp(t) for t in path[:12])+(f'<span class="cpa">… +{len(path)-12}</span>' if len(path)>12 else "")
+    most=sorted(((a.unblocks,tid) for tid,a in zip(g.ids,g.anns) if a.unblocks), key=lambda x:(-x[0],x[1]))[:top]
+    return (f'<section><h2 class="st">Critical path · {len(path)} tasks · difficulty {g.critical_weight}</h2>'
+            +(f'<div class="cpath">{chain}</div>' if path else "")
+            +('<div class="cpath" style="margin-top:10px"><span class="cpa">unblocks most:</span>'+"".join(cp(t,f' <span class="cpa">· {n}</span>') for n,t in most)+'</div>' if most else "")
+            +('<div class="cpath" style="margin-top:10px"><span class="cpa">dependency cycle:</span>'+"".join(cp(t,cls=" bad") for t in g.cycle[:8])+'</div>' if g.cycle else "")
+            +('<div class="cpath" style="margin-top:10px"><span class="cpa">blocked by the cycle:</span>'+"".join(cp(t) for t in g.behind[:8])
+              +(f'<span class="cpa">… +{len(g.behind)-8}</span>' if len(g.behind)>8 else "")+'</div>' if g.behind else "")
+            +'</section>')
+
+def trend_html(tr):
+    """Burn-down, velocity and per-phase throughput sparklines from history.py — empty until there are two snapshots."""
+    if not tr or len(tr.t)<2: return ""
+    days=max((tr.t[-1]-tr.t[0])/86400,1/24); left=[t-d for t,d in zip(tr.total,tr.done)]
+    vel=[max(b-a,0) for a,b in zip(tr.done,tr.done[1:])]; day=lambda t: time.strftime("%b %d",time.gmtime(t))
+    card=lambda ttl,big,svg,sub,tip="": f'<div class="tc"{tip}><div class="tch">{ttl}<b>{big}</b></div>{svg}<div class="tcs">{sub}</div></div>'
+    cards=[card("Burn-down",f"{left[-1]} left",spark(left,zero=True),f"{left[0]} → {left[-1]} open tasks"),
+           card("Velocity",f"{(tr.done[-1]-tr.done[0])/days*7:.1f}/wk",vbars(vel),f"{tr.done[-1]-tr.done[0]} tasks finished in {days:.0f} d")]
+    cards+=[card(html.escape(name.split("—")[0].strip()),f"{d[-1]}/{total}",spark(d,col="var(--active)"),f"+{d[-1]-d[0]} since {day(tr.t[0])}",f' title="{html.escape(name,quote=True)}"')
+            for name,total,d in tr.phases]
+    return f'<section><h2 class="st">Trend · {tr.snapshots} snapshots · {day(tr.t[0])} – {day(tr.t[-1])}</h2><div class="trend">{"".join(cards)}</div></section>'
+
+def timeline_html(timeline):
+    rows=[]
+    for c in timeline:
+        date,item,st=c[0],c[1],c[2]; note=c[3] if len(c)>3 else ""
+        over="over" if ("OVERDUE" in item or "~~" in date) else ""
+        rows.append((over, date.replace("~~",""), re.sub(r"⚠️ OVERDUE:\s*","",item), st, note))
+    return TIMELINE.render(rows=rows, scls=scls)
+
+def stream_v2(m, spec=None, cache=NOCACHE, windowed=False, lite=False, trend=None, asset_mode="cdn"):
+    """Render the v2 dashboard for a parsed `Dashboard` as str chunks (PAGE template); spec is load_spec() output,
+    trend is history.record() output.
+    Sections go through {cache} keyed by the records they render (see rcache.py);
+    {windowed} ships the decisions as a JSON payload rendered per viewport (declist.py); {lite} adds CSS_LITE (paint.py);
+    {asset_mode} "inline" embeds the vendored fonts subset to the page's text, "cdn" links Google Fonts (assets.py)."""
+    meta=m.meta; frag=cache.frag
+    cells=frag("cells", m.phases, lambda: phase_cells(m.phases))
+    active=m.active_phases
+    front=frag("front", active, lambda: "".join(f'<div class="af"><div class="afh"><b>Phase {p.n}</b> <span class="bdg {scls(p.status)}">{html.escape(p.status)}</span>'
+                  f'<span class="affrac">{p.done}/{p.total}</span></div><div class="afn">{html.escape(p.name.split("—",1)[-1].strip())}</div>'
+                  f'<div class="afbar"><i style="width:{round(100*p.done/p.total) if p.total else 100}%"></i></div></div>' for p in active))
+    segs=[(s,v,status_col.get(s,"#b8ad97")) for s,v in m.status_counts]
+    pie=frag("donut", m.status_counts, lambda: donut(segs)+'<div class="legend">'+"".join(f'<div class="lg"><span class="dot" style="background:{status_col.get(s,"#b8ad97")}"></span><span class="lgn">{s}</span><b>{v}</b></div>' for s,v in m.status_counts)+'</div>')
+    att=frag("att", m.your_tasks[:6], lambda: "".join(f'<li><span class="tid">{tid}</span>{mdi(desc[:130])}</li>' for tid,desc in m.your_tasks[:6]))
+    done_ph=len(m.done_phases)
+
+    # Recent — now WITH descriptions
+    recent_rows=frag("recent", m.recent[:6], lambda: recent_block(m.recent[:6]))
+
+    # Decisions — collapsed by default, openable + searchable
+    decisions_block=frag("decwin" if windowed else "decisions", m.decisions, lambda: decisions_html(m.decisions, windowed))
+
+    # Flow / critical-path graph (mermaid source -> static SVG) — only when the source has one
+    flow=frag("flow", m.mermaid, lambda: flow_block(m.mermaid))
+
+    # Critical path / unblockers from the deps column (depgraph.py)
+    g=depgraph.analyze(m); titles={t.id:t.title for tp in m.task_groups for t in tp.tasks if t.id in g.index}
+    crit=frag("crit", (tuple(g.path), tuple(g.anns), tuple(g.cycle), tuple(sorted(titles.items()))), lambda: crit_html(g, titles))
+
+    # Trend sparklines from the snapshot history — only once there are two snapshots
+    trend_block=frag("trend", trend, lambda: trend_html(trend))
+
+    # Timeline — only when present
+    timeline_block=frag("timeline", m.timeline, lambda: timeline_html(m.timeline))
+
+    return assets.embed(PAGE.stream(m=m, meta=meta, active=active, done_ph=done_ph, cells=cells, front=front, pie=pie, att=att,
+                       recent_rows=recent_rows, decisions_block=decisions_block, flow=flow, crit=crit, timeline_block=timeline_block, trend_block=trend_block,
+                       ring=ring, spec_block=spec_block, spec=spec, frag=frag, val=cache.val,
+                       style=CSS+SEARCH_CSS+(WINDOW_CSS if windowed else '')+(CSS_LITE if lite else ''), JS=JS,
+                       font_links=assets.font_links(asset_mode)), asset_mode)
+
+def emit_v2(m, spec=None, cache=NOCACHE, windowed=False, lite=False, trend=None, asset_mode="cdn"):
+    """stream_v2() joined into one str, for in-process callers."""
+    return "".join(stream_v2(m, spec, cache, windowed, lite, trend, asset_mode))
+
+
+PAGE=Template("v2-page", """<!doctype html><html lang="en"><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>{{ m.name }} — Dashboard</title>
+{{{ font_links }}}<!-- DASHBOARD META task_count={{{ meta.get('task_count','?') }}} task_hash={{{ meta.get('task_hash','')[:23] }}}… spec={{{ meta.get('spec_version','?') }}} -->
+<style>{{{ style }}}</style>
 <svg width="0" height="0"><defs><linearGradient id="g" x1="0" y1="0" x2="1" y2="1"><stop offset="0" stop-color="var(--brand)"/><stop offset="1" stop-color="var(--brand2)"/></linearGradient></defs></svg></head>
-<body><header class="mast"><div class="mast-in"><span class="crumb">Execute</span><h1>{html.escape(pname)}</h1>
-<span class="tv">{meta.get('task_count','?')} tasks · {len(phases)} phases · read-only view</span></div></header><div class="wrap">
-<section><div class="pulse">{ring(complete/100)}
-<div class="donwrap">{donut(segs)}<div class="legend">{legend}</div></div>
-<div class="pmeta"><div class="row"><div><div class="big">{done_ph}<span style="color:var(--soft);font-size:18px">/{len(phases)}</span></div><div class="lbl">phases done</div></div>
-<div><div class="big">{len(active)}</div><div class="lbl">active now</div></div></div>
-<div class="row"><div><div class="big" style="color:var(--ok)">{meta.get('verification_debt','0')}</div><div class="lbl">verif debt</div></div>
-<div><div class="big" style="color:var(--ok)">{meta.get('drift_deferrals','0')}</div><div class="lbl">drift</div></div></div></div></div></section>
-<section><h2 class="st">Phase map · {len(phases)} phases</h2><div class="grid">{cells}</div>
+<body><header class="mast"><div class="mast-in"><span class="crumb">Execute</span><h1>{{ m.name }}</h1>
+<span class="tv">{{{ val(meta.get('task_count','?')) }}} tasks · {{{ val(len(m.phases)) }}} phases · read-only view</span></div></header><div class="wrap">
+<section><div class="pulse">{{{ frag("ring", m.complete, lambda: ring(m.complete/100)) }}}
+<div class="donwrap">{{{ pie }}}</div>
+<div class="pmeta"><div class="row"><div><div class="big">{{{ val(done_ph) }}}<span style="color:var(--soft);font-size:18px">/{{{ val(len(m.phases)) }}}</span></div><div class="lbl">phases done</div></div>
+<div><div class="big">{{{ val(len(active)) }}}</div><div class="lbl">active now</div></div></div>
+<div class="row"><div><div class="big" style="color:var(--ok)">{{{ val(meta.get('verification_debt','0')) }}}</div><div class="lbl">verif debt</div></div>
+<div><div class="big" style="color:var(--ok)">{{{ val(meta.get('drift_deferrals','0')) }}}</div><div class="lbl">drift</div></div></div></div></div></section>
+{{{ trend_block }}}
+<section><h2 class="st">Phase map · {{{ val(len(m.phases)) }}} phases</h2><div class="grid">{{{ cells }}}</div>
 <div class="glegend"><span><b style="background:var(--ok)"></b>complete</span><span><b style="background:var(--active)"></b>active</span>
 <span><b style="background:var(--warn)"></b>partial</span><span><b style="background:var(--bad)"></b>blocked</span><span style="margin-left:auto">fill = % done · hover for detail</span></div>
-<div class="front">{front}</div></section>
-{flow}
-{timeline_block}
-<section><div class="two"><div><h2 class="st">Needs you</h2><div class="att"><ul>{att}</ul></div></div>
-<div class="side"><div class="mini"><h3>Recent — last finished</h3>{recent_rows}</div></div></div></section>
-<section>{decisions_block}</section>
-<section>{spec_html}</section>
-<footer>generated {meta.get('generated','')} · single read-only HTML view · state of record = task JSON</footer></div>
-<script>{JS}</script>{MARKED}{MERMAID}</body></html>"""
-OUT.write_text(HTMLDOC, encoding="utf-8")
-print(f"{OUT.name}: {len(phases)} phases, {len(decisions)} decisions, {len(recent)} recent, "
-      f"timeline={len(timeline)}, mermaid={'yes' if mermaid else 'no'}, {len(HTMLDOC)} bytes")
+<div class="front">{{{ front }}}</div></section>
+{{{ flow }}}
+{{{ crit }}}
+{{{ timeline_block }}}
+<section><div class="two"><div><h2 class="st">Needs you</h2><div class="att"><ul>{{{ att }}}</ul></div></div>
+<div class="side"><div class="mini"><h3>Recent — last finished</h3>{{{ recent_rows }}}</div></div></div></section>
+<section>{{{ decisions_block }}}</section>
+<section>{{{ spec_block(spec, frag) }}}</section>
+<footer>generated {{{ val(meta.get('generated','')) }}} · single read-only HTML view · state of record = task JSON</footer></div>
+<script>{{{ JS }}}</script></body></html>""")
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(description="Render a dashboard.md as the v2 single-file HTML view.")
+    ap.add_argument("src", nargs="?", default=HERE/"styler-dashboard.md", type=pathlib.Path)
+    ap.add_argument("out", nargs="?", default="dashboard-v2.html")
+    ap.add_argument("--no-cache", action="store_true", help="ignore .dashcache/ and re-emit every section")
+    ap.add_argument("--decisions", choices=MODES, default="auto", help=f"full DOM rows, or windowed from a JSON payload; auto = windowed above {WINDOW_AUTO}")
+    ap.add_argument("--tasks", metavar="CLAUDE_DIR", type=pathlib.Path, help="tasks/decisions from a .claude/ directory's JSON (taskjson.py), not the Markdown tables")
+    ap.add_argument("-j", "--jobs", type=int, help="--tasks decoder threads")
+    ap.add_argument("--paint", choices=paint.MODES, default="auto", help="full styles, or lite: no noise/blur/shadows/hover lifts, content-visibility on long lists; auto = lite above --lite-above rows")
+    ap.add_argument("--lite-above", type=int, default=paint.LITE_AUTO, metavar="N", help=f"--paint auto threshold: open tasks + decisions (default {paint.LITE_AUTO})")
+    ap.add_argument("--assets", choices=assets.MODES, default="auto", help="inline: vendored fonts subset into the page, no network requests (assets.py); cdn: Google Fonts links; auto = inline once every face is in vendor/fonts/")
+    ap.add_argument("--history", type=pathlib.Path, default=history.DB, metavar="PATH", help="progress snapshot store, kept whatever --no-cache says (history.py; default %(default)s)")
+    ap.add_argument("--spec-base", metavar="VERSION", help="mark spec sections changed since this version (v12 / spec_v12); default the previous one")
+    ap.add_argument("--watch", action="store_true", help="keep running and regenerate on every source change (serve.py)")
+    ap.add_argument("--serve", action="store_true", help="--watch, and serve the page on 127.0.0.1 with live section patching")
+    ap.add_argument("--port", type=int, default=serve.PORT, help="--serve port")
+    ap.add_argument("--profile", nargs="?", const="time", choices=prof.MODES, help="time every pipeline stage (alloc: + allocation peaks, slower); prints a summary and writes a Chrome trace to .dashcache/")
+    args=ap.parse_args(argv)
+    if args.profile:
+        prof.start(args.profile); prof.instrument(mdscan, "scan"); prof.instrument(ir, "load", "parse_dashboard")
+        prof.instrument(sys.modules[__name__], "load_spec", "load_dashboard", "mdi", "render_md", "donut", "ring",
+                        "phase_cells", "recent_block", "dec_row", "decisions_html", "flow_svg", "crit_html", "trend_html", "timeline_html")
+        prof.instrument(depgraph, "analyze"); prof.instrument(history, "record")
+    src=args.src; out=HERE/args.out
+    if args.spec_base:
+        try: specindex.resolve([p.stem for p in src.parent.glob("spec_v*.md")], args.spec_base)
+        except ValueError as e: ap.error(str(e))
+    m=base=ir.load(src, cache=not args.no_cache); spec=load_spec(src.parent, args.spec_base, not args.no_cache)
+    task_cache=None if args.no_cache or not args.tasks else cache_file(args.tasks)
+    if args.tasks:
+        m, st=load_dashboard(args.tasks, base=base, jobs=args.jobs, cache_path=task_cache)
+        print(f"tasks: {st['files']} files from {args.tasks}, {st['decoded']} decoded")
+        if "diverged" in st:
+            print("META task_hash is stale" + "".join(f"\n  {line}" for line in st["diverged"]))
+        if "duplicates" in st:
+            print(f"duplicate task ids {', '.join(st['duplicates'])}: task_hash is the flat hash")
+    windowed=window_mode(args.decisions, len(m.decisions)); lite=paint.lite_mode(args.paint, paint.rows(m), args.lite_above)
+    trend=history.record(src, m, args.history); args.assets=assets.resolve(args.assets)
+    cache=prof.cache(NOCACHE if args.no_cache else RenderCache(out, source_salt(*SALT)))
+    key=doc_key(m, spec, windowed, lite, trend, assets.key(args.assets))
+    if cache.fresh(key):
+        print(f"{out.name}: unchanged (task_hash/spec_fingerprint and every section match the last render)")
+    else:
+        with prof.stage("write", file=out.name):
+            wrote=stream_if_changed(out, prof.stream("emit", stream_v2(m, spec, cache, windowed, lite, trend, args.assets)))
+        cache.save(key)
+        print(f"{out.name}: {len(m.phases)} phases, {len(m.decisions)} decisions, {len(m.recent)} recent, "
+              f"timeline={len(m.timeline)}, mermaid={'yes' if m.mermaid else 'no'}, {'lite, ' if lite else ''}{out.stat().st_size} bytes, "
+              f"{cache.misses} sections rendered / {cache.hits} cached{'' if wrote else ', bytes unchanged'}")
+    if args.profile: print(prof.finish(cache_dir(out)/(out.name+".trace.json")))
+    if not (args.watch or args.serve): return
+
+    def render(changed, live):   # model stays warm: re-parse only what changed
+        nonlocal base, spec
+        if str(src) in changed: base=ir.load(src, cache=not args.no_cache)
+        if any(pathlib.Path(p).name.startswith("spec_v") for p in changed): spec=load_spec(src.parent, args.spec_base, not args.no_cache)
+        m=load_dashboard(args.tasks, base=base, jobs=args.jobs, cache_path=task_cache)[0] if args.tasks else base
+        return "".join(stream_v2(m, spec, live, window_mode(args.decisions, len(m.decisions)), paint.lite_mode(args.paint, paint.rows(m), args.lite_above),
+                                 history.record(src, m, args.history), args.assets))
+    serve.run(out, render, lambda: [src, *sorted(src.parent.glob("spec_v*.md"))],
+              watch_dirs(args.tasks) if args.tasks else (), serve=args.serve, port=args.port)
+
+if __name__ == "__main__":
+    main()